@@ -0,0 +1,231 @@
+"""Adaptive sampling: stop evaluating a phase once its estimates are settled.
+
+Configured via an ``adaptive`` section (top-level or per profile), or ``--adaptive``::
+
+    "adaptive": {"enabled": true, "confidence": 0.95, "pass_halfwidth": 0.05,
+                 "latency_quantiles": [50, 95], "latency_rel_halfwidth": 0.1,
+                 "min_samples": 30, "seed": 7}
+
+Tasks are shuffled within each phase and interleaved across phases. A phase
+stops once the Wilson interval on its pass rate is within ``pass_halfwidth``
+and the order-statistic interval on each latency quantile is within
+``latency_rel_halfwidth`` of the estimate; otherwise it runs until its tasks
+(or the run's ``max_tasks``, e.g. from ``--budget-usd``) are exhausted; extra
+requests reported to ``observe`` (wasted hedges) count against ``max_tasks``.
+Stopping is checked after every observed task, so ``min_samples`` guards
+against settling on a lucky early streak. Outcomes arrive from the pipeline's
+worker threads; the sampler's state is guarded by a lock.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import random
+import threading
+from statistics import NormalDist
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .report import _percentile
+
+
+def adaptive_settings(config: dict, profile: str) -> Dict[str, Any]:
+    """Merge top-level and per-profile ``adaptive`` sections (profile wins)."""
+    merged: Dict[str, Any] = {}
+    top = config.get("adaptive")
+    if isinstance(top, dict):
+        merged.update(top)
+    prof = config.get("profiles", {}).get(profile, {}).get("adaptive")
+    if isinstance(prof, dict):
+        merged.update(prof)
+    return merged
+
+
+def adaptive_enabled(settings: Dict[str, Any]) -> bool:
+    return bool(settings.get("enabled"))
+
+
+def wilson_interval(k: int, n: int, z: float) -> Tuple[float, float]:
+    """Wilson score interval for k successes out of n."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = k / n
+    denom = 1.0 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1.0 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def quantile_interval(sorted_vals: List[float], q: float, z: float) -> Optional[Tuple[float, float]]:
+    """Distribution-free CI for the q-quantile from order statistics, or None if n is too small."""
+    n = len(sorted_vals)
+    if n == 0:
+        return None
+    sd = math.sqrt(n * q * (1.0 - q))
+    lo = math.floor(n * q - z * sd)  # 1-based ranks
+    hi = math.ceil(n * q + z * sd)
+    if lo < 1 or hi > n:
+        return None
+    return sorted_vals[lo - 1], sorted_vals[hi - 1]
+
+
+class _PhaseState:
+    __slots__ = ("n", "n_pass", "lats", "available", "stopped")
+
+    def __init__(self, available: int) -> None:
+        self.n = 0
+        self.n_pass = 0
+        self.lats: List[float] = []  # kept sorted
+        self.available = available
+        self.stopped: Optional[str] = None
+
+
+class AdaptiveSampler:
+    def __init__(self, confidence: float = 0.95, pass_halfwidth: float = 0.05,
+                 latency_quantiles: Optional[List[float]] = None, latency_rel_halfwidth: float = 0.1,
+                 min_samples: int = 30, seed: Any = None, max_tasks: Optional[int] = None,
+                 cost_per_task: Optional[float] = None) -> None:
+        self.confidence = float(confidence)
+        self.pass_halfwidth = float(pass_halfwidth)
+        self.latency_quantiles = [float(q) for q in (latency_quantiles if latency_quantiles is not None else [50, 95])]
+        self.latency_rel_halfwidth = float(latency_rel_halfwidth)
+        self.min_samples = max(1, int(min_samples))
+        self.max_tasks = max_tasks
+        self.cost_per_task = cost_per_task
+        self._rng = random.Random(seed)
+        self._z = NormalDist().inv_cdf(0.5 + self.confidence / 2.0)
+        self._phases: Dict[str, _PhaseState] = {}
+        self._lock = threading.Lock()
+        self.n_evaluated = 0
+        self.n_extra_requests = 0  # paid requests beyond one per task (wasted hedges)
+        self.stop_reason: Optional[str] = None
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], max_tasks: Optional[int] = None,
+                      cost_per_task: Optional[float] = None) -> "AdaptiveSampler":
+        return cls(
+            confidence=settings.get("confidence", 0.95),
+            pass_halfwidth=settings.get("pass_halfwidth", 0.05),
+            latency_quantiles=settings.get("latency_quantiles"),
+            latency_rel_halfwidth=settings.get("latency_rel_halfwidth", 0.1),
+            min_samples=settings.get("min_samples", 30),
+            seed=settings.get("seed"),
+            max_tasks=settings.get("max_tasks", max_tasks),
+            cost_per_task=cost_per_task,
+        )
+
+    def plan(self, suite: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield tasks in randomized, phase-interleaved order, skipping settled phases.
+
+        Lazy: each task is drawn when the consumer asks for the next one, and a
+        phase stops being drawn once it has settled. Tasks already handed out
+        (queued or in flight in the pipeline) still run, so a phase can go past
+        its stopping point by up to the pipeline's queue depth plus workers.
+        """
+        queues: Dict[str, List[Dict[str, Any]]] = {}
+        for task in suite:
+            queues.setdefault(task.get("phase", "Competition"), []).append(task)
+        with self._lock:
+            for phase, tasks in queues.items():
+                self._rng.shuffle(tasks)
+                self._phases[phase] = _PhaseState(len(tasks))
+        cursor = {phase: 0 for phase in queues}
+        yielded = 0  # budget counts tasks handed out, including ones still in flight
+        while True:
+            with self._lock:
+                live = [p for p in queues if self._phases[p].stopped is None]
+            if not live:
+                return
+            for phase in live:
+                with self._lock:
+                    st = self._phases[phase]
+                    if st.stopped is not None:
+                        continue
+                    i = cursor[phase]
+                    if i >= len(queues[phase]):
+                        st.stopped = "exhausted"
+                        continue
+                    # only a task that would actually be handed out can hit the budget
+                    if self.max_tasks is not None and yielded + self.n_extra_requests >= self.max_tasks:
+                        for p, other in self._phases.items():
+                            if other.stopped is None:
+                                other.stopped = "budget" if cursor.get(p, 0) < len(queues.get(p, ())) else "exhausted"
+                        self.stop_reason = "budget"
+                        return
+                    cursor[phase] = i + 1
+                    yielded += 1
+                yield queues[phase][i]
+
+    def observe(self, phase: str, ok: bool, latency_ms: Optional[float], extra_requests: int = 0) -> None:
+        """Record one task outcome (``latency_ms`` None for failed requests); thread-safe.
+
+        ``extra_requests`` are paid requests beyond the task's own (e.g. a
+        wasted hedge); they count against the budget.
+        """
+        with self._lock:
+            self.n_extra_requests += int(extra_requests)
+            st = self._phases.get(phase)
+            if st is None:
+                st = self._phases[phase] = _PhaseState(0)
+            self.n_evaluated += 1
+            st.n += 1
+            st.n_pass += bool(ok)
+            if latency_ms is not None:
+                bisect.insort(st.lats, float(latency_ms))
+            if st.stopped is None and st.n >= self.min_samples and self._precise(st):
+                st.stopped = "precision"
+
+    def _precise(self, st: _PhaseState) -> bool:
+        lo, hi = wilson_interval(st.n_pass, st.n, self._z)
+        if (hi - lo) / 2.0 > self.pass_halfwidth:
+            return False
+        for q in self.latency_quantiles:
+            ci = quantile_interval(st.lats, q / 100.0, self._z)
+            if ci is None:
+                return False
+            est = _percentile(st.lats, q)
+            if est <= 0 or (ci[1] - ci[0]) / 2.0 > self.latency_rel_halfwidth * est:
+                return False
+        return True
+
+    def summary(self) -> Dict[str, Any]:
+        """Manifest block: per-phase sample counts, stop reason and achieved intervals."""
+        phases: Dict[str, Any] = {}
+        for phase, st in self._phases.items():
+            lo, hi = wilson_interval(st.n_pass, st.n, self._z)
+            latency: Dict[str, Any] = {}
+            for q in self.latency_quantiles:
+                ci = quantile_interval(st.lats, q / 100.0, self._z)
+                latency[f"p{q:g}_ms"] = {
+                    "value": round(_percentile(st.lats, q), 1) if st.lats else None,
+                    "ci": [round(ci[0], 1), round(ci[1], 1)] if ci else None,
+                }
+            phases[phase] = {
+                "n": st.n,
+                "n_available": st.available,
+                "stopped": st.stopped or "exhausted",
+                "pass_rate": round(st.n_pass / st.n, 4) if st.n else None,
+                "pass_ci": [round(lo, 4), round(hi, 4)] if st.n else None,
+                "pass_halfwidth": round((hi - lo) / 2.0, 4) if st.n else None,
+                "latency": latency,
+            }
+        available = sum(st.available for st in self._phases.values())
+        skipped = max(0, available - self.n_evaluated)
+        return {
+            "settings": {
+                "confidence": self.confidence,
+                "pass_halfwidth": self.pass_halfwidth,
+                "latency_quantiles": self.latency_quantiles,
+                "latency_rel_halfwidth": self.latency_rel_halfwidth,
+                "min_samples": self.min_samples,
+                "max_tasks": self.max_tasks,
+            },
+            "stop_reason": self.stop_reason or (
+                "precision" if all(st.stopped == "precision" for st in self._phases.values()) else "exhausted"
+            ),
+            "n_available": available,
+            "n_evaluated": self.n_evaluated,
+            "n_extra_requests": self.n_extra_requests,
+            "n_skipped": skipped,
+            "saved_cost_usd": round(skipped * self.cost_per_task, 6) if self.cost_per_task else None,
+            "phases": phases,
+        }
@@ -0,0 +1,145 @@
+"""Batched execution: several tasks per request, or an OpenAI batch file.
+
+Modes:
+  - packed: ``size`` tasks of the same phase are numbered into one prompt and the
+    model answers with ``{"answers": [...]}``; answers are split back out and
+    graded per task.
+  - file:   all tasks are written to an OpenAI Batch API input file, submitted,
+    polled to completion and the output file is graded per task.
+
+Batched traces carry a ``batch`` label (mode, id, size, index). Their
+``latency_ms`` is the shared request latency, so reports keep them out of
+single-shot latency percentiles.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# grade(prompt, expected, got, kind) -> (score, note)
+Grade = Callable[[str, str, str, str], Tuple[float, str]]
+
+PACK_SYSTEM = (
+    "You will receive numbered tasks. Answer each one independently and exactly as it asks. "
+    'Reply with only a JSON object of the form {"answers": ["<answer 1>", "<answer 2>", ...]} '
+    "containing one string per task, in order, and nothing else."
+)
+
+
+def pack_prompts(prompts: List[str]) -> str:
+    lines = [f"{len(prompts)} tasks:"]
+    for i, p in enumerate(prompts, 1):
+        lines.append(f"{i}. {p}")
+    return "\n".join(lines)
+
+
+def split_answers(text: str, n: int) -> List[Optional[str]]:
+    """Extract ``n`` answers from a packed reply; missing answers are None."""
+    candidates = [text]
+    m = re.search(r"\{.*\}", text or "", flags=re.DOTALL)
+    if m:
+        candidates.append(m.group(0))
+    for c in candidates:
+        try:
+            obj = json.loads(c)
+        except Exception:
+            continue
+        answers = obj.get("answers") if isinstance(obj, dict) else obj
+        if isinstance(answers, list):
+            out = [str(a) if a is not None else None for a in answers[:n]]
+            return out + [None] * (n - len(out))
+    return [None] * n
+
+
+def _trace(task: Dict[str, Any], got: Optional[str], grade: Grade, latency_ms: Optional[float],
+           batch: Dict[str, Any], error: Optional[str] = None) -> Dict[str, Any]:
+    prompt = task.get("prompt", "")
+    expected = task.get("answer", "")
+    scorer = task.get("scorer", "contains")
+    rec: Dict[str, Any] = {
+        "id": task.get("id", "task"),
+        "phase": task.get("phase", "Competition"),
+        "prompt": prompt,
+        "expected": expected,
+        "scorer": scorer,
+        "batch": batch,
+    }
+    if error is not None or got is None:
+        rec.update({"error": error or "missing-answer", "score": 0.0,
+                    "latency_ms": latency_ms, "ok": False})
+        return rec
+    score, note = grade(prompt, expected, got, scorer)
+    rec.update({"got": got, "score": score, "latency_ms": latency_ms, "note": note, "ok": bool(score >= 60.0)})
+    return rec
+
+
+def run_packed(client: Any, tasks: List[Dict[str, Any]], size: int, grade: Grade,
+               max_tokens_per_task: int = 64) -> List[Dict[str, Any]]:
+    """Send tasks ``size`` at a time (grouped by phase) as packed prompts."""
+    by_phase: Dict[str, List[Dict[str, Any]]] = {}
+    for t in tasks:
+        by_phase.setdefault(t.get("phase", "Competition"), []).append(t)
+    traces: List[Dict[str, Any]] = []
+    n_batch = 0
+    for group in by_phase.values():
+        for start in range(0, len(group), max(1, size)):
+            chunk = group[start:start + max(1, size)]
+            n_batch += 1
+            label = {"mode": "packed", "id": f"b{n_batch}", "size": len(chunk)}
+            try:
+                answers, latency_ms, _raw = client.chat_packed(
+                    [t.get("prompt", "") for t in chunk], max_tokens_per_task=max_tokens_per_task)
+            except Exception as e:  # pragma: no cover
+                for i, t in enumerate(chunk):
+                    traces.append(_trace(t, None, grade, 0.0, {**label, "index": i}, error=str(e)))
+                continue
+            answers = (list(answers) + [None] * len(chunk))[:len(chunk)]
+            for i, (t, got) in enumerate(zip(chunk, answers)):
+                traces.append(_trace(t, got, grade, round(latency_ms, 1), {**label, "index": i}))
+    return traces
+
+
+def build_batch_file(tasks: List[Dict[str, Any]], model: str, path: Path,
+                     max_tokens: int = 256, temperature: float = 0.2) -> Dict[str, Dict[str, Any]]:
+    """Write an OpenAI Batch API input file; returns {custom_id: task}."""
+    index: Dict[str, Dict[str, Any]] = {}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        for i, t in enumerate(tasks):
+            cid = f"{t.get('id', 'task')}#{i}"
+            index[cid] = t
+            fh.write(json.dumps({
+                "custom_id": cid,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "messages": [{"role": "user", "content": t.get("prompt", "")}],
+                    "temperature": temperature,
+                    "max_tokens": max_tokens,
+                },
+            }) + "\n")
+    return index
+
+
+def run_batch_file(client: Any, tasks: List[Dict[str, Any]], grade: Grade, path: Path,
+                   poll_s: float = 10.0, timeout_s: float = 24 * 3600.0) -> List[Dict[str, Any]]:
+    """Submit all tasks as one batch file and grade the output per task."""
+    index = build_batch_file(tasks, client.model, path)
+    rows, elapsed_ms, batch_obj = client.submit_batch_file(path, poll_s=poll_s, timeout_s=timeout_s)
+    by_id = {r.get("custom_id"): r for r in rows if isinstance(r, dict)}
+    label = {"mode": "file", "id": batch_obj.get("id"), "size": len(tasks), "elapsed_ms": round(elapsed_ms, 1)}
+    traces: List[Dict[str, Any]] = []
+    for i, (cid, t) in enumerate(index.items()):
+        row = by_id.get(cid) or {}
+        body = (row.get("response") or {}).get("body") or {}
+        err = row.get("error")
+        try:
+            got = body["choices"][0]["message"]["content"].strip()
+        except Exception:
+            got = None
+        traces.append(_trace(t, got, grade, None, {**label, "index": i},
+                             error=(json.dumps(err) if err else None)))
+    return traces
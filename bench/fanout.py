@@ -0,0 +1,162 @@
+"""Multi-target fan-out: one suite, several model/endpoint targets, one run.
+
+A profile lists targets instead of relying on OPENAI_MODEL/SAVI_MODEL::
+
+    "targets": [
+      {"name": "savi_openai_62", "model_env": "SAVI_MODEL_62", "concurrency": 4, "rps": 5},
+      {"name": "savi_openai_63", "model": "savi-63", "base_url": "https://...", "api_key_env": "SAVI_API_KEY_63"}
+    ]
+
+Each target gets its own client (connection pool), worker pool and rate limit.
+Every task is dispatched to all targets concurrently; the first target is the
+baseline for the paired comparison. A ``*_env`` key naming an unset variable
+is an error, so two targets cannot silently fall back to the same
+OPENAI_MODEL/SAVI_MODEL.
+
+Fan-out sends each task's ``prompt`` as one plain request. Suites with
+``system``, ``turns`` or ``tools`` tasks, and ``--hedge``/``--warmup``/
+``--instrument`` (or a profile-level ``hedge``/``warmup`` section), are
+rejected for fan-out profiles (see ``unsupported_options``); top-level
+``hedge``/``warmup`` sections do not apply to them.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .report import _percentile
+
+# grade(prompt, expected, got, kind) -> (score, note)
+Grade = Callable[[str, str, str, str], Tuple[float, str]]
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rps apart across threads; rps <= 0 disables it."""
+
+    def __init__(self, rps: float) -> None:
+        self.interval = 1.0 / rps if rps and rps > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.perf_counter()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+UNSUPPORTED_TASK_KEYS = ("system", "turns", "tools")
+
+
+def unsupported_options(suite: List[Dict[str, Any]], **enabled: bool) -> List[str]:
+    """Suite features and enabled run options that fan-out would ignore."""
+    found = [k for k in UNSUPPORTED_TASK_KEYS if any(t.get(k) for t in suite)]
+    return found + [name for name, on in enabled.items() if on]
+
+
+def _from_env(spec: Dict[str, Any], name: str, key: str) -> Optional[str]:
+    var = spec.get(key)
+    if not var:
+        return None
+    value = os.getenv(var)
+    if not value:
+        raise ValueError(f"target {name!r}: {key} names {var}, which is not set")
+    return value
+
+
+def resolve_target(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill model/base_url/api_key from literals or the named env vars (keys never live in config).
+
+    Raises ValueError when a named env var is unset or empty.
+    """
+    name = str(spec.get("name") or spec.get("model") or "target")
+    return {
+        "name": name,
+        "model": spec.get("model") or _from_env(spec, name, "model_env"),
+        "base_url": spec.get("base_url") or _from_env(spec, name, "base_url_env"),
+        "api_key": _from_env(spec, name, "api_key_env"),
+        "concurrency": max(1, int(spec.get("concurrency", 4))),
+        "rps": float(spec.get("rps", 0) or 0),
+    }
+
+
+def run_targets(suite: List[Dict[str, Any]], targets: List[Dict[str, Any]], make_client: Callable[..., Any],
+                grade: Grade, telemetry: Any = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Dispatch every task to every target; returns {target_name: traces in suite order}.
+
+    ``telemetry`` (optional) is told when each task/target call starts and finishes.
+    """
+    resolved = [resolve_target(t) for t in targets]
+    clients = {
+        t["name"]: make_client(base_url=t["base_url"], api_key=t["api_key"], model=t["model"], pool_size=t["concurrency"])
+        for t in resolved
+    }
+    limiters = {t["name"]: RateLimiter(t["rps"]) for t in resolved}
+    out: Dict[str, List[Optional[Dict[str, Any]]]] = {t["name"]: [None] * len(suite) for t in resolved}
+    t0 = time.perf_counter()
+
+    def one(name: str, i: int) -> None:
+        task = suite[i]
+        client = clients[name]
+        limiters[name].wait()
+        prompt = task.get("prompt", "")
+        expected = task.get("answer", "")
+        scorer = task.get("scorer", "contains")
+        rec: Dict[str, Any] = {
+            "id": task.get("id", "task"),
+            "phase": task.get("phase", "Competition"),
+            "target": name,
+            "model": client.model,
+            "prompt": prompt,
+            "expected": expected,
+            "scorer": scorer,
+            "t_ms": round((time.perf_counter() - t0) * 1000.0, 1),
+        }
+        if telemetry is not None:
+            telemetry.task_started()
+        try:
+            text, latency_ms, _raw = client.chat(prompt)
+            score, note = grade(prompt, expected, text, scorer)
+            rec.update({"got": text, "score": score, "latency_ms": round(latency_ms, 1),
+                        "note": note, "ok": bool(score >= 60.0)})
+        except Exception as e:  # pragma: no cover
+            rec.update({"error": str(e), "score": 0.0, "latency_ms": 0.0, "ok": False})
+        if telemetry is not None:
+            telemetry.task_finished(rec["latency_ms"], rec["ok"], error="error" in rec)
+        out[name][i] = rec
+
+    pools = {t["name"]: ThreadPoolExecutor(max_workers=t["concurrency"]) for t in resolved}
+    try:
+        futures = [pools[t["name"]].submit(one, t["name"], i) for i in range(len(suite)) for t in resolved]
+        for f in futures:
+            f.result()
+    finally:
+        for p in pools.values():
+            p.shutdown(wait=True)
+    return {name: [r for r in rows if r is not None] for name, rows in out.items()}
+
+
+def compare(baseline: List[Dict[str, Any]], other: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Paired per-task comparison of ``other`` against ``baseline`` (same suite order)."""
+    pairs = list(zip(baseline, other))
+    both = [(a, b) for a, b in pairs if "error" not in a and "error" not in b]
+    lat_d = sorted(float(b["latency_ms"]) - float(a["latency_ms"]) for a, b in both)
+    score_d = [float(b.get("score") or 0.0) - float(a.get("score") or 0.0) for a, b in pairs]
+    n = len(pairs)
+    return {
+        "n_pairs": n,
+        "mean_score_delta": round(sum(score_d) / n, 3) if n else None,
+        "success_rate_delta": round((sum(1 for _, b in pairs if b.get("ok")) - sum(1 for a, _ in pairs if a.get("ok"))) / n, 4) if n else None,
+        "pass_to_fail": sum(1 for a, b in pairs if a.get("ok") and not b.get("ok")),
+        "fail_to_pass": sum(1 for a, b in pairs if not a.get("ok") and b.get("ok")),
+        "latency_delta_p50_ms": round(_percentile(lat_d, 50), 1) if lat_d else None,
+        "latency_delta_p95_ms": round(_percentile(lat_d, 95), 1) if lat_d else None,
+        "faster_rate": round(sum(1 for d in lat_d if d < 0) / len(lat_d), 4) if lat_d else None,
+    }
@@ -3,19 +3,56 @@ from __future__ import annotations
 import json
 import math
 import re
-from typing import Any, Dict, Tuple
+import string
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+_WORD = re.compile(r"\w+")
+# ASCII text: every non-word character -> space, then split (same tokens as _WORD, ~4x faster)
+_ASCII_SEP = {i: " " for i in range(128) if chr(i) not in string.ascii_letters + string.digits + "_"}
+BLEU_MAX_N = 4
 
 
 def _norm_text(s: str) -> str:
     return " ".join((s or "").strip().split()).lower()
 
 
-def _token_set(s: str) -> set:
-    return set(re.findall(r"\w+", s.lower()))
+def _tokens(s: str) -> List[str]:
+    s = (s or "").lower()
+    if s.isascii():
+        return s.translate(_ASCII_SEP).split()
+    return _WORD.findall(s)
+
+
+def _ngrams(toks: List[str], n: int) -> Counter:
+    return Counter(zip(*(toks[i:] for i in range(n)))) if n > 1 else Counter(toks)
+
+
+class _Ref:
+    """Tokenized expected answer: n-gram counts for BLEU, position bitmasks for ROUGE-L."""
+
+    __slots__ = ("toks", "set", "ngrams", "masks")
+
+    def __init__(self, text: str) -> None:
+        self.toks = _tokens(text)
+        self.set = frozenset(self.toks)
+        self.ngrams = [_ngrams(self.toks, n) for n in range(1, BLEU_MAX_N + 1)]
+        masks: Dict[str, int] = {}
+        for i, t in enumerate(self.toks):
+            masks[t] = masks.get(t, 0) | (1 << i)
+        self.masks = masks
+
+
+@lru_cache(maxsize=4096)
+def _ref(expected: str) -> _Ref:
+    # suites grade many responses against the same few answers
+    return _Ref(expected)
 
 
 def _ratio(a: str, b: str) -> float:
-    sa, sb = _token_set(a), _token_set(b)
+    """Token-set Jaccard similarity (``a`` is the expected answer)."""
+    sa, sb = _ref(a).set, set(_tokens(b))
     if not sa and not sb:
         return 1.0
     if not sa or not sb:
@@ -25,6 +62,76 @@ def _ratio(a: str, b: str) -> float:
     return inter / union
 
 
+def bleu(expected: str, got: str) -> float:
+    """Sentence BLEU (0..1): clipped n-gram precision up to 4-grams, brevity penalty.
+
+    Orders above the reference length are dropped (effective order), and
+    orders above 1 are add-one smoothed (BLEU+1, Lin & Och 2004) so one
+    missing 4-gram does not zero the score.
+    """
+    ref = _ref(expected)
+    hyp = _tokens(got)
+    if not ref.toks or not hyp:
+        return 1.0 if not ref.toks and not hyp else 0.0
+    max_n = min(BLEU_MAX_N, len(ref.toks))
+    size = len(hyp)
+    # an n-gram can only match where its leading (n-1)-gram matched, so each
+    # order only looks at the previous order's hits; when most tokens hit,
+    # counting every n-gram (in C) is cheaper than filtering positions
+    pos = [i for i, t in enumerate(hyp) if t in ref.set]
+    dense = 2 * len(pos) > size
+    log_p = 0.0
+    for n in range(1, max_n + 1):
+        total = size - n + 1
+        if total <= 0:
+            return 0.0
+        ref_n = ref.ngrams[n - 1]
+        if dense:
+            hyp_n = _ngrams(hyp, n)
+        elif n == 1:
+            hyp_n = Counter(hyp[i] for i in pos)
+        else:
+            pos = [i for i in pos if i + n <= size and tuple(hyp[i:i + n]) in ref_n]
+            hyp_n = Counter(tuple(hyp[i:i + n]) for i in pos)
+        if len(ref_n) < len(hyp_n):
+            match = sum(min(c, hyp_n.get(g, 0)) for g, c in ref_n.items())
+        else:
+            match = sum(min(c, ref_n.get(g, 0)) for g, c in hyp_n.items())
+        if n > 1:
+            match, total = match + 1, total + 1
+        elif match == 0:
+            return 0.0
+        log_p += math.log(match / total)
+    bp = 1.0 if len(hyp) >= len(ref.toks) else math.exp(1.0 - len(ref.toks) / len(hyp))
+    return bp * math.exp(log_p / max_n)
+
+
+def rouge_l(expected: str, got: str) -> float:
+    """ROUGE-L F1 (0..1) from the longest common token subsequence.
+
+    The LCS is computed bit-parallel (Allison-Dix): one big-int update per
+    response token over the reference's cached position masks, instead of
+    the O(n*m) dynamic-programming table.
+    """
+    ref = _ref(expected)
+    hyp = _tokens(got)
+    if not ref.toks or not hyp:
+        return 1.0 if not ref.toks and not hyp else 0.0
+    masks = ref.masks
+    full = (1 << len(ref.toks)) - 1
+    v = full
+    for t in hyp:
+        m = masks.get(t)
+        if m:
+            u = v & m
+            v = ((v + u) | (v - u)) & full
+    lcs = len(ref.toks) - v.bit_count()
+    if lcs == 0:
+        return 0.0
+    precision, recall = lcs / len(hyp), lcs / len(ref.toks)
+    return 2 * precision * recall / (precision + recall)
+
+
 def score(prompt: str, expected: str, got: str, kind: str) -> Tuple[float, str]:
     kind = (kind or "").strip().lower()
     try:
@@ -51,8 +158,14 @@ def score(prompt: str, expected: str, got: str, kind: str) -> Tuple[float, str]:
             vals = [float(n) for n in nums] if nums else []
             ok = any(abs(v - target) <= tol for v in vals)
             return (100.0 if ok else 0.0, f"approx tol={tol}")
-        if kind in ("fuzzy", "bleu", "rouge"):
-            r = _ratio(expected, got)
+        if kind == "bleu":
+            r = bleu(expected, got or "")
+            return (100.0 * r, f"bleu={r:.3f}")
+        if kind in ("rouge", "rouge-l"):
+            r = rouge_l(expected, got or "")
+            return (100.0 * r, f"rouge-l={r:.3f}")
+        if kind == "fuzzy":
+            r = _ratio(expected, got or "")
             return (100.0 * r, f"fuzzy={r:.3f}")
     except Exception as e:
         return (0.0, f"grade-error:{e}")
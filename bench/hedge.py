@@ -0,0 +1,121 @@
+"""Hedged requests: re-send a straggling request and take the first answer.
+
+Configured via a ``hedge`` section (top-level or per profile), or ``--hedge``::
+
+    "hedge": {"enabled": true, "quantile": 95, "window": 200, "min_samples": 20,
+              "min_ms": 50, "max_rate": 0.1}
+
+The threshold is the rolling ``quantile`` of *primary-attempt* latencies, so
+hedging cannot drag its own trigger down. No hedge is sent until
+``min_samples`` primaries have completed, and hedges are capped at
+``max_rate`` of requests. The losing attempt is abandoned (a sync HTTP call
+cannot be interrupted); its result is discarded and counted as wasted.
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from .report import _percentile
+
+
+def hedge_settings(config: dict, profile: str) -> Dict[str, Any]:
+    """Merge top-level and per-profile ``hedge`` sections (profile wins)."""
+    merged: Dict[str, Any] = {}
+    top = config.get("hedge")
+    if isinstance(top, dict):
+        merged.update(top)
+    prof = config.get("profiles", {}).get(profile, {}).get("hedge")
+    if isinstance(prof, dict):
+        merged.update(prof)
+    return merged
+
+
+def hedge_enabled(settings: Dict[str, Any]) -> bool:
+    return bool(settings.get("enabled"))
+
+
+class HedgePolicy:
+    def __init__(self, quantile: float = 95.0, window: int = 200, min_samples: int = 20,
+                 min_ms: float = 0.0, max_rate: float = 0.1, cost_per_request: Optional[float] = None) -> None:
+        self.quantile = float(quantile)
+        self.min_samples = max(1, int(min_samples))
+        self.min_ms = float(min_ms)
+        self.max_rate = float(max_rate)
+        self.cost_per_request = cost_per_request
+        self._lock = threading.Lock()
+        self._window: deque = deque(maxlen=max(self.min_samples, int(window)))
+        self.primary_ms: List[float] = []  # every completed primary attempt, for the unhedged view
+        self.requests = 0
+        self.hedges = 0
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], cost_per_request: Optional[float] = None) -> "HedgePolicy":
+        return cls(
+            quantile=settings.get("quantile", 95.0),
+            window=settings.get("window", 200),
+            min_samples=settings.get("min_samples", 20),
+            min_ms=settings.get("min_ms", 0.0),
+            max_rate=settings.get("max_rate", 0.1),
+            cost_per_request=cost_per_request,
+        )
+
+    def observe_primary(self, latency_ms: float) -> None:
+        with self._lock:
+            self._window.append(latency_ms)
+            self.primary_ms.append(latency_ms)
+
+    def begin(self) -> Optional[float]:
+        """Register a request; return its hedge threshold in ms, or None to not hedge."""
+        with self._lock:
+            self.requests += 1
+            if len(self._window) < self.min_samples:
+                return None
+            if self.hedges + 1 > self.max_rate * self.requests:
+                return None
+            vals = sorted(self._window)
+        return max(self.min_ms, _percentile(vals, self.quantile))
+
+    def hedged(self) -> None:
+        with self._lock:
+            self.hedges += 1
+
+    def current_threshold(self) -> Optional[float]:
+        with self._lock:
+            vals = sorted(self._window)
+        return round(max(self.min_ms, _percentile(vals, self.quantile)), 1) if len(vals) >= self.min_samples else None
+
+
+def _pcts(vals: List[float]) -> Optional[Dict[str, float]]:
+    if not vals:
+        return None
+    vals = sorted(vals)
+    return {f"p{p}_ms": round(_percentile(vals, p), 1) for p in (50, 95, 99)}
+
+
+def hedge_summary(traces: List[Any], policy: HedgePolicy) -> Dict[str, Any]:
+    """Manifest block: hedge counts, wasted requests/cost, and hedged vs unhedged latency.
+
+    ``hedged`` is task latency as observed with hedging on; ``unhedged`` is the
+    latency of every primary attempt, i.e. what the run would have seen
+    without hedging. ``hedged_tasks`` covers only the tasks that were hedged.
+    """
+    ok = [t for t in traces if "error" not in t]
+    hedged = [t for t in ok if t.get("hedge")]
+    n = len(traces)
+    wasted = sum(int(t["hedge"].get("wasted_requests", 0)) for t in traces if t.get("hedge"))
+    return {
+        "settings": {"quantile": policy.quantile, "min_samples": policy.min_samples,
+                     "min_ms": policy.min_ms, "max_rate": policy.max_rate},
+        "final_threshold_ms": policy.current_threshold(),
+        "n_tasks": n,
+        "n_hedged": sum(1 for t in traces if t.get("hedge")),
+        "hedge_rate": round(sum(1 for t in traces if t.get("hedge")) / n, 4) if n else None,
+        "hedge_won": sum(1 for t in hedged if t["hedge"].get("winner") == "hedge"),
+        "wasted_requests": wasted,
+        "wasted_cost_usd": round(wasted * policy.cost_per_request, 6) if policy.cost_per_request else None,
+        "hedged": _pcts([float(t["latency_ms"]) for t in ok]),
+        "unhedged": _pcts(list(policy.primary_ms)),
+        "hedged_tasks": _pcts([float(t["latency_ms"]) for t in hedged]),
+    }
@@ -1,8 +1,128 @@
+import json
 import os
+import re
+import socket
+import threading
 import time
-from typing import Dict, Any, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# Response headers carrying server-side processing time (ms unless noted)
+SERVER_TIMING_HEADERS = ("openai-processing-ms", "x-envoy-upstream-service-time", "server-timing")
+
+def _message_json(role: str, content: str) -> bytes:
+    return json.dumps({"role": role, "content": content}).encode("utf-8")
+
+
+# Per-thread timing record of the in-flight instrumented request; the timed
+# connection classes below write into it when they open a new connection.
+_current = threading.local()
+
+
+class Instrumentation:
+    """Hook interface for per-request connection timing. All hooks are no-ops.
+
+    Each hook receives the mutable timing record of the request in flight:
+      - on_request_start:     {"url"} set; nothing measured yet
+      - on_connection:        "reused" and, for new connections, "dns_ms",
+                              "connect_ms" (TCP) and "tls_ms"
+      - on_first_byte:        "ttfb_ms" (request start -> response headers)
+      - on_response_complete: "transfer_ms", "total_ms", "status",
+                              "server_ms" and "server_headers"
+    Subclass and override what you need; pass an instance to SaviClient.
+    """
+
+    def on_request_start(self, timing: Dict[str, Any]) -> None:
+        pass
+
+    def on_connection(self, timing: Dict[str, Any]) -> None:
+        pass
+
+    def on_first_byte(self, timing: Dict[str, Any]) -> None:
+        pass
+
+    def on_response_complete(self, timing: Dict[str, Any]) -> None:
+        pass
+
+
+def _timed_connection(base, tls: bool):
+    """Subclass a urllib3 connection class to time DNS, TCP connect and TLS."""
+
+    class _Timed(base):
+        def _new_conn(self):
+            timing = getattr(_current, "timing", None)
+            if timing is None:
+                return super()._new_conn()
+            host = self._dns_host
+            t0 = time.perf_counter()
+            try:
+                resolved = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+            except OSError:
+                resolved = None
+            t1 = time.perf_counter()
+            try:
+                if resolved:
+                    self._dns_host = resolved
+                try:
+                    sock = super()._new_conn()
+                except Exception:
+                    if not resolved:
+                        raise
+                    # fall back to letting urllib3 try every resolved address
+                    self._dns_host = host
+                    sock = super()._new_conn()
+            finally:
+                self._dns_host = host
+            timing["dns_ms"] = round((t1 - t0) * 1000.0, 2)
+            timing["connect_ms"] = round((time.perf_counter() - t1) * 1000.0, 2)
+            return sock
+
+        def connect(self):
+            timing = getattr(_current, "timing", None)
+            if timing is None:
+                return super().connect()
+            t0 = time.perf_counter()
+            super().connect()
+            total = (time.perf_counter() - t0) * 1000.0
+            tcp = timing.get("dns_ms", 0.0) + timing.get("connect_ms", 0.0)
+            timing["reused"] = False
+            timing["tls_ms"] = round(max(0.0, total - tcp), 2) if tls else 0.0
+            _current.hooks.on_connection(timing)
+
+    return _Timed
+
+
+class _TimedHTTPPool(HTTPConnectionPool):
+    ConnectionCls = _timed_connection(HTTPConnection, tls=False)
+
+
+class _TimedHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _timed_connection(HTTPSConnection, tls=True)
+
+
+class _TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools open connections through the timed classes."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPPool, "https": _TimedHTTPSPool}
+
+
+def _server_ms(headers: Any) -> Tuple[Optional[float], Dict[str, str]]:
+    found = {h: headers[h] for h in SERVER_TIMING_HEADERS if h in headers}
+    for h in ("openai-processing-ms", "x-envoy-upstream-service-time"):
+        try:
+            return float(found[h]), found
+        except (KeyError, ValueError):
+            continue
+    m = re.search(r"dur=([0-9.]+)", found.get("server-timing", ""))
+    return (float(m.group(1)) if m else None), found
 
 
 class SaviClient:
@@ -13,13 +133,19 @@ class SaviClient:
       - OPENAI_API_KEY  or SAVI_API_KEY: bearer token
       - OPENAI_MODEL    or SAVI_MODEL:   model name (default: gpt-4o)
       - SAVI_API_PATH:  optional, defaults to /chat/completions
+
+    Requests share one pooled session. Pass ``instrumentation`` (an
+    :class:`Instrumentation`) to record a per-request connection timing
+    breakdown, readable afterwards from the same thread via ``last_timing()``.
     """
 
-    def __init__(self) -> None:
-        base = os.getenv("OPENAI_BASE_URL") or os.getenv("SAVI_API_BASE", "")
+    def __init__(self, base_url: str = None, api_key: str = None, model: str = None,
+                 instrumentation: Optional[Instrumentation] = None, pool_size: int = 10) -> None:
+        # Explicit arguments override the environment (e.g. replaying against another endpoint)
+        base = base_url or os.getenv("OPENAI_BASE_URL") or os.getenv("SAVI_API_BASE", "")
         base = base.rstrip("/") if base else ""
         # Default to OpenAI public base if API key is present but no base provided
-        if not base and (os.getenv("OPENAI_API_KEY") or os.getenv("SAVI_API_KEY")):
+        if not base and (api_key or os.getenv("OPENAI_API_KEY") or os.getenv("SAVI_API_KEY")):
             base = "https://api.openai.com/v1"
         path = os.getenv("SAVI_API_PATH", "/chat/completions")
         if base.endswith("/chat/completions"):
@@ -28,39 +154,313 @@ class SaviClient:
             self.url = f"{base}{path}"
         else:
             self.url = ""
-        self.api_key = os.getenv("OPENAI_API_KEY") or os.getenv("SAVI_API_KEY", "")
-        self.model = os.getenv("OPENAI_MODEL") or os.getenv("SAVI_MODEL") or "gpt-4o"
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY") or os.getenv("SAVI_API_KEY", "")
+        self.model = model or os.getenv("OPENAI_MODEL") or os.getenv("SAVI_MODEL") or "gpt-4o"
+        self.instrumentation = instrumentation
+        self.session = requests.Session()
+        adapter_cls = _TimedAdapter if instrumentation is not None else HTTPAdapter
+        adapter = adapter_cls(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._tls = threading.local()
+        self._pool_size = pool_size
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        # Request bodies are assembled from pre-serialized JSON fragments: the
+        # payload head per (max_tokens, temperature) and each system prompt are
+        # encoded once and reused across calls and session turns.
+        self._headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            self._headers["Authorization"] = f"Bearer {self.api_key}"
+        self._heads: Dict[Tuple[int, float], bytes] = {}
+        self._systems: Dict[str, bytes] = {}
+
+    def last_timing(self) -> Optional[Dict[str, Any]]:
+        """Timing breakdown of this thread's most recent instrumented request."""
+        return getattr(self._tls, "timing", None)
 
     def chat(self, prompt: str, system: str = None, max_tokens: int = 256, temperature: float = 0.2) -> Tuple[str, float, Dict[str, Any]]:
-        headers = {
-            "Content-Type": "application/json",
-        }
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": max_tokens,
-        }
+        fragments = [self._system_fragment(system)] if system else []
+        fragments.append(_message_json("user", prompt))
+        return self._post(self._body(fragments, max_tokens, temperature))
+
+    def conversation(self, system: str = None, max_tokens: int = 256, temperature: float = 0.2) -> "ChatSession":
+        """Start a multi-turn conversation (a ChatSession) on this client."""
+        return ChatSession(self, system=system, max_tokens=max_tokens, temperature=temperature)
+
+    def _system_fragment(self, system: str) -> bytes:
+        frag = self._systems.get(system)
+        if frag is None:
+            frag = self._systems.setdefault(system, _message_json("system", system))
+        return frag
+
+    def chat_tools(self, messages: List[Dict[str, Any]], tools: List[Dict[str, Any]], max_tokens: int = 256,
+                   temperature: float = 0.2) -> Tuple[Dict[str, Any], float, Dict[str, Any]]:
+        """One tool-enabled turn: returns (assistant message, latency_ms, raw).
+
+        The message may carry ``tool_calls`` instead of content (see bench.toolcall).
+        """
+        tail = b', "tools": ' + json.dumps(tools).encode("utf-8") if tools else b""
+        body = self._body([json.dumps(m).encode("utf-8") for m in messages], max_tokens, temperature, tail=tail)
+        text, dt, data = self._post(body)
+        try:
+            msg = data["choices"][0]["message"]
+        except Exception:  # pragma: no cover
+            msg = {"role": "assistant", "content": text}
+        return msg, dt, data
+
+    def chat_fault(self, prompt: str, kind: str, timeout_s: float = 0.05) -> Tuple[str, float, Dict[str, Any]]:
+        """Send a deliberately faulty request to the endpoint (bench.soak fault bursts).
+
+        ``kind`` "timeout" sends a normal request with a ``timeout_s`` read
+        timeout; "malformed" sends a truncated JSON body. Errors propagate.
+        """
+        body = self._body([_message_json("user", prompt)], 256, 0.2)
+        if kind == "malformed":
+            body = body[: len(body) // 2]
+        t0 = time.perf_counter()
+        resp = self.session.post(self.url, data=body, headers=self._headers,
+                                 timeout=timeout_s if kind == "timeout" else 60)
+        dt = (time.perf_counter() - t0) * 1000.0
+        resp.raise_for_status()
+        data = resp.json()
+        return self._parse(data), dt, data
+
+    def _body(self, fragments: List[bytes], max_tokens: int, temperature: float, tail: bytes = b"") -> bytes:
+        """Chat completion request body from serialized message fragments (``tail``: extra top-level fields)."""
+        head = self._heads.get((max_tokens, temperature))
+        if head is None:
+            fields = json.dumps({"model": self.model, "temperature": temperature, "max_tokens": max_tokens})
+            head = self._heads.setdefault((max_tokens, temperature), fields[:-1].encode("utf-8") + b', "messages": [')
+        return head + b", ".join(fragments) + b"]" + tail + b"}"
+
+    def _post(self, body: bytes) -> Tuple[str, float, Dict[str, Any]]:
+        if self.instrumentation is not None:
+            return self._chat_instrumented(body, self._headers)
         t0 = time.perf_counter()
-        resp = requests.post(self.url, json=payload, headers=headers, timeout=60)
+        resp = self.session.post(self.url, data=body, headers=self._headers, timeout=60)
         dt = (time.perf_counter() - t0) * 1000.0
         resp.raise_for_status()
         data = resp.json()
+        return self._parse(data), dt, data
+
+    def _chat_instrumented(self, body: bytes, headers: Dict[str, str]) -> Tuple[str, float, Dict[str, Any]]:
+        hooks = self.instrumentation
+        timing: Dict[str, Any] = {"url": self.url}
+        self._tls.timing = timing
+        _current.timing = timing
+        _current.hooks = hooks
+        try:
+            hooks.on_request_start(timing)
+            t0 = time.perf_counter()
+            resp = self.session.post(self.url, data=body, headers=headers, timeout=60, stream=True)
+            t1 = time.perf_counter()
+        finally:
+            _current.timing = None
+            _current.hooks = None
+        if "reused" not in timing:
+            timing["reused"] = True
+            hooks.on_connection(timing)
+        timing["ttfb_ms"] = round((t1 - t0) * 1000.0, 2)
+        hooks.on_first_byte(timing)
+        body = resp.content
+        t2 = time.perf_counter()
+        dt = (t2 - t0) * 1000.0
+        server_ms, server_headers = _server_ms(resp.headers)
+        timing.update({
+            "transfer_ms": round((t2 - t1) * 1000.0, 2),
+            "total_ms": round(dt, 2),
+            "status": resp.status_code,
+            "bytes": len(body),
+            "server_ms": server_ms,
+            "server_headers": server_headers,
+        })
+        hooks.on_response_complete(timing)
+        resp.raise_for_status()
+        data = resp.json()
+        return self._parse(data), dt, data
+
+    def _timed_attempt(self, prompt: str, kwargs: Dict[str, Any]) -> Tuple[str, float, Dict[str, Any], Optional[Dict[str, Any]]]:
+        text, dt, data = self.chat(prompt, **kwargs)
+        return text, dt, data, self.last_timing()
+
+    def chat_hedged(self, prompt: str, policy: Any, **kwargs: Any) -> Tuple[str, float, Dict[str, Any], Optional[Dict[str, Any]]]:
+        """``chat`` with a hedge: past ``policy``'s threshold, send a duplicate and take the first answer.
+
+        ``policy`` is a bench.hedge.HedgePolicy. Returns (text, latency_ms,
+        raw, hedge); ``hedge`` is None when no duplicate was sent, else
+        {"winner", "threshold_ms", "attempts", "wasted_requests"[, "wasted_usd"]}. The loser is
+        abandoned, not interrupted. Latency and the hedge threshold are timed
+        from when the primary attempt starts running, so time queued in the
+        hedge pool (e.g. behind abandoned attempts) is not reported as latency.
+        Connection timing (if instrumented) is available via ``last_timing()``
+        as usual.
+        """
+        if self._hedge_pool is None:
+            # pool_size is set by the caller to 2 x its dispatchers when hedging
+            self._hedge_pool = ThreadPoolExecutor(max_workers=max(2, self._pool_size), thread_name_prefix="savi-hedge")
+        started = threading.Event()
+        t0 = [0.0]
+
+        def _primary() -> Tuple[str, float, Dict[str, Any], Optional[Dict[str, Any]]]:
+            t0[0] = time.perf_counter()
+            started.set()
+            return self._timed_attempt(prompt, kwargs)
+
+        primary = self._hedge_pool.submit(_primary)
+
+        def _observe(f: Any) -> None:
+            # primaries feed the threshold whether they win, lose or run unhedged
+            if not f.cancelled() and f.exception() is None:
+                policy.observe_primary(f.result()[1])
+
+        primary.add_done_callback(_observe)
+        threshold = policy.begin()
+        if threshold is not None:
+            started.wait()
+            wait([primary], timeout=max(0.0, threshold / 1000.0 - (time.perf_counter() - t0[0])))
+        if threshold is None or primary.done():
+            text, dt, data, timing = primary.result()
+            self._tls.timing = timing
+            return text, dt, data, None
+        policy.hedged()
+        second = self._hedge_pool.submit(self._timed_attempt, prompt, kwargs)
+        attempts = {primary: "primary", second: "hedge"}
+        pending = set(attempts)
+        winner = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                if f.exception() is None:
+                    winner = f
+                    break
+        if winner is None:
+            primary.result()  # both failed: surface the primary's error
+        for f in pending:
+            f.cancel()
+        text, _dt, data, timing = winner.result()
+        self._tls.timing = timing
+        hedge = {"winner": attempts[winner], "threshold_ms": round(threshold, 1), "attempts": 2, "wasted_requests": 1}
+        if policy.cost_per_request:
+            hedge["wasted_usd"] = policy.cost_per_request
+        return text, (time.perf_counter() - t0[0]) * 1000.0, data, hedge
+
+    def close(self) -> None:
+        """Wait for abandoned hedge attempts to finish, then close the session."""
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=True)
+            self._hedge_pool = None
+        self.session.close()
+
+    def chat_packed(self, prompts: List[str], max_tokens_per_task: int = 64) -> Tuple[List[Optional[str]], float, Dict[str, Any]]:
+        """Send several prompts in one request; returns (answers, latency_ms, raw).
+
+        Answers are split back out in order; unanswered slots are None.
+        """
+        from .batch import PACK_SYSTEM, pack_prompts, split_answers
+
+        text, dt, data = self.chat(pack_prompts(prompts), system=PACK_SYSTEM,
+                                   max_tokens=max_tokens_per_task * len(prompts), temperature=0.0)
+        return split_answers(text, len(prompts)), dt, data
+
+    def _api_root(self) -> str:
+        path = os.getenv("SAVI_API_PATH", "/chat/completions")
+        for suffix in ("/chat/completions", path):
+            if suffix and self.url.endswith(suffix):
+                return self.url[: -len(suffix)]
+        return self.url
+
+    def submit_batch_file(self, path: Path, poll_s: float = 10.0, timeout_s: float = 24 * 3600.0) -> Tuple[List[Dict[str, Any]], float, Dict[str, Any]]:
+        """Run an OpenAI Batch API input file to completion.
+
+        Uploads the file, creates the batch, polls until it reaches a terminal
+        state and downloads the output. Returns (output_rows, elapsed_ms, batch).
+        """
+        root = self._api_root()
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        t0 = time.perf_counter()
+        with open(path, "rb") as fh:
+            up = self.session.post(f"{root}/files", headers=headers, data={"purpose": "batch"},
+                                   files={"file": (Path(path).name, fh)}, timeout=300)
+        up.raise_for_status()
+        resp = self.session.post(f"{root}/batches", headers=headers, timeout=60, json={
+            "input_file_id": up.json()["id"],
+            "endpoint": "/v1/chat/completions",
+            "completion_window": "24h",
+        })
+        resp.raise_for_status()
+        batch = resp.json()
+        while batch.get("status") not in ("completed", "failed", "expired", "cancelled"):
+            if time.perf_counter() - t0 > timeout_s:
+                raise TimeoutError(f"batch {batch.get('id')} still {batch.get('status')} after {timeout_s}s")
+            time.sleep(poll_s)
+            resp = self.session.get(f"{root}/batches/{batch['id']}", headers=headers, timeout=60)
+            resp.raise_for_status()
+            batch = resp.json()
+        rows: List[Dict[str, Any]] = []
+        for key in ("output_file_id", "error_file_id"):
+            fid = batch.get(key)
+            if not fid:
+                continue
+            out = self.session.get(f"{root}/files/{fid}/content", headers=headers, timeout=300)
+            out.raise_for_status()
+            for line in out.text.splitlines():
+                try:
+                    rows.append(json.loads(line))
+                except Exception:
+                    continue
+        return rows, (time.perf_counter() - t0) * 1000.0, batch
+
+    @staticmethod
+    def _parse(data: Dict[str, Any]) -> str:
         # OpenAI-compatible
         try:
-            text = data["choices"][0]["message"]["content"].strip()
+            msg = data["choices"][0]["message"]
+            if msg.get("content") is None and msg.get("tool_calls"):
+                return ""
+            return msg["content"].strip()
         except Exception:  # pragma: no cover
             # Try a few common shapes
-            text = (
+            return (
                 data.get("output")
                 or data.get("text")
                 or str(data)
             )
-        return text, dt, data
 
+
+class ChatSession:
+    """A multi-turn conversation on one SaviClient.
+
+    Each message is serialized once, when it joins the history; a turn's body
+    is the cached fragments joined, so the system prompt and earlier turns are
+    not re-encoded as the context grows. ``turns`` holds one record per turn:
+    latency, context size, request bytes and, when the server reports usage,
+    prompt and cached prompt tokens (server-side prefix-cache hits).
+    """
+
+    def __init__(self, client: SaviClient, system: str = None, max_tokens: int = 256, temperature: float = 0.2) -> None:
+        self.client = client
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self._fragments: List[bytes] = [client._system_fragment(system)] if system else []
+        self.turns: List[Dict[str, Any]] = []
+
+    def send(self, prompt: str) -> Tuple[str, float, Dict[str, Any]]:
+        user = _message_json("user", prompt)
+        body = self.client._body(self._fragments + [user], self.max_tokens, self.temperature)
+        text, dt, data = self.client._post(body)
+        usage = (data.get("usage") or {}) if isinstance(data, dict) else {}
+        rec: Dict[str, Any] = {
+            "turn": len(self.turns) + 1,
+            "prompt": prompt,
+            "got": text,
+            "latency_ms": round(dt, 1),
+            "context_messages": len(self._fragments) + 1,
+            "request_bytes": len(body),
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "cached_tokens": (usage.get("prompt_tokens_details") or {}).get("cached_tokens"),
+        }
+        if self.client.instrumentation is not None:
+            rec["ttfb_ms"] = (self.client.last_timing() or {}).get("ttfb_ms")
+        self.turns.append(rec)
+        self._fragments += [user, _message_json("assistant", text)]
+        return text, dt, data
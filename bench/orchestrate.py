@@ -0,0 +1,142 @@
+"""Run several profiles concurrently, then report and pack once.
+
+Usage:
+  python -m bench.orchestrate --profiles savi_openai_62,savi_openai_63
+  python -m bench.orchestrate --profiles a,b,c --max-parallel 2 --concurrency 16 --budget-usd 250
+
+Each profile runs ``bench.run.main`` in its own worker process (bench.run keeps
+per-process state), at most ``--max-parallel`` at a time. The global
+``--concurrency`` ceiling is divided across the profiles running at once, and
+``--budget-usd`` is split evenly across profiles and applied through each run's
+own budget cap. After all profiles finish, ``bench.report`` and
+``tools/summarize_and_pack.py`` run once, and a summary is written to
+manifests/orchestrate-<ts>.json.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .run import _iso_now, load_config
+
+
+def _run_profile(argv: List[str]) -> Dict[str, Any]:
+    """Worker entry point: one bench.run invocation in a fresh module state."""
+    import random
+    from .run import main as run_main
+
+    # forked workers inherit the parent's RNG state; RUN_SEED (if set) reseeds in run_main
+    random.seed()
+    t0 = time.perf_counter()
+    manifest = run_main(argv)
+    return {"manifest": manifest, "wall_s": round(time.perf_counter() - t0, 2)}
+
+
+def plan(profiles: List[str], max_parallel: int, concurrency: Optional[int], budget_usd: Optional[float],
+         config: str, overrides: List[str]) -> Dict[str, List[str]]:
+    """bench.run argv per profile with the global ceilings divided up."""
+    width = max(1, min(max_parallel, len(profiles)))
+    per_conc = max(1, concurrency // width) if concurrency else None
+    per_budget = round(budget_usd / len(profiles), 6) if budget_usd is not None else None
+    out: Dict[str, List[str]] = {}
+    for name in profiles:
+        argv = ["--config", config, "--profile", name]
+        for kv in overrides:
+            argv += ["--set", kv]
+        if per_conc is not None:
+            argv += ["--concurrency", str(per_conc)]
+        if per_budget is not None:
+            argv += ["--budget-usd", str(per_budget)]
+        out[name] = argv
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Run several SAVI benchmark profiles concurrently")
+    ap.add_argument("--profiles", required=True, help="Comma-separated profile names")
+    ap.add_argument("--config", default="bench/config.json", help="Path to configuration file")
+    ap.add_argument("--set", action="append", default=[], help="Override config for every profile: key=value")
+    ap.add_argument("--max-parallel", type=int, default=None, help="Profiles running at once (default: all)")
+    ap.add_argument("--concurrency", type=int, default=None, help="Global concurrency ceiling shared by running profiles")
+    ap.add_argument("--budget-usd", type=float, default=None, help="Global USD cap, split evenly across profiles")
+    ap.add_argument("--no-report", action="store_true", help="Skip bench.report after the runs")
+    ap.add_argument("--no-pack", action="store_true", help="Skip tools/summarize_and_pack.py after the runs")
+    args = ap.parse_args()
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    known = load_config(args.config).get("profiles", {})
+    missing = [p for p in profiles if p not in known]
+    if missing:
+        raise SystemExit(f"Profile(s) not found in {args.config}: {', '.join(missing)}")
+    max_parallel = args.max_parallel or len(profiles)
+    argvs = plan(profiles, max_parallel, args.concurrency, args.budget_usd, args.config, args.set)
+
+    started = _iso_now()
+    t0 = time.perf_counter()
+    runs: Dict[str, Dict[str, Any]] = {}
+    with ProcessPoolExecutor(max_workers=max(1, min(max_parallel, len(profiles)))) as ex:
+        futures = {ex.submit(_run_profile, argv): name for name, argv in argvs.items()}
+        for f in as_completed(futures):
+            name = futures[f]
+            try:
+                res = f.result()
+                m = res["manifest"]
+                runs[name] = {
+                    "status": "ok",
+                    "wall_s": res["wall_s"],
+                    "manifest": m.get("manifest_path"),
+                    "mode": m.get("mode"),
+                    "budget_usd": m.get("budget_usd"),
+                    "total_cost_usd": m.get("total_cost_usd"),
+                    "stop_reason": m.get("stop_reason"),
+                    "metrics": m.get("metrics"),
+                }
+            except BaseException as e:  # SystemExit from a bad profile included
+                runs[name] = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+            print(f"[orchestrate] {name}: {runs[name]['status']}", flush=True)
+    runs_wall = round(time.perf_counter() - t0, 2)
+
+    steps: Dict[str, Any] = {}
+    if not args.no_report:
+        from .report import main as report_main
+        try:
+            report_main(["--config", args.config])
+            steps["report"] = "ok"
+        except BaseException as e:
+            steps["report"] = f"error: {e}"
+    if not args.no_pack:
+        rc = subprocess.call([sys.executable, "tools/summarize_and_pack.py"])
+        steps["pack"] = "ok" if rc == 0 else f"exit {rc}"
+
+    costs = [r["total_cost_usd"] for r in runs.values() if isinstance(r.get("total_cost_usd"), (int, float))]
+    summary = {
+        "started": started,
+        "config": args.config,
+        "profiles": profiles,
+        "max_parallel": max_parallel,
+        "concurrency": args.concurrency,
+        "budget_usd": args.budget_usd,
+        "total_cost_usd": round(sum(costs), 6) if costs else None,
+        "runs_wall_s": runs_wall,
+        "sequential_wall_s": round(sum(r.get("wall_s", 0.0) for r in runs.values()), 2),
+        "total_wall_s": round(time.perf_counter() - t0, 2),
+        "runs": {name: runs[name] for name in profiles},
+        "steps": steps,
+    }
+    manifests_dir = Path(load_config(args.config).get("manifests_dir", "manifests"))
+    manifests_dir.mkdir(parents=True, exist_ok=True)
+    out = manifests_dir / f"orchestrate-{started.replace(':','').replace('-','').replace('T','').replace('Z','')}.json"
+    out.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print(f"Wrote {out} ({len(profiles)} profiles in {runs_wall}s; sequential sum {summary['sequential_wall_s']}s)")
+    if any(r["status"] != "ok" for r in runs.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Staged real-mode execution: reader -> dispatch -> grade -> write -> aggregate.
+
+Each stage is a small thread pool fed by a bounded ``queue.Queue``, so a slow
+grade no longer holds up the next request and a slow request no longer holds
+up grading. When a stage falls behind, its queue fills and the stages before
+it block on ``put`` (backpressure) instead of buffering the whole suite.
+
+Configured via a ``pipeline`` section (top-level or per profile)::
+
+    "pipeline": {"dispatchers": 1, "graders": 2, "queue_size": 64}
+
+``stats()`` is safe to call while running (live queue depths and per-stage
+throughput for telemetry); ``summary()`` goes into the manifest under
+``metrics.pipeline`` and names the busiest stage as the likely bottleneck.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+_DONE = object()
+
+
+def pipeline_settings(config: dict, profile: str) -> Dict[str, Any]:
+    """Merge top-level and per-profile ``pipeline`` sections (profile wins)."""
+    merged: Dict[str, Any] = {}
+    top = config.get("pipeline")
+    if isinstance(top, dict):
+        merged.update(top)
+    prof = config.get("profiles", {}).get(profile, {}).get("pipeline")
+    if isinstance(prof, dict):
+        merged.update(prof)
+    return merged
+
+
+class _Stage:
+    __slots__ = ("name", "fn", "workers", "inbox", "live", "items", "busy_ns", "blocked_ns",
+                 "max_depth", "depth_sum", "depth_n", "lock")
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], workers: int, queue_size: int) -> None:
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.inbox: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.live = workers
+        self.items = 0
+        self.busy_ns = 0
+        self.blocked_ns = 0  # time spent waiting to hand results downstream
+        self.max_depth = 0
+        self.depth_sum = 0
+        self.depth_n = 0
+        self.lock = threading.Lock()
+
+
+class Pipeline:
+    def __init__(self, dispatchers: int = 1, graders: int = 2, queue_size: int = 64) -> None:
+        self.workers = {"dispatch": max(1, int(dispatchers)), "grade": max(1, int(graders))}
+        self.queue_size = max(1, int(queue_size))
+        self._stages: List[_Stage] = []
+        self.ran = False
+        self._read = 0
+        self._read_blocked_ns = 0
+        self._t0 = 0.0
+        self._t1: Optional[float] = None
+        self._error: Optional[BaseException] = None
+        self._failed = threading.Event()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any], concurrency: Optional[int] = None) -> "Pipeline":
+        return cls(
+            dispatchers=settings.get("dispatchers", concurrency or 1),
+            graders=settings.get("graders", 2),
+            queue_size=settings.get("queue_size", 64),
+        )
+
+    def _put(self, stage: _Stage, item: Any) -> int:
+        """Blocking put into ``stage``'s inbox; returns ns spent blocked and records depth."""
+        t0 = time.perf_counter_ns()
+        stage.inbox.put(item)
+        waited = time.perf_counter_ns() - t0
+        depth = stage.inbox.qsize()
+        with stage.lock:
+            stage.depth_sum += depth
+            stage.depth_n += 1
+            if depth > stage.max_depth:
+                stage.max_depth = depth
+        return waited
+
+    def _work(self, i: int) -> None:
+        st = self._stages[i]
+        nxt = self._stages[i + 1] if i + 1 < len(self._stages) else None
+        while True:
+            item = st.inbox.get()
+            if item is _DONE:
+                with st.lock:
+                    st.live -= 1
+                    last = st.live == 0
+                if last and nxt is not None:
+                    for _ in range(nxt.workers):
+                        nxt.inbox.put(_DONE)
+                return
+            t0 = time.perf_counter_ns()
+            try:
+                out = st.fn(item)
+            except BaseException as e:  # surfaced by run(); keep draining so upstream never blocks
+                if self._error is None:
+                    self._error = e
+                self._failed.set()
+                out = None
+            busy = time.perf_counter_ns() - t0
+            blocked = self._put(nxt, out) if out is not None and nxt is not None else 0
+            with st.lock:
+                st.items += 1
+                st.busy_ns += busy
+                st.blocked_ns += blocked
+
+    def run(self, source: Iterable[Any], stages: List[Tuple[str, Callable[[Any], Any]]]) -> None:
+        """Feed ``source`` through ``stages`` (name, fn) and wait for the last item.
+
+        A stage fn returns the item for the next stage (None drops it). The
+        source is read on the calling thread, so a lazy iterator (e.g.
+        bench.adaptive's plan) sees results that have already been aggregated.
+        """
+        self._stages = [_Stage(name, fn, self.workers.get(name, 1), self.queue_size) for name, fn in stages]
+        threads = [
+            threading.Thread(target=self._work, args=(i,), name=f"pipeline-{st.name}-{w}", daemon=True)
+            for i, st in enumerate(self._stages)
+            for w in range(st.workers)
+        ]
+        self._t0 = time.perf_counter()
+        self._t1 = None
+        self.ran = True
+        for t in threads:
+            t.start()
+        first = self._stages[0]
+        try:
+            for item in source:
+                if self._failed.is_set():
+                    break
+                self._read_blocked_ns += self._put(first, item)
+                self._read += 1
+        finally:
+            for _ in range(first.workers):
+                first.inbox.put(_DONE)
+            for t in threads:
+                t.join()
+            self._t1 = time.perf_counter()
+        if self._error is not None:
+            raise self._error
+
+    def stats(self) -> Dict[str, Any]:
+        """Live view: per-stage queue depth, items done and throughput."""
+        elapsed = (self._t1 or time.perf_counter()) - self._t0 if self._t0 else 0.0
+        out: Dict[str, Any] = {"reader": {"items": self._read, "blocked_s": round(self._read_blocked_ns / 1e9, 3)}}
+        for st in self._stages:
+            with st.lock:
+                items, busy, blocked = st.items, st.busy_ns, st.blocked_ns
+                max_depth, depth_sum, depth_n = st.max_depth, st.depth_sum, st.depth_n
+            out[st.name] = {
+                "workers": st.workers,
+                "queue_depth": st.inbox.qsize(),
+                "queue_max": max_depth,
+                "queue_mean": round(depth_sum / depth_n, 2) if depth_n else 0.0,
+                "items": items,
+                "items_per_s": round(items / elapsed, 3) if elapsed > 0 else 0.0,
+                "busy_s": round(busy / 1e9, 3),
+                "blocked_s": round(blocked / 1e9, 3),
+                "utilization": round(busy / 1e9 / (elapsed * st.workers), 4) if elapsed > 0 else 0.0,
+            }
+        return out
+
+    def summary(self) -> Dict[str, Any]:
+        """Manifest block: settings, wall time, per-stage stats and the busiest stage."""
+        stages = self.stats()
+        busiest = max(self._stages, key=lambda st: stages[st.name]["utilization"], default=None)
+        return {
+            "settings": {**{f"{k}_workers": v for k, v in self.workers.items()}, "queue_size": self.queue_size},
+            "wall_s": round((self._t1 or time.perf_counter()) - self._t0, 3) if self._t0 else None,
+            "stages": stages,
+            "bottleneck": busiest.name if busiest is not None else None,
+        }
@@ -0,0 +1,314 @@
+"""Pre-run planner: forecast a profile's cost and wall time before spending money.
+
+Usage:
+  python -m bench.plan --profile savi_openai_1000
+  python -m bench.plan --profile savi_openai_1000 --budget-usd 250 --deadline-min 45 --max-concurrency 16
+
+Prompt tokens are counted with ``tiktoken`` when it is installed (else a
+chars/words estimate) and cached per suite hash under
+``<store>/tokens/``; ``--sample`` counts a random subset of a large suite and
+extrapolates. Cost comes from a ``pricing`` table keyed by model::
+
+    "pricing": {"gpt-4o": {"input_per_1k_usd": 0.0025, "output_per_1k_usd": 0.01}}
+
+with ``cost.per_task_usd`` as the fallback. Output tokens are bounded by
+``max_tokens`` (worst case) and estimated from the profile's last recorded real
+run (expected case), which also supplies per-task latency for the wall-time
+forecast (``wall ~= tasks * mean latency / concurrency``). Defaults for the
+flags can be set in a ``plan`` section (top-level or per profile).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .report import _percentile
+from .run import _load_suite, _suite_path, load_config
+from .store import ArtifactStore, DEFAULT_STORE_DIR
+
+# chat format overhead per request (role/message framing tokens)
+MESSAGE_OVERHEAD_TOKENS = 7
+DEFAULT_MAX_TOKENS = 256  # bench.model.SaviClient.chat default
+
+
+def plan_settings(config: dict, profile: str) -> Dict[str, Any]:
+    """Merge top-level and per-profile ``plan`` sections (profile wins)."""
+    merged: Dict[str, Any] = {}
+    top = config.get("plan")
+    if isinstance(top, dict):
+        merged.update(top)
+    prof = config.get("profiles", {}).get(profile, {}).get("plan")
+    if isinstance(prof, dict):
+        merged.update(prof)
+    return merged
+
+
+def _heuristic_tokens(text: str) -> int:
+    # ~4 chars/token for English prose, ~0.75 words/token; take the larger
+    return max(1, math.ceil(max(len(text) / 4.0, len(text.split()) * 4.0 / 3.0))) if text else 0
+
+
+def get_tokenizer(model: str) -> Tuple[str, Callable[[str], int]]:
+    """(name, count) using tiktoken's encoding for ``model`` when available."""
+    try:
+        import tiktoken  # type: ignore
+    except Exception:
+        return "heuristic", _heuristic_tokens
+    try:
+        enc = tiktoken.encoding_for_model(model)
+    except Exception:
+        enc = tiktoken.get_encoding("cl100k_base")
+    return f"tiktoken-{enc.name}", lambda s: len(enc.encode(s)) if s else 0
+
+
+def count_prompt_tokens(suite: List[Dict[str, Any]], suite_sha: str, tokenizer: str, count: Callable[[str], int],
+                        store: ArtifactStore, sample: Optional[int] = None, seed: int = 0) -> Dict[str, Any]:
+    """Per-task prompt token counts (all tasks, or a seeded sample), cached per suite hash."""
+    cache_path = store.root / "tokens" / f"{suite_sha}-{re.sub(r'[^A-Za-z0-9_.-]', '_', tokenizer)}.json"
+    try:
+        counts: Dict[str, int] = json.loads(cache_path.read_text(encoding="utf-8")).get("counts", {})
+    except Exception:
+        counts = {}
+    idx = list(range(len(suite)))
+    if sample is not None and sample < len(suite):
+        idx = sorted(random.Random(seed).sample(idx, sample))
+    missing = [i for i in idx if str(i) not in counts]
+    for i in missing:
+        counts[str(i)] = count(str(suite[i].get("prompt", "")))
+    if missing:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_name(cache_path.name + f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"suite_sha256": suite_sha, "tokenizer": tokenizer, "counts": counts}), encoding="utf-8")
+        os.replace(tmp, cache_path)
+    vals = [counts[str(i)] for i in idx]
+    return {
+        "tokenizer": tokenizer,
+        "counted": len(vals),
+        "cached": len(vals) - len(missing),
+        "sampled": len(idx) < len(suite),
+        "by_index": {i: counts[str(i)] for i in idx},
+    }
+
+
+def _suite_prompt_tokens(n_suite: int, by_index: Dict[int, int], tasks: int) -> int:
+    """Prompt tokens for ``tasks`` tasks cycling through the suite (extrapolated when sampled)."""
+    if not by_index or n_suite == 0:
+        return 0
+    mean = sum(by_index.values()) / len(by_index)
+    if len(by_index) < n_suite:
+        return int(round(mean * tasks))
+    full, rest = divmod(tasks, n_suite)
+    return full * sum(by_index.values()) + sum(by_index[i] for i in range(rest))
+
+
+def _last_real_run(manifests_dir: Path, profile: str) -> Optional[Dict[str, Any]]:
+    """The profile's most recent real-mode run manifest, if any."""
+    pointer = manifests_dir / f"{profile}.json"
+    paths: List[Path] = []
+    try:
+        ref = json.loads(pointer.read_text(encoding="utf-8"))
+        if ref.get("manifest"):
+            paths.append(Path(ref["manifest"]))
+    except Exception:
+        pass
+    paths += sorted(manifests_dir.glob(f"run-{profile}-*.json"), reverse=True)
+    for p in paths:
+        try:
+            m = json.loads(p.read_text(encoding="utf-8"))
+        except Exception:
+            continue
+        if m.get("mode") == "real" and m.get("profile") == profile:
+            return {**m, "manifest_path": str(p)}
+    return None
+
+
+def _history(manifest: Optional[Dict[str, Any]], count: Callable[[str], int]) -> Dict[str, Any]:
+    """Per-task latency and output-token stats from a recorded run's traces."""
+    if manifest is None:
+        return {"source": None}
+    out: Dict[str, Any] = {"source": manifest.get("manifest_path"), "run_id": manifest.get("run_id")}
+    traces: List[Dict[str, Any]] = []
+    tasks_path = (manifest.get("artifacts") or {}).get("tasks")
+    if tasks_path and str(tasks_path).endswith(".json"):
+        try:
+            traces = json.loads(Path(tasks_path).read_text(encoding="utf-8"))
+        except Exception:
+            traces = []
+    ok = [t for t in traces if "error" not in t and isinstance(t.get("latency_ms"), (int, float)) and "batch" not in t]
+    if ok:
+        lats = sorted(float(t["latency_ms"]) for t in ok)
+        out["n_tasks"] = len(ok)
+        out["mean_latency_ms"] = round(sum(lats) / len(lats), 1)
+        out["p95_latency_ms"] = round(_percentile(lats, 95), 1)
+        out["mean_output_tokens"] = round(sum(count(str(t.get("got") or "")) for t in ok) / len(ok), 1)
+        out["error_rate"] = round(1 - len(ok) / len(traces), 4) if traces else None
+    else:
+        m = manifest.get("metrics") or {}
+        if isinstance(m.get("p50_ms"), (int, float)):
+            out["mean_latency_ms"] = m["p50_ms"]  # no traces: median stands in for the mean
+            out["p95_latency_ms"] = m.get("p95_ms")
+    return out
+
+
+def _price(config: dict, model: str) -> Optional[Dict[str, float]]:
+    table = config.get("pricing") or {}
+    entry = table.get(model)
+    if entry is None:
+        # longest configured prefix, e.g. "gpt-4o" for "gpt-4o-2024-08-06"
+        keys = sorted((k for k in table if model.startswith(k)), key=len, reverse=True)
+        entry = table.get(keys[0]) if keys else None
+    if not isinstance(entry, dict):
+        return None
+    return {"input_per_1k_usd": float(entry.get("input_per_1k_usd", 0.0)),
+            "output_per_1k_usd": float(entry.get("output_per_1k_usd", 0.0))}
+
+
+def build_plan(config: dict, profile: str, tasks: Optional[int] = None, model: Optional[str] = None,
+               max_tokens: Optional[int] = None, concurrency: Optional[int] = None,
+               budget_usd: Optional[float] = None, deadline_min: Optional[float] = None,
+               max_concurrency: Optional[int] = None, sample: Optional[int] = None,
+               latency_ms: Optional[float] = None) -> Dict[str, Any]:
+    settings = plan_settings(config, profile)
+    model = model or os.getenv("OPENAI_MODEL") or os.getenv("SAVI_MODEL") or settings.get("model") or "gpt-4o"
+    max_tokens = int(max_tokens or settings.get("max_tokens", DEFAULT_MAX_TOKENS))
+    max_concurrency = int(max_concurrency or settings.get("max_concurrency", 16))
+    budget_usd = budget_usd if budget_usd is not None else settings.get("budget_usd")
+    deadline_min = deadline_min if deadline_min is not None else settings.get("deadline_min")
+    sample = sample if sample is not None else settings.get("sample")
+
+    suite = _load_suite(config, profile)
+    suite_path = _suite_path(config, profile)
+    store = ArtifactStore(config.get("store_dir", DEFAULT_STORE_DIR))
+    suite_sha = store.sha256_of(suite_path)
+    if tasks is None:
+        pods = config.get("pods") or {}
+        tasks = int(pods["count"]) * int(pods["size"]) if "count" in pods and "size" in pods else len(suite)
+    tokenizer, count = get_tokenizer(model)
+    tok = count_prompt_tokens(suite, suite_sha, tokenizer, count, store, sample=sample)
+
+    prompt_tokens = _suite_prompt_tokens(len(suite), tok["by_index"], tasks) + MESSAGE_OVERHEAD_TOKENS * tasks
+    hist = _history(_last_real_run(Path(config.get("manifests_dir", "manifests")), profile), count)
+    out_expected = min(float(max_tokens), float(hist.get("mean_output_tokens") or max_tokens))
+
+    price = _price(config, model)
+    cost: Dict[str, Any] = {"model": model, "pricing": price}
+    per_task_usd = (config.get("cost") or {}).get("per_task_usd")
+    if price is not None:
+        cost_in = prompt_tokens / 1000.0 * price["input_per_1k_usd"]
+        cost["source"] = "pricing"
+        cost["worst_case_usd"] = round(cost_in + tasks * max_tokens / 1000.0 * price["output_per_1k_usd"], 4)
+        cost["expected_usd"] = round(cost_in + tasks * out_expected / 1000.0 * price["output_per_1k_usd"], 4)
+    elif per_task_usd is not None:
+        cost["source"] = "cost.per_task_usd"
+        cost["worst_case_usd"] = cost["expected_usd"] = round(tasks * float(per_task_usd), 4)
+    else:
+        cost["source"] = None
+        cost["worst_case_usd"] = cost["expected_usd"] = None
+    cost["per_task_expected_usd"] = round(cost["expected_usd"] / tasks, 6) if cost["expected_usd"] is not None and tasks else None
+
+    mean_ms = latency_ms if latency_ms is not None else hist.get("mean_latency_ms") or settings.get("latency_ms")
+    conc = max(1, int(concurrency or settings.get("concurrency") or 1))
+    if latency_ms is not None:
+        lat_source = "flag"
+    elif hist.get("mean_latency_ms"):
+        lat_source = "history"
+    else:
+        lat_source = "plan.latency_ms" if mean_ms else None
+    wall: Dict[str, Any] = {"mean_latency_ms": mean_ms, "latency_source": lat_source, "concurrency": conc}
+    wall["forecast_min"] = round(tasks * mean_ms / 1000.0 / conc / 60.0, 2) if mean_ms else None
+
+    # Recommendation: largest task count within budget and deadline, and the concurrency to meet the deadline
+    limits: Dict[str, Optional[int]] = {"target": tasks}
+    if budget_usd is not None and cost["per_task_expected_usd"]:
+        limits["budget"] = int(float(budget_usd) // cost["per_task_expected_usd"])
+    if deadline_min is not None and mean_ms:
+        limits["deadline"] = int(float(deadline_min) * 60.0 * max_concurrency / (mean_ms / 1000.0))
+    rec_tasks = min(v for v in limits.values() if v is not None)
+    rec_conc = conc
+    if deadline_min is not None and mean_ms:
+        rec_conc = min(max_concurrency, max(1, math.ceil(rec_tasks * mean_ms / 1000.0 / (float(deadline_min) * 60.0))))
+    binding = min((k for k, v in limits.items() if v is not None), key=lambda k: limits[k])
+    run_args = ["--concurrency", str(rec_conc)]
+    if budget_usd is not None:
+        run_args += ["--budget-usd", str(budget_usd)]
+        if cost["source"] == "pricing" and cost["per_task_expected_usd"]:
+            # bench.run's budget cap counts cost.per_task_usd per task; align it with this forecast
+            run_args += ["--set", f"cost.per_task_usd={cost['per_task_expected_usd']}"]
+    rec_cost = round(rec_tasks * cost["per_task_expected_usd"], 4) if cost["per_task_expected_usd"] else None
+    recommend = {
+        "tasks": rec_tasks,
+        "concurrency": rec_conc,
+        "limited_by": binding,
+        "fits": rec_tasks >= tasks,
+        "expected_cost_usd": rec_cost,
+        "forecast_min": round(rec_tasks * mean_ms / 1000.0 / rec_conc / 60.0, 2) if mean_ms else None,
+        "limits": limits,
+        "run_args": run_args,
+    }
+    return {
+        "profile": profile,
+        "suite": str(suite_path),
+        "suite_sha256": suite_sha,
+        "suite_tasks": len(suite),
+        "tasks": tasks,
+        "tokens": {
+            "tokenizer": tok["tokenizer"],
+            "counted": tok["counted"],
+            "cached": tok["cached"],
+            "sampled": tok["sampled"],
+            "prompt_total": prompt_tokens,
+            "prompt_mean": round(prompt_tokens / tasks, 1) if tasks else None,
+            "max_tokens": max_tokens,
+            "output_expected_mean": round(out_expected, 1),
+            "output_source": "history" if hist.get("mean_output_tokens") is not None else "max_tokens",
+        },
+        "history": hist,
+        "cost": cost,
+        "wall": wall,
+        "budget_usd": budget_usd,
+        "deadline_min": deadline_min,
+        "max_concurrency": max_concurrency,
+        "recommend": recommend,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    ap = argparse.ArgumentParser(description="Forecast a profile's cost and wall time before running it")
+    ap.add_argument("--profile", required=True, help="Benchmark profile to plan")
+    ap.add_argument("--config", default="bench/config.json", help="Path to configuration file")
+    ap.add_argument("--tasks", type=int, default=None, help="Target task count (default: pods count x size, else the suite)")
+    ap.add_argument("--model", default=None, help="Model for tokenizer and pricing (default: OPENAI_MODEL/SAVI_MODEL)")
+    ap.add_argument("--max-tokens", type=int, default=None, help=f"Completion cap per request (default {DEFAULT_MAX_TOKENS})")
+    ap.add_argument("--concurrency", type=int, default=None, help="Concurrency to forecast wall time at (default 1)")
+    ap.add_argument("--budget-usd", type=float, default=None, help="USD cap the recommendation must fit")
+    ap.add_argument("--deadline-min", type=float, default=None, help="Wall-clock minutes the recommendation must fit")
+    ap.add_argument("--max-concurrency", type=int, default=None, help="Highest concurrency to recommend (default 16)")
+    ap.add_argument("--sample", type=int, default=None, help="Count tokens for a random sample of N suite tasks")
+    ap.add_argument("--latency-ms", type=float, default=None, help="Mean task latency to assume (default: last real run)")
+    ap.add_argument("--out", default=None, help="Also write the plan JSON here")
+    args = ap.parse_args(argv)
+
+    config = load_config(args.config)
+    if args.profile not in config.get("profiles", {}):
+        raise SystemExit(f"Profile '{args.profile}' not found in {args.config}")
+    result = build_plan(
+        config, args.profile, tasks=args.tasks, model=args.model, max_tokens=args.max_tokens,
+        concurrency=args.concurrency, budget_usd=args.budget_usd, deadline_min=args.deadline_min,
+        max_concurrency=args.max_concurrency, sample=args.sample, latency_ms=args.latency_ms,
+    )
+    text = json.dumps(result, indent=2)
+    if args.out:
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(text, encoding="utf-8")
+    print(text)
+    return result
+
+
+if __name__ == "__main__":
+    main()
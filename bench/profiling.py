@@ -0,0 +1,168 @@
+"""Harness self-profiling for ``bench.run --profile-harness``.
+
+Stages (request, score, grade, aggregate, ...) are timed with perf_counter_ns
+and accumulated per name; with ``tracemalloc`` the run reports process-wide
+current/peak traced memory and the top allocation sites, plus a snapshot diff
+(net KB and top sites) across each run-level stage in ``SNAPSHOT_STAGES``.
+Per-task stages (request, score, grade, aggregate) get no memory figures:
+they run many times on concurrent pipeline threads and tracemalloc cannot
+attribute allocations to a thread, so a run-level diff includes everything
+its workers allocated in that window. With ``cprofile`` every thread started
+after ``start()`` is profiled too (one profiler per thread before Python 3.12,
+merged in ``stop()``; cProfile covers all threads itself from 3.12) and the top
+functions by cumulative time are kept. The summary goes into the run manifest
+under ``harness_profile``.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Entered once per run on the main thread: cheap enough for a tracemalloc snapshot each side
+SNAPSHOT_STAGES = ("warmup", "run", "soak", "write", "metrics")
+
+
+def _snapshot() -> Any:
+    """tracemalloc snapshot without tracemalloc's own allocations (earlier snapshots)."""
+    import tracemalloc
+    return tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+
+
+class _Stage:
+    __slots__ = ("prof", "name", "t0", "snap")
+
+    def __init__(self, prof: "HarnessProfiler", name: str) -> None:
+        self.prof = prof
+        self.name = name
+        self.snap = None
+
+    def __enter__(self) -> "_Stage":
+        if self.prof.trace_mem and self.name in SNAPSHOT_STAGES:
+            self.snap = _snapshot()
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        self.prof._add(self.name, time.perf_counter_ns() - self.t0)
+        if self.snap is not None:
+            self.prof._add_mem(self.name, _snapshot().compare_to(self.snap, "lineno"))
+            self.snap = None
+        return False
+
+
+class HarnessProfiler:
+    def __init__(self, mode: str = "timers") -> None:
+        self.mode = mode
+        self.trace_mem = mode in ("tracemalloc", "all")
+        self.use_cprofile = mode in ("cprofile", "all")
+        self._lock = threading.Lock()
+        self._stats: Dict[str, List[int]] = {}  # name -> [n, total_ns, max_ns]
+        self._mem: Dict[str, Dict[str, int]] = {}  # name -> {site: net bytes}
+        self._cprof = None
+        self._thread_profs: List[Any] = []
+        self._t0 = 0
+
+    def _add(self, name: str, dt: int) -> None:
+        with self._lock:
+            s = self._stats.get(name)
+            if s is None:
+                self._stats[name] = [1, dt, dt]
+            else:
+                s[0] += 1
+                s[1] += dt
+                if dt > s[2]:
+                    s[2] = dt
+
+    def _add_mem(self, name: str, diff: List[Any]) -> None:
+        with self._lock:
+            sites = self._mem.setdefault(name, {})
+            for s in diff:
+                if s.size_diff:
+                    site = f"{Path(s.traceback[0].filename).name}:{s.traceback[0].lineno}"
+                    sites[site] = sites.get(site, 0) + s.size_diff
+
+    def _profile_thread(self, *_args: Any) -> None:
+        # threading.setprofile hook: runs once in each new thread, then the
+        # thread's own profiler replaces it
+        import cProfile
+        prof = cProfile.Profile()
+        with self._lock:
+            self._thread_profs.append(prof)
+        prof.enable()
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def start(self) -> "HarnessProfiler":
+        if self.trace_mem:
+            import tracemalloc
+            tracemalloc.start()
+        if self.use_cprofile:
+            import cProfile
+            self._cprof = cProfile.Profile()
+            self._cprof.enable()
+            if sys.version_info < (3, 12):
+                threading.setprofile(self._profile_thread)
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def stop(self, prof_path: Optional[Path] = None, top: int = 15) -> Dict[str, Any]:
+        """Stop collectors and return the manifest summary (writes ``prof_path`` for cProfile)."""
+        wall_ns = time.perf_counter_ns() - self._t0
+        summary: Dict[str, Any] = {"mode": self.mode, "wall_ms": round(wall_ns / 1e6, 2), "stages": {}}
+        with self._lock:
+            for name, (n, total, mx) in self._stats.items():
+                row: Dict[str, Any] = {
+                    "n": n,
+                    "total_ms": round(total / 1e6, 3),
+                    "mean_us": round(total / n / 1e3, 2),
+                    "max_ms": round(mx / 1e6, 3),
+                    "share_of_wall": round(total / wall_ns, 4) if wall_ns else None,
+                }
+                mem = self._mem.get(name)
+                if mem is not None:
+                    row["mem_net_kb"] = round(sum(mem.values()) / 1024.0, 1)
+                    row["mem_top_sites"] = [
+                        {"site": site, "kb": round(size / 1024.0, 1)}
+                        for site, size in sorted(mem.items(), key=lambda kv: abs(kv[1]), reverse=True)[:5]
+                    ]
+                summary["stages"][name] = row
+        if self._cprof is not None:
+            threading.setprofile(None)
+            self._cprof.disable()
+            import io
+            import pstats
+            st = pstats.Stats(self._cprof, stream=io.StringIO())
+            with self._lock:
+                thread_profs = list(self._thread_profs)
+            for prof in thread_profs:
+                st.add(prof)
+            rows = sorted(st.stats.items(), key=lambda kv: kv[1][3], reverse=True)[:top]
+            summary["cprofile"] = {
+                "path": str(prof_path) if prof_path else None,
+                "threads": 1 + len(thread_profs),
+                "top_cumulative": [
+                    {"func": f"{Path(fn).name}:{line}({func})", "calls": nc, "tottime_ms": round(tt * 1000.0, 2), "cumtime_ms": round(ct * 1000.0, 2)}
+                    for (fn, line, func), (_cc, nc, tt, ct, _callers) in rows
+                ],
+            }
+            if prof_path is not None:
+                prof_path.parent.mkdir(parents=True, exist_ok=True)
+                st.dump_stats(str(prof_path))
+        if self.trace_mem:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            snap = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            summary["tracemalloc"] = {
+                "current_kb": round(current / 1024.0, 1),
+                "peak_kb": round(peak / 1024.0, 1),
+                "top_sites": [
+                    {"site": f"{Path(s.traceback[0].filename).name}:{s.traceback[0].lineno}", "kb": round(s.size / 1024.0, 1), "count": s.count}
+                    for s in snap.statistics("lineno")[:top]
+                ],
+            }
+        return summary
@@ -0,0 +1,221 @@
+"""Replay recorded task traces against a (possibly different) endpoint.
+
+Usage:
+  python -m bench.replay results/latest.jsonl
+  python -m bench.replay results/tasks-savi_openai_62-20250903125144.json \
+      --base-url https://other.example/v1 --model savi-63 --timing fast --concurrency 16
+
+Each recorded prompt (with its ``system`` prompt, if recorded) is re-issued
+and re-graded with its original scorer. Multi-turn (``turns``) and
+tool-calling (``tools``) traces are skipped with a warning: their traces hold
+per-turn/per-step results, not the conversation or tool specs to re-send. With
+``--timing original`` requests start at the recorded ``t_ms`` offsets (scaled by
+``--speed``); ``--timing fast`` sends them as fast as the concurrency allows.
+The output is a side-by-side diff of latency distributions and scores.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .report import _iter_jsonl, _percentile
+
+
+def load_traces(path: Path) -> List[Dict[str, Any]]:
+    """Load task traces (rows with a prompt or turns) from a JSON array or JSONL file."""
+    text = path.read_text(encoding="utf-8")
+    try:
+        data = json.loads(text)
+        rows = data if isinstance(data, list) else [data]
+    except Exception:
+        rows = list(_iter_jsonl(path))
+    return [r for r in rows if isinstance(r, dict) and (r.get("prompt") or r.get("turns"))]
+
+
+def split_replayable(traces: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Drop multi-turn and tool-calling traces; returns (single-prompt traces, skipped counts)."""
+    keep: List[Dict[str, Any]] = []
+    skipped = {"turns": 0, "tools": 0}
+    for t in traces:
+        if t.get("turns"):
+            skipped["turns"] += 1
+        elif t.get("tools"):
+            skipped["tools"] += 1
+        else:
+            keep.append(t)
+    return keep, skipped
+
+
+def _stats(traces: List[Dict[str, Any]]) -> Dict[str, Any]:
+    lats = sorted(float(t["latency_ms"]) for t in traces if "error" not in t and isinstance(t.get("latency_ms"), (int, float)))
+    n = len(traces)
+    scores = [float(t.get("score") or 0.0) for t in traces]
+
+    def pct(p: float) -> Optional[float]:
+        return round(_percentile(lats, p), 1) if lats else None
+
+    return {
+        "n": n,
+        "errors": sum(1 for t in traces if "error" in t),
+        "success_rate": round(sum(1 for t in traces if t.get("ok") is True) / n, 4) if n else None,
+        "mean_score": round(sum(scores) / n, 2) if n else None,
+        "mean_ms": round(sum(lats) / len(lats), 1) if lats else None,
+        "p50_ms": pct(50),
+        "p90_ms": pct(90),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+    }
+
+
+def _delta(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for k, va in a.items():
+        vb = b.get(k)
+        if isinstance(va, (int, float)) and isinstance(vb, (int, float)):
+            out[k] = round(vb - va, 4)
+        else:
+            out[k] = None
+    return out
+
+
+def diff(recorded: List[Dict[str, Any]], replayed: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compare recorded vs replayed traces overall, per phase and per task."""
+    rec_s, rep_s = _stats(recorded), _stats(replayed)
+    phases = sorted({t.get("phase", "Competition") for t in recorded})
+    by_phase = {}
+    for ph in phases:
+        a = _stats([t for t in recorded if t.get("phase", "Competition") == ph])
+        b = _stats([t for t in replayed if t.get("phase", "Competition") == ph])
+        by_phase[ph] = {"recorded": a, "replay": b, "delta": _delta(a, b)}
+    pass_to_fail = sum(1 for a, b in zip(recorded, replayed) if a.get("ok") is True and b.get("ok") is not True)
+    fail_to_pass = sum(1 for a, b in zip(recorded, replayed) if a.get("ok") is not True and b.get("ok") is True)
+    return {
+        "recorded": rec_s,
+        "replay": rep_s,
+        "delta": _delta(rec_s, rep_s),
+        "by_phase": by_phase,
+        "flips": {"pass_to_fail": pass_to_fail, "fail_to_pass": fail_to_pass},
+    }
+
+
+def replay(traces: List[Dict[str, Any]], client: Any, timing: str = "original",
+           speed: float = 1.0, concurrency: int = 4) -> List[Dict[str, Any]]:
+    """Re-issue each recorded prompt (single-prompt traces, see ``split_replayable``); returns new traces in the recorded order."""
+    from .run import _score_task
+
+    offsets = [float(t.get("t_ms") or 0.0) for t in traces]
+    base = min(offsets) if offsets else 0.0
+    out: List[Optional[Dict[str, Any]]] = [None] * len(traces)
+    t0 = time.perf_counter()
+
+    def one(i: int, scheduled_ms: float) -> None:
+        t = traces[i]
+        start_ms = (time.perf_counter() - t0) * 1000.0
+        prompt = t.get("prompt", "")
+        expected = t.get("expected", "")
+        scorer = t.get("scorer", "contains")
+        rec: Dict[str, Any] = {
+            "id": t.get("id", "task"),
+            "phase": t.get("phase", "Competition"),
+            "prompt": prompt,
+            "expected": expected,
+            "scorer": scorer,
+            "t_ms": round(start_ms, 1),
+            "lag_ms": round(start_ms - scheduled_ms, 1),
+        }
+        kwargs = {"system": t["system"]} if t.get("system") else {}
+        if kwargs:
+            rec["system"] = t["system"]
+        try:
+            text, latency_ms, _raw = client.chat(prompt, **kwargs)
+            score, note = _score_task(prompt, expected, text, scorer)
+            rec.update({"got": text, "score": score, "latency_ms": round(latency_ms, 1),
+                        "note": note, "ok": bool(score >= 60.0)})
+        except Exception as e:  # pragma: no cover
+            rec.update({"error": str(e), "score": 0.0, "latency_ms": 0.0, "ok": False})
+        out[i] = rec
+
+    order = sorted(range(len(traces)), key=lambda i: offsets[i]) if timing == "original" else range(len(traces))
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+        futures = []
+        for i in order:
+            scheduled_ms = 0.0
+            if timing == "original":
+                scheduled_ms = (offsets[i] - base) / max(speed, 1e-9)
+                wait = scheduled_ms / 1000.0 - (time.perf_counter() - t0)
+                if wait > 0:
+                    time.sleep(wait)
+            futures.append(ex.submit(one, i, scheduled_ms))
+        for f in futures:
+            f.result()
+    return [r for r in out if r is not None]
+
+
+def _print_table(summary: Dict[str, Any]) -> None:
+    rec, rep, d = summary["recorded"], summary["replay"], summary["delta"]
+
+    def fmt(v: Any) -> str:
+        return "-" if v is None else str(v)
+
+    print(f"{'metric':<14}{'recorded':>12}{'replay':>12}{'delta':>12}")
+    for k in rec:
+        print(f"{k:<14}{fmt(rec[k]):>12}{fmt(rep.get(k)):>12}{fmt(d.get(k)):>12}")
+    print(f"flips: pass->fail={summary['flips']['pass_to_fail']} fail->pass={summary['flips']['fail_to_pass']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded traces against an endpoint and diff the results")
+    parser.add_argument("traces", help="Recorded traces (tasks-*.json array or JSONL)")
+    parser.add_argument("--base-url", default=None, help="Endpoint base URL (defaults to OPENAI_BASE_URL/SAVI_API_BASE)")
+    parser.add_argument("--model", default=None, help="Model name (defaults to OPENAI_MODEL/SAVI_MODEL)")
+    parser.add_argument("--timing", choices=["original", "fast"], default="original",
+                        help="Reproduce recorded inter-arrival times or send as fast as possible")
+    parser.add_argument("--speed", type=float, default=1.0, help="Time compression factor for --timing original")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max in-flight requests")
+    parser.add_argument("--limit", type=int, default=None, help="Replay only the first N traces")
+    parser.add_argument("--out", default=None, help="Output JSON (default replays/replay-<ts>.json)")
+    args = parser.parse_args()
+
+    traces, skipped = split_replayable(load_traces(Path(args.traces)))
+    if skipped["turns"] or skipped["tools"]:
+        print(f"bench.replay: skipping {skipped['turns']} multi-turn and {skipped['tools']} tool-calling traces "
+              "(not replayable as single prompts)", file=sys.stderr)
+    if args.limit is not None:
+        traces = traces[: args.limit]
+    if not traces:
+        raise SystemExit(f"No replayable single-prompt traces in {args.traces}")
+
+    from .model import SaviClient
+    client = SaviClient(base_url=args.base_url, model=args.model)
+    replayed = replay(traces, client, timing=args.timing, speed=args.speed, concurrency=args.concurrency)
+    summary = diff(traces, replayed)
+    lags = sorted(float(r.get("lag_ms", 0.0)) for r in replayed)
+    summary.update({
+        "source": args.traces,
+        "api_base": client.url,
+        "model": client.model,
+        "timing": args.timing,
+        "speed": args.speed,
+        "concurrency": args.concurrency,
+        "skipped": skipped,
+        "lag_ms": {"p50": round(_percentile(lags, 50), 1), "p95": round(_percentile(lags, 95), 1),
+                   "max": round(lags[-1], 1)} if lags else None,
+    })
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    # not results/: bench.report would sweep the replay into the dashboard log
+    out = Path(args.out) if args.out else Path("replays") / f"replay-{stamp}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"summary": summary, "traces": replayed}, indent=2), encoding="utf-8")
+    _print_table(summary)
+    print(f"Wrote {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ import os
 import re
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 
 def load_config(path: str) -> dict:
@@ -36,6 +36,18 @@ def _load_json_array(path: Path) -> List[Dict[str, Any]]:
         return data if isinstance(data, list) else []
     except Exception:
         return []
+
+
+# results/ files that are run artifacts, not dashboard rows (older runs wrote soak/replay reports there)
+_NON_ROW_PREFIXES = ("soak-", "replay-")
+
+
+def _entry_key(e: Dict[str, Any]) -> Any:
+    """Dashboard log identity: ``run_id`` if present, else (profile, timestamp, phase).
+
+    Shared with tools/merge_json_log.py so merges de-duplicate the same way.
+    """
+    return e.get("run_id") or (e.get("profile"), e.get("timestamp"), e.get("phase"))
 
 
 def _iter_jsonl(path: Path):
@@ -110,6 +122,9 @@ table{{border-collapse:collapse}}td,th{{padding:.4rem .6rem;border:1px solid #dd
     <tr><td>p90 Latency (ms)</td><td>{metrics.get('p90_ms','')}</td></tr>
     <tr><td>p95 Latency (ms)</td><td>{metrics.get('p95_ms','')}</td></tr>
     <tr><td>p99 Latency (ms)</td><td>{metrics.get('p99_ms','')}</td></tr>
+    <tr><td>Latency basis</td><td>{metrics.get('latency_basis','')}</td></tr>
+    <tr><td>Cold-start first request (ms)</td><td>{metrics.get('cold_start_first_ms','')}</td></tr>
+    <tr><td>Cold-start p50 (ms)</td><td>{metrics.get('cold_start_p50_ms','')}</td></tr>
   </tbody>
  </table>
 </body></html>"""
@@ -129,7 +144,7 @@ def _maybe_load_latest_run_manifest(results_dir: Path, manifests_dir: Path) -> D
     return {}
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     parser = argparse.ArgumentParser(description="Generate benchmark report")
     # Mode A: legacy summary generation from config/results
     parser.add_argument("jsonl", nargs="?", help="Optional: path to JSONL to render HTML from")
@@ -138,7 +153,7 @@ def main() -> None:
     parser.add_argument("--html-data", default="data/agi_benchmark_log.json", help="Path to dashboard data JSON (array)")
     # Mode B: JSONL -> HTML
     parser.add_argument("--out", dest="out_html", default="reports/latest.html", help="Output HTML path when rendering JSONL")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # If a JSONL positional arg is provided, render HTML and exit
     if args.jsonl:
@@ -167,7 +182,8 @@ def main() -> None:
                     except Exception:
                         lat = None
             try:
-                if lat is not None:
+                # batched rows carry shared request latency; not comparable to single-shot
+                if lat is not None and not row.get("batch"):
                     lats.append(float(lat))
             except Exception:
                 pass
@@ -208,21 +224,25 @@ def main() -> None:
             "p99_ms": f"{_percentile(lats,99):.1f}" if lats else "",
         }
         # add latency source disclosure
-        has_real = any(isinstance(r.get("latency_ms"), (int, float)) for r in rows)
+        has_real = any(isinstance(r.get("latency_ms"), (int, float)) and not r.get("synthetic") for r in rows)
         latency_source = "real" if has_real and not os.getenv("SIM_LAT_MS") else ("synthetic+sim" if os.getenv("SIM_LAT_MS") else "synthetic")
         payload = {**metrics, **extra, "latency_source": latency_source}
+        # warm-up latencies (bench.run --warmup) are reported apart from the steady-state percentiles
+        cold = (latest_manifest.get("metrics") or {}).get("cold_start") or {}
+        payload["cold_start_first_ms"] = cold.get("first_ms") if cold.get("first_ms") is not None else ""
+        payload["cold_start_p50_ms"] = cold.get("p50_ms") if cold.get("p50_ms") is not None else ""
+        # hedged runs report the winning attempt's latency (bench.hedge)
+        payload["latency_basis"] = (latest_manifest.get("metrics") or {}).get("latency_basis") or "direct"
         _write_simple_html(payload, Path(args.out_html))
         print(f"Wrote HTML report to {args.out_html}")
         # Also update the dashboard data JSON with these rows
         html_data_path = Path("data/agi_benchmark_log.json")
         html_data_path.parent.mkdir(parents=True, exist_ok=True)
         existing = _load_json_array(html_data_path)
-        def key_of(e: Dict[str, Any]):
-            return e.get("run_id") or (e.get("profile"), e.get("timestamp"), e.get("phase"))
-        seen = {key_of(e) for e in existing}
+        seen = {_entry_key(e) for e in existing}
         new_entries: List[Dict[str, Any]] = []
         for rec in rows:
-            k = key_of(rec)
+            k = _entry_key(rec)
             if k in seen:
                 continue
             new_entries.append(rec)
@@ -256,15 +276,14 @@ def main() -> None:
 
     existing = _load_json_array(html_data_path)
     # Index existing entries by run_id if present else (profile,timestamp,phase)
-    def key_of(e: Dict[str, Any]):
-        return e.get("run_id") or (e.get("profile"), e.get("timestamp"), e.get("phase"))
-
-    seen = {key_of(e) for e in existing}
+    seen = {_entry_key(e) for e in existing}
 
     new_entries: List[Dict[str, Any]] = []
     if results_dir.exists():
         # Import structured results first (preferred)
         for jf in results_dir.glob("*.json"):
+            if jf.name.startswith(_NON_ROW_PREFIXES):
+                continue
             try:
                 obj = json.loads(jf.read_text(encoding="utf-8"))
             except Exception:
@@ -277,7 +296,7 @@ def main() -> None:
             else:
                 records = []
             for rec in records:
-                k = key_of(rec)
+                k = _entry_key(rec)
                 if k in seen:
                     continue
                 # ensure required fields exist
@@ -306,7 +325,7 @@ def main() -> None:
                 "retries": 0,
                 "trace": "report-import",
             }
-            k = key_of(minimal)
+            k = _entry_key(minimal)
             if k in seen:
                 continue
             new_entries.append(minimal)
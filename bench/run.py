@@ -1,14 +1,34 @@
-import argparse
 import json
 import random
 import os
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Tuple
-import subprocess
+from typing import List, Dict, Any, Optional, Tuple
+import time
 import hashlib
 
+# Startup budget: argparse, subprocess and the optional feature modules
+# (soak, synth, ...) are imported where they are used; see `tools/perf.py startup`.
 SaviClient = None  # lazy import to avoid hard dependency on requests
+_grade = None  # bench.grade, loaded once on first scored task
+_harness = None  # bench.profiling.HarnessProfiler under --profile-harness
+
+
+class _NullStage:
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def _stage(name: str):
+    """Timer context for a harness stage; a shared no-op unless --profile-harness is on."""
+    return _harness.stage(name) if _harness is not None else _NULL_STAGE
 
 
 def load_config(path: str) -> dict:
@@ -38,19 +58,32 @@ def load_config(path: str) -> dict:
 PHASES = ["Warm-up", "Strength", "Endurance", "Competition"]
 
 
+def _seed_int(seed: str) -> int:
+    """RUN_SEED as a non-negative int for numpy's generator: the number itself, else a stable hash of the string."""
+    try:
+        value = int(seed)
+        if value >= 0:
+            return value
+    except ValueError:
+        pass
+    return int.from_bytes(hashlib.sha256(seed.encode("utf-8")).digest()[:8], "big")
+
+
 def _iso_now() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
+# Simple synthetic scoring per phase (mean, std); adjust as needed for real benchmarks
+_PHASE_BASES = {
+    "Warm-up": (82, 8),
+    "Strength": (76, 10),
+    "Endurance": (72, 12),
+    "Competition": (85, 7),
+}
+
+
 def _score_for_phase(phase: str) -> float:
-    # Simple synthetic scoring per phase; adjust as needed for real benchmarks
-    bases = {
-        "Warm-up": (82, 8),
-        "Strength": (76, 10),
-        "Endurance": (72, 12),
-        "Competition": (85, 7),
-    }
-    mean, std = bases.get(phase, (75, 10))
+    mean, std = _PHASE_BASES.get(phase, (75, 10))
     val = random.gauss(mean, std)
     return max(0.0, min(100.0, round(val, 2)))
 
@@ -86,6 +119,62 @@ def _sha256_text(text: str) -> str:
     return h.hexdigest()
 
 
+def _read_git_head(git_dir: Path) -> Optional[str]:
+    """Resolve HEAD from .git files directly (no subprocess); None if unsure."""
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        if not head.startswith("ref:"):
+            return head or None
+        ref = head.split(":", 1)[1].strip()
+        loose = git_dir / ref
+        if loose.exists():
+            return loose.read_text(encoding="utf-8").strip() or None
+        packed = git_dir / "packed-refs"
+        if packed.exists():
+            for line in packed.read_text(encoding="utf-8").splitlines():
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except Exception:
+        return None
+    return None
+
+
+@lru_cache(maxsize=None)
+def _git_commit() -> Optional[str]:
+    """HEAD commit, cached per process and exported as SAVI_GIT_COMMIT for sharded workers."""
+    commit = os.getenv("SAVI_GIT_COMMIT")
+    if not commit:
+        commit = _read_git_head(Path(".git"))
+    if not commit:
+        try:
+            import subprocess
+            commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=".", text=True).strip()
+        except Exception:
+            commit = None
+    if commit:
+        os.environ["SAVI_GIT_COMMIT"] = commit
+    return commit
+
+
+@lru_cache(maxsize=None)
+def _config_hash(path: str) -> Optional[str]:
+    """sha256 of the config file, cached per process.
+
+    Exported as SAVI_CONFIG_HASH (paired with SAVI_CONFIG_PATH) so sharded
+    workers started with the same config skip re-reading and hashing it.
+    """
+    if os.getenv("SAVI_CONFIG_HASH") and os.getenv("SAVI_CONFIG_PATH") == path:
+        return os.getenv("SAVI_CONFIG_HASH")
+    try:
+        config_hash = _sha256_text(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    os.environ["SAVI_CONFIG_PATH"] = path
+    os.environ["SAVI_CONFIG_HASH"] = config_hash
+    return config_hash
+
+
 # ---- Real suite runner ----
 def _word_count(s: str) -> int:
     return len([w for w in s.strip().split() if w])
@@ -93,9 +182,13 @@ def _word_count(s: str) -> int:
 
 def _score_task(prompt: str, expected: str, got: str, kind: str) -> Tuple[float, str]:
     """Return (score_0_100, note). Delegates to bench.grade when available."""
+    global _grade
     try:
-        from . import grade as _grade  # type: ignore
-        score, note = _grade.score(prompt=prompt, expected=expected, got=got, kind=kind)
+        if _grade is None:
+            from . import grade as _grade_mod  # type: ignore
+            _grade = _grade_mod
+        with _stage("grade"):
+            score, note = _grade.score(prompt=prompt, expected=expected, got=got, kind=kind)
         return float(score), str(note)
     except Exception:
         # Fallback simple scorers
@@ -117,13 +210,17 @@ def _score_task(prompt: str, expected: str, got: str, kind: str) -> Tuple[float,
     return (0.0, "unknown-scorer")
 
 
-def _load_suite(config: dict, profile: str) -> List[Dict[str, Any]]:
+def _suite_path(config: dict, profile: str) -> Path:
     profiles = config.get("profiles", {})
-    suite_path = profiles.get(profile, {}).get("suite", "bench/suites/demo.json")
-    p = Path(suite_path)
+    p = Path(profiles.get(profile, {}).get("suite", "bench/suites/demo.json"))
     if not p.exists():
         # fall back to demo
         p = Path("bench/suites/demo.json")
+    return p
+
+
+def _load_suite(config: dict, profile: str) -> List[Dict[str, Any]]:
+    p = _suite_path(config, profile)
     try:
         data = json.loads(p.read_text(encoding="utf-8"))
         return data if isinstance(data, list) else []
@@ -131,73 +228,391 @@ def _load_suite(config: dict, profile: str) -> List[Dict[str, Any]]:
         return []
 
 
-def _run_real(profile: str, suite: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-    """Run tasks against the SAVI endpoint. Returns (phase_entries, task_traces)."""
-    global SaviClient
-    if SaviClient is None:
-        from .model import SaviClient as _SaviClient  # type: ignore
-        SaviClient = _SaviClient
-    client = SaviClient()
-    # group by phase
-    by_phase: Dict[str, List[Dict[str, Any]]] = {p: [] for p in PHASES}
-    traces: List[Dict[str, Any]] = []
-    for task in suite:
-        phase = task.get("phase", "Competition")
-        prompt = task.get("prompt", "")
-        expected = task.get("answer", "")
-        scorer = task.get("scorer", "contains")
-        tid = task.get("id", "task")
+def _run_real(profile: str, suite: List[Dict[str, Any]], instrument: bool = False, telemetry: Any = None,
+              hedge: Any = None, adaptive: Any = None, pipeline: Any = None,
+              warmup: Any = None, tools: Any = None) -> Tuple[List[Dict[str, Any]], List[Any]]:
+    """Run tasks against the SAVI endpoint. Returns (phase_entries, task_traces).
+
+    Tasks flow through a bench.pipeline.Pipeline (``pipeline``, default one
+    dispatcher and two graders): dispatch -> grade -> write -> aggregate, joined
+    by bounded queues, so grading overlaps the next request.
+
+    Traces are compact bench.traces.Trace records (dict-like for reads; dump
+    with ``default=trace_json``), ordered by start offset. With ``instrument``
+    each trace also carries the client's connection timing breakdown (dns/
+    connect/tls/ttfb/server/transfer) under ``timing``. ``telemetry`` (a
+    bench.telemetry.Telemetry) is told when each task starts and finishes. With
+    ``hedge`` (a bench.hedge.HedgePolicy) stragglers are re-sent and hedged
+    traces carry ``hedge`` (winner, threshold, wasted requests/cost). With
+    ``adaptive`` (a bench.adaptive.AdaptiveSampler) tasks run in its randomized
+    order and each phase stops once its pass-rate and latency intervals are
+    tight enough. ``warmup`` (a bench.warmup.Warmup) first opens the client's
+    connections with unmeasured requests, so connection setup stays out of traces.
+
+    Tasks with ``turns`` run as one multi-turn session (see ``_run_session``);
+    their traces carry per-turn records under ``turns``. A task's ``system``
+    prompt is sent with its request(s) and recorded in its trace. Tasks with ``tools`` run through
+    bench.toolcall with ``tools`` (a ToolRunner) executing the model's tool
+    calls; their traces carry model/tool time and round trips under ``tools``.
+    """
+    from .pipeline import Pipeline
+    from .traces import TraceStore
+
+    if pipeline is None:
+        pipeline = Pipeline()
+    # size the connection pool (and the hedge executor, which follows it) to the
+    # dispatchers: one request each, or a primary plus a hedge when hedging
+    dispatchers = pipeline.workers["dispatch"]
+    client = _get_client(instrument=instrument, pool_size=dispatchers * (2 if hedge is not None else 1))
+    if warmup is not None:
+        with _stage("warmup"):
+            warmup.run(client, connections=dispatchers, instrument=instrument)
+    store = TraceStore()
+    # per-phase running totals: [n, score_sum, n_pass, latency_sum]
+    totals: Dict[str, List[float]] = {}
+    t_start = time.perf_counter()
+
+    def dispatch(task: Dict[str, Any]) -> Dict[str, Any]:
+        # start offset from run start; lets bench.replay reproduce inter-arrival timing
+        job: Dict[str, Any] = {"task": task, "t_ms": round((time.perf_counter() - t_start) * 1000.0, 1), "error": None}
+        if telemetry is not None:
+            telemetry.task_started()
+        kwargs = {"system": task["system"]} if task.get("system") else {}
+        job["hedge"] = None
         try:
-            text, latency_ms, raw = client.chat(prompt)
-            score, note = _score_task(prompt, expected, text, scorer)
-            traces.append({
-                "id": tid,
-                "phase": phase,
-                "prompt": prompt,
-                "expected": expected,
-                "got": text,
-                "score": score,
-                "latency_ms": round(latency_ms, 1),
-                "note": note,
-                "ok": bool(score >= 60.0),
-            })
-            by_phase.setdefault(phase, []).append({"score": score, "latency_ms": latency_ms})
+            with _stage("request"):
+                if task.get("turns"):
+                    job["text"], job["latency_ms"], job["turns"] = _run_session(client, task)
+                elif task.get("tools") and tools is not None:
+                    from .toolcall import run_tool_task
+                    job["text"], job["latency_ms"], job["tools"] = run_tool_task(client, task, tools)
+                elif hedge is not None:
+                    job["text"], job["latency_ms"], _raw, job["hedge"] = client.chat_hedged(task.get("prompt", ""), hedge, **kwargs)
+                else:
+                    job["text"], job["latency_ms"], _raw = client.chat(task.get("prompt", ""), **kwargs)
+            if instrument:
+                job["timing"] = client.last_timing()  # thread-local: read on the dispatching thread
         except Exception as e:  # pragma: no cover
-            traces.append({
-                "id": tid,
-                "phase": phase,
-                "prompt": prompt,
-                "expected": expected,
-                "error": str(e),
-                "score": 0.0,
-                "latency_ms": 0.0,
-                "ok": False,
-            })
-            by_phase.setdefault(phase, []).append({"score": 0.0, "latency_ms": 0.0})
+            job["error"] = str(e)
+        return job
+
+    def grade(job: Dict[str, Any]) -> Dict[str, Any]:
+        if job["error"] is None:
+            task = job["task"]
+            try:
+                with _stage("score"):
+                    if job.get("turns"):
+                        job["score"], job["note"] = _score_session(task, job["turns"])
+                    else:
+                        job["score"], job["note"] = _score_task(task.get("prompt", ""), task.get("answer", ""), job["text"], task.get("scorer", "contains"))
+            except Exception as e:  # pragma: no cover
+                job["error"] = str(e)
+        return job
+
+    def write(job: Dict[str, Any]) -> Dict[str, Any]:
+        if job["error"] is None:
+            rec = store.add(job["task"], job["t_ms"], got=job["text"], score=job["score"], latency_ms=round(job["latency_ms"], 1),
+                            note=job["note"], ok=bool(job["score"] >= 60.0), hedge=job["hedge"], turns=job.get("turns"), tools=job.get("tools"))
+            if instrument:
+                rec.timing = job.get("timing")
+        else:
+            store.add(job["task"], job["t_ms"], error=job["error"])
+        return job
+
+    def aggregate(job: Dict[str, Any]) -> None:
+        phase = job["task"].get("phase", "Competition")
+        if job["error"] is None:
+            score, latency_ms = job["score"], job["latency_ms"]
+            # a wasted hedge is a paid request: charge it to telemetry cost and the budget
+            wasted = int(job["hedge"].get("wasted_requests", 0)) if job.get("hedge") else 0
+            if telemetry is not None:
+                telemetry.task_finished(latency_ms, score >= 60.0,
+                                        cost_usd=telemetry.cost_per_task * (1 + wasted) if wasted else None)
+            if adaptive is not None:
+                adaptive.observe(phase, score >= 60.0, latency_ms, extra_requests=wasted)
+        else:
+            score, latency_ms = 0.0, 0.0
+            if telemetry is not None:
+                telemetry.task_finished(None, False, error=True)
+            if adaptive is not None:
+                adaptive.observe(phase, False, None)
+        acc = totals.get(phase)
+        if acc is None:
+            acc = totals[phase] = [0, 0.0, 0, 0.0]
+        acc[0] += 1
+        acc[1] += score
+        acc[2] += score >= 60.0
+        acc[3] += latency_ms
+
+    try:
+        pipeline.run(
+            adaptive.plan(suite) if adaptive is not None else suite,
+            [("dispatch", dispatch), ("grade", grade), ("write", write), ("aggregate", aggregate)],
+        )
+    finally:
+        if hedge is not None:
+            client.close()  # lets abandoned attempts finish so the unhedged view is complete
+    store.records.sort(key=lambda r: r.t_ms)
 
     # aggregate per phase
     entries: List[Dict[str, Any]] = []
     ts = _iso_now()
+    with _stage("aggregate"):
+        for phase in PHASES:
+            acc = totals.get(phase)
+            if not acc:
+                continue
+            entries.append(_phase_entry_from_totals(profile, ts, phase, int(acc[0]), acc[1], int(acc[2]), acc[3]))
+    return entries, store.records
+
+
+def _run_session(client: Any, task: Dict[str, Any]) -> Tuple[str, float, List[Dict[str, Any]]]:
+    """Send a task's ``turns`` as one conversation; returns (last reply, total latency_ms, turn records).
+
+    ``turns`` is a list of prompts, or of {"prompt", "answer", "scorer"} dicts
+    for turns that are graded individually.
+    """
+    session = client.conversation(system=task.get("system"))
+    text = ""
+    for turn in task["turns"]:
+        text, _dt, _raw = session.send(turn if isinstance(turn, str) else turn.get("prompt", ""))
+    return text, round(sum(t["latency_ms"] for t in session.turns), 1), session.turns
+
+
+def _score_session(task: Dict[str, Any], turns: List[Dict[str, Any]]) -> Tuple[float, str]:
+    """Mean score over turns that have an ``answer``; else the last reply against the task's answer."""
+    scored = []
+    for spec, rec in zip(task["turns"], turns):
+        if isinstance(spec, dict) and "answer" in spec:
+            rec["score"], rec["note"] = _score_task(rec["prompt"], spec["answer"], rec["got"], spec.get("scorer", task.get("scorer", "contains")))
+            scored.append(rec["score"])
+    if scored:
+        return round(sum(scored) / len(scored), 2), f"{len(scored)}/{len(turns)} turns graded"
+    last = turns[-1] if turns else {"prompt": "", "got": ""}
+    return _score_task(last["prompt"], task.get("answer", ""), last["got"], task.get("scorer", "contains"))
+
+
+def _phase_entry(profile: str, ts: str, phase: str, pts: List[Dict[str, Any]], label: str = "") -> Dict[str, Any]:
+    """Aggregate per-task score/latency points into one dashboard phase entry."""
+    return _phase_entry_from_totals(
+        profile, ts, phase, len(pts),
+        sum(p["score"] for p in pts),
+        sum(1 for p in pts if p["score"] >= 60.0),
+        sum(p["latency_ms"] for p in pts),
+        label=label,
+    )
+
+
+def _phase_entry_from_totals(profile: str, ts: str, phase: str, n: int, score_sum: float, n_pass: int, latency_sum: float, label: str = "") -> Dict[str, Any]:
+    avg_score = score_sum / n
+    pass_rate = n_pass / n
+    retries = 0 if avg_score >= 80 else (1 if avg_score >= 60 else 2)
+    return {
+        "run_id": f"{profile}-{ts}-{phase.replace(' ', '').lower()}",
+        "profile": profile,
+        "phase": phase,
+        "timestamp": ts,
+        "status": "pass" if pass_rate >= 0.6 else "fail",
+        "score": round(avg_score, 2),
+        "retries": retries,
+        "trace": f"{label}n={n} avg latency={round(latency_sum / n, 1)}ms",
+    }
+
+
+def _run_soak(profile: str, suite: List[Dict[str, Any]], settings: Dict[str, Any], real: bool, ts: str, traces_path: Path, telemetry: Any = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Soak the Endurance tasks for the configured duration.
+
+    Traces are written to ``traces_path`` (JSONL). Returns
+    (endurance_phase_entry, soak_summary). In synthetic
+    mode the client is simulated with Gaussian latencies that stretch with the
+    number of requests in flight, so overload bursts slow it down like a
+    saturated server; timeout and malformed faults raise as the client would.
+    """
+    from .soak import run_soak
+
+    tasks = [t for t in suite if t.get("phase") == "Endurance"]
+    if real:
+        client = _get_client()
+
+        def call(task: Dict[str, Any], fault: Optional[Dict[str, Any]]) -> Tuple[float, str, float, str]:
+            if fault is not None:
+                text, latency_ms, _raw = client.chat_fault(task.get("prompt", ""), str(fault.get("kind", "timeout")),
+                                                           timeout_s=float(fault.get("timeout_s", 0.05)))
+            else:
+                text, latency_ms, _raw = client.chat(task.get("prompt", ""))
+            score, note = _score_task(task.get("prompt", ""), task.get("answer", ""), text, task.get("scorer", "contains"))
+            return score, note, latency_ms, text
+    else:
+        import threading
+
+        mu = float(settings.get("synthetic_latency_ms", 50.0))
+        capacity = max(1, int(settings.get("concurrency", 4)))
+        if not tasks:
+            tasks = [{"id": "en-synthetic", "phase": "Endurance"}]
+        in_flight = [0]
+        gate = threading.Lock()
+
+        def call(task: Dict[str, Any], fault: Optional[Dict[str, Any]]) -> Tuple[float, str, float, str]:
+            if fault is not None and fault.get("kind") == "malformed":
+                time.sleep(mu * 0.2 / 1000.0)  # rejected after a round trip, before any work
+                raise ValueError("HTTP 400: malformed request body")
+            with gate:
+                in_flight[0] += 1
+                load = max(1.0, in_flight[0] / capacity)
+            try:
+                latency_ms = max(1.0, random.gauss(mu, mu * 0.15)) * load
+                if fault is not None:
+                    timeout_ms = float(fault.get("timeout_s", 0.05)) * 1000.0
+                    if latency_ms > timeout_ms:
+                        time.sleep(timeout_ms / 1000.0)
+                        raise TimeoutError(f"read timed out after {timeout_ms:.0f}ms")
+                time.sleep(latency_ms / 1000.0)
+            finally:
+                with gate:
+                    in_flight[0] -= 1
+            return _score_for_phase("Endurance"), "synthetic", latency_ms, ""
+
+    if telemetry is not None:
+        inner = call
+
+        def call(task: Dict[str, Any], fault: Optional[Dict[str, Any]]) -> Tuple[float, str, float, str]:
+            telemetry.task_started()
+            try:
+                score, note, latency_ms, text = inner(task, fault)
+            except Exception:
+                telemetry.task_finished(None, False, error=True)
+                raise
+            telemetry.task_finished(latency_ms, score >= 60.0)
+            return score, note, latency_ms, text
+
+    steady, summary = run_soak(tasks, call, settings, traces_path)
+    entry = _phase_entry_from_totals(profile, ts, "Endurance", max(1, steady["n"]), steady["score_sum"], steady["n_pass"],
+                                     steady["latency_sum_ms"], label=f"soak {summary.get('elapsed_s', 0)}s ")
+    return entry, summary
+
+
+def _run_batched(profile: str, suite: List[Dict[str, Any]], mode: str, size: int, batch_path: Path) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Run tasks in batched mode ("packed" or "file"). Returns (phase_entries, task_traces).
+
+    Phase entries are labeled batched-<mode> and report the request count;
+    their latency is per request, not per task.
+    """
+    from .batch import run_packed, run_batch_file
+
+    client = _get_client()
+    if mode == "packed":
+        traces = run_packed(client, suite, size, _score_task)
+    else:
+        traces = run_batch_file(client, suite, _score_task, batch_path)
+    entries: List[Dict[str, Any]] = []
+    ts = _iso_now()
     for phase in PHASES:
-        pts = by_phase.get(phase, [])
-        if not pts:
+        rows = [t for t in traces if t.get("phase") == phase]
+        if not rows:
             continue
-        avg_score = sum(p["score"] for p in pts) / len(pts)
-        pass_rate = sum(1 for p in pts if p["score"] >= 60.0) / len(pts)
-        retries = 0 if avg_score >= 80 else (1 if avg_score >= 60 else 2)
-        entries.append({
-            "run_id": f"{profile}-{ts}-{phase.replace(' ', '').lower()}",
-            "profile": profile,
-            "phase": phase,
-            "timestamp": ts,
-            "status": "pass" if pass_rate >= 0.6 else "fail",
-            "score": round(avg_score, 2),
-            "retries": retries,
-            "trace": f"n={len(pts)} avg latency={round(sum(p['latency_ms'] for p in pts)/len(pts),1)}ms",
-        })
+        # file mode has no per-request latency; use the batch wall time
+        pts = [{"score": t["score"], "latency_ms": t.get("latency_ms") or t["batch"].get("elapsed_ms") or 0.0} for t in rows]
+        entry = _phase_entry(profile, ts, phase, pts)
+        n_requests = len({t["batch"]["id"] for t in rows})
+        avg_req = round(sum(p["latency_ms"] for p in pts) / len(pts), 1)
+        entry["trace"] = f"batched-{mode} n={len(rows)} requests={n_requests} avg request latency={avg_req}ms"
+        entries.append(entry)
     return entries, traces
 
 
+def _run_targets(suite: List[Dict[str, Any]], targets: List[Dict[str, Any]], telemetry: Any = None) -> Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+    """Fan every task out to all profile targets. Returns (phase_entries, {target: traces}).
+
+    Phase entries use the target name as their profile so each target keeps
+    its own history on the dashboard.
+    """
+    from .fanout import run_targets
+
+    by_target = run_targets(suite, targets, _get_client, _score_task, telemetry=telemetry)
+    entries: List[Dict[str, Any]] = []
+    ts = _iso_now()
+    for name, traces in by_target.items():
+        for phase in PHASES:
+            pts = [t for t in traces if t.get("phase") == phase]
+            if not pts:
+                continue
+            entry = _phase_entry(name, ts, phase, pts)
+            entry["model"] = pts[0].get("model")
+            entries.append(entry)
+    return entries, by_target
+
+
+def _get_client(instrument: bool = False, **kwargs: Any):
+    global SaviClient
+    if SaviClient is None:
+        from .model import SaviClient as _SaviClient  # type: ignore
+        SaviClient = _SaviClient
+    if instrument:
+        from .model import Instrumentation
+        kwargs["instrumentation"] = Instrumentation()
+    return SaviClient(**kwargs)
+
+
+def _timing_summary(traces: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """p50/p95 per connection-timing component plus connection reuse rate."""
+    from .report import _percentile
+
+    timings = [t["timing"] for t in traces if isinstance(t.get("timing"), dict)]
+    if not timings:
+        return None
+    out: Dict[str, Any] = {
+        "n": len(timings),
+        "reuse_rate": round(sum(1 for t in timings if t.get("reused")) / len(timings), 4),
+    }
+    for k in ("dns_ms", "connect_ms", "tls_ms", "ttfb_ms", "server_ms", "transfer_ms"):
+        vals = sorted(float(t[k]) for t in timings if isinstance(t.get(k), (int, float)))
+        out[k] = {"p50": round(_percentile(vals, 50), 2), "p95": round(_percentile(vals, 95), 2)} if vals else None
+    return out
+
+
+def _session_summary(traces: List[Any]) -> Optional[Dict[str, Any]]:
+    """Per-turn latency, request size and prefix-cache hit rate for multi-turn session traces."""
+    from .report import _percentile
+
+    sessions = [t["turns"] for t in traces if t.get("turns")]
+    if not sessions:
+        return None
+    by_turn: Dict[int, List[Dict[str, Any]]] = {}
+    for turns in sessions:
+        for rec in turns:
+            by_turn.setdefault(int(rec["turn"]), []).append(rec)
+    per_turn = []
+    pts: List[Tuple[float, float]] = []  # (prompt_tokens, latency_ms)
+    for k in sorted(by_turn):
+        recs = by_turn[k]
+        lats = sorted(float(r["latency_ms"]) for r in recs)
+        prompt = [r for r in recs if isinstance(r.get("prompt_tokens"), (int, float))]
+        cached = sum(float(r.get("cached_tokens") or 0) for r in prompt)
+        pts += [(float(r["prompt_tokens"]), float(r["latency_ms"])) for r in prompt]
+        per_turn.append({
+            "turn": k,
+            "n": len(recs),
+            "p50_ms": round(_percentile(lats, 50), 1),
+            "p95_ms": round(_percentile(lats, 95), 1),
+            "mean_request_bytes": round(sum(r["request_bytes"] for r in recs) / len(recs)),
+            "mean_prompt_tokens": round(sum(r["prompt_tokens"] for r in prompt) / len(prompt), 1) if prompt else None,
+            "cached_ratio": round(cached / sum(r["prompt_tokens"] for r in prompt), 4) if prompt and sum(r["prompt_tokens"] for r in prompt) else None,
+        })
+    slope = None
+    if len(pts) >= 2:
+        mx = sum(x for x, _ in pts) / len(pts)
+        my = sum(y for _, y in pts) / len(pts)
+        var = sum((x - mx) ** 2 for x, _ in pts)
+        if var:
+            slope = round(sum((x - mx) * (y - my) for x, y in pts) / var * 1000.0, 2)
+    return {
+        "n_sessions": len(sessions),
+        "n_turns": sum(len(t) for t in sessions),
+        "per_turn": per_turn,
+        "ms_per_1k_prompt_tokens": slope,
+    }
+
+
 def _apply_overrides(config: dict, kvs: List[str]) -> Dict[str, Any]:
     def set_in(d: Dict[str, Any], key_path: List[str], value: Any) -> None:
         cur: Dict[str, Any] = d
@@ -228,7 +643,10 @@ def _apply_overrides(config: dict, kvs: List[str]) -> Dict[str, Any]:
     return config
 
 
-def main() -> None:
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Run one profile (CLI args, or ``argv``) and return its run manifest."""
+    global _harness
+    import argparse
     parser = argparse.ArgumentParser(description="Run SAVI benchmarks")
     parser.add_argument(
         "--config", default="bench/config.json", help="Path to configuration file"
@@ -240,12 +658,57 @@ def main() -> None:
         "--set", action="append", default=[], help="Override config: key=value (supports dots)"
     )
     parser.add_argument(
-        "--concurrency", type=int, default=None, help="Concurrency hint for the run"
+        "--concurrency", type=int, default=None, help="Concurrency hint for the run; real-mode request dispatchers, and a cap on per-target workers in fan-out profiles"
     )
     parser.add_argument(
         "--budget-usd", type=float, default=None, help="Stop when total cost reaches this USD cap"
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--synthetic-engine", choices=["gauss", "numpy"], default=None,
+        help="Synthetic mode engine: per-phase Gaussian draws (default) or bulk NumPy task traces",
+    )
+    parser.add_argument(
+        "--instrument", action="store_true",
+        help="Record per-request dns/connect/tls/ttfb/server/transfer timings in traces and the manifest",
+    )
+    parser.add_argument(
+        "--batch-mode", choices=["packed", "file"], default=None,
+        help="Real mode: pack several tasks per request, or submit one OpenAI batch file",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=8, help="Tasks per packed request (--batch-mode packed)"
+    )
+    parser.add_argument(
+        "--soak-seconds", type=float, default=None, help="Run Endurance as a time-boxed soak for this many seconds"
+    )
+    parser.add_argument(
+        "--progress", type=float, nargs="?", const=5.0, default=None, metavar="SECONDS",
+        help="Print a live progress line to stderr every SECONDS (default 5)",
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, default=None, help="Serve live Prometheus /metrics (and /status JSON) on 127.0.0.1:PORT"
+    )
+    parser.add_argument(
+        "--status-file", default=None, help="Keep a live JSON status file updated during the run"
+    )
+    parser.add_argument(
+        "--hedge", action="store_true",
+        help="Real mode: re-send requests slower than the rolling p95 (see the hedge config section)",
+    )
+    parser.add_argument(
+        "--warmup", type=int, nargs="?", const=0, default=None, metavar="N",
+        help="Real mode: open connections with N unmeasured requests first (default: one per dispatcher); reported as metrics.cold_start",
+    )
+    parser.add_argument(
+        "--adaptive", action="store_true",
+        help="Real mode: sample tasks in random order and stop each phase once its confidence intervals are tight (see the adaptive config section)",
+    )
+    parser.add_argument(
+        "--profile-harness", nargs="?", const="timers", default=None,
+        choices=["timers", "tracemalloc", "cprofile", "all"],
+        help="Time harness stages (request/score/grade/aggregate/...) into the manifest; optionally add tracemalloc and/or cProfile",
+    )
+    args = parser.parse_args(argv)
 
     config = load_config(args.config)
     if args.set:
@@ -260,38 +723,9 @@ def main() -> None:
     manifests_dir.mkdir(parents=True, exist_ok=True)
 
     timestamp = _iso_now()
-
-    # Choose mode: real only if SAVI_API_BASE is configured; else synthetic
-    # Determine mode: real if OpenAI/SAVI key or base present
-    run_real = bool(
-        os.getenv("OPENAI_API_KEY")
-        or os.getenv("SAVI_API_KEY")
-        or os.getenv("OPENAI_BASE_URL")
-        or os.getenv("SAVI_API_BASE")
-    )
-    if run_real:
-        suite = _load_suite(config, args.profile)
-        structured, task_traces = _run_real(args.profile, suite)
-        # Write detailed task traces too
-        detail_json = results_dir / f"tasks-{args.profile}-{timestamp.replace(':','').replace('-','').replace('T','').replace('Z','')}.json"
-        detail_json.write_text(json.dumps(task_traces, indent=2), encoding="utf-8")
-    else:
-        # Seed reproducibility if provided
-        seed = os.getenv("RUN_SEED")
-        if seed:
-            try:
-                random.seed(int(seed))
-            except Exception:
-                random.seed(seed)
-        structured = _gen_phase_entries(args.profile, timestamp)
-        task_traces = []
-
-    # Always write a simple txt marker for summary
-    result_file = results_dir / f"{args.profile}.txt"
-    result_file.write_text(f"profile: {args.profile}\nrun: {timestamp}\n", encoding="utf-8")
-    # And the structured results the dashboard consumes via report step
-    result_json = results_dir / f"{args.profile}-{timestamp.replace(':','').replace('-','').replace('T','').replace('Z','')}.json"
-    result_json.write_text(json.dumps(structured, indent=2), encoding="utf-8")
+    if args.profile_harness:
+        from .profiling import HarnessProfiler
+        _harness = HarnessProfiler(args.profile_harness).start()
 
     # Prepare manifest data
     # Extract DS005-related knobs if present
@@ -331,18 +765,186 @@ def main() -> None:
             stop_reason = f"budget_cap_reached_{args.budget_usd}"
             total_cost_usd = None
 
+    # Choose mode: real only if SAVI_API_BASE is configured; else synthetic
+    # Determine mode: real if OpenAI/SAVI key or base present
+    run_real = bool(
+        os.getenv("OPENAI_API_KEY")
+        or os.getenv("SAVI_API_KEY")
+        or os.getenv("OPENAI_BASE_URL")
+        or os.getenv("SAVI_API_BASE")
+    )
+    soak_cfg = None
+    if args.soak_seconds is not None or "soak" in config or "soak" in profiles[args.profile]:
+        from .soak import soak_settings, soak_enabled
+        soak_cfg = soak_settings(config, args.profile)
+        if args.soak_seconds is not None:
+            soak_cfg["duration_s"] = args.soak_seconds
+        if not soak_enabled(soak_cfg):
+            soak_cfg = None
+    hedge_policy = None
+    if run_real and (args.hedge or "hedge" in config or "hedge" in profiles[args.profile]):
+        from .hedge import HedgePolicy, hedge_settings, hedge_enabled
+        hedge_cfg = hedge_settings(config, args.profile)
+        if args.hedge or hedge_enabled(hedge_cfg):
+            hedge_policy = HedgePolicy.from_settings(hedge_cfg, cost_per_request=cost_per_task)
+    sampler = None
+    if run_real and (args.adaptive or "adaptive" in config or "adaptive" in profiles[args.profile]):
+        from .adaptive import AdaptiveSampler, adaptive_settings, adaptive_enabled
+        adaptive_cfg = adaptive_settings(config, args.profile)
+        if args.adaptive or adaptive_enabled(adaptive_cfg):
+            if "seed" not in adaptive_cfg and os.getenv("RUN_SEED"):
+                adaptive_cfg["seed"] = os.getenv("RUN_SEED")
+            max_tasks = None
+            if args.budget_usd is not None and cost_per_task:
+                max_tasks = int(args.budget_usd // cost_per_task)
+            sampler = AdaptiveSampler.from_settings(adaptive_cfg, max_tasks=max_tasks, cost_per_task=cost_per_task)
+    warmup = None
+    if run_real and (args.warmup is not None or "warmup" in config or "warmup" in profiles[args.profile]):
+        from .warmup import Warmup, warmup_settings, warmup_enabled
+        warmup_cfg = warmup_settings(config, args.profile)
+        if args.warmup:
+            warmup_cfg["requests"] = args.warmup
+        if args.warmup is not None or warmup_enabled(warmup_cfg):
+            warmup = Warmup.from_settings(warmup_cfg)
+    pipeline = None
+    if run_real:
+        from .pipeline import Pipeline, pipeline_settings
+        pipeline = Pipeline.from_settings(pipeline_settings(config, args.profile), concurrency=args.concurrency)
+        if sampler is not None:
+            # keep few tasks queued ahead of the sampler so settled phases stop promptly
+            pipeline.queue_size = min(pipeline.queue_size, pipeline.workers["dispatch"])
+    telemetry = None
+    if args.progress is not None or args.metrics_port or args.status_file:
+        from .telemetry import Telemetry
+        targets_cfg = profiles[args.profile].get("targets") or [None]
+        telemetry = Telemetry(
+            args.profile,
+            total=len(_load_suite(config, args.profile)) * len(targets_cfg) if run_real and soak_cfg is None and sampler is None else None,
+            cost_per_task=cost_per_task,
+            interval=args.progress or 5.0,
+            progress=args.progress is not None,
+            status_file=args.status_file,
+            port=args.metrics_port,
+            pipeline=pipeline,
+        ).start()
+    detail_json = None
+    streamed_tasks = False  # numpy synthetic engine: tasks JSONL is hashed, not stored
+    synth_metrics = None
+    by_target: Dict[str, List[Dict[str, Any]]] = {}
+    target_files: Dict[str, str] = {}
+    if run_real:
+        suite = _load_suite(config, args.profile)
+        if soak_cfg is not None:
+            # Endurance tasks are replayed by the soak instead of a single pass
+            suite = [t for t in suite if t.get("phase") != "Endurance"]
+        targets = profiles[args.profile].get("targets")
+        if targets and args.concurrency:
+            targets = [{**t, "concurrency": min(int(t.get("concurrency", 4)), max(1, args.concurrency))} for t in targets]
+        if targets:
+            from .fanout import resolve_target, unsupported_options
+            prof_cfg = profiles[args.profile]
+            bad = unsupported_options(
+                suite,
+                hedge=args.hedge or bool((prof_cfg.get("hedge") or {}).get("enabled")),
+                warmup=args.warmup is not None or bool((prof_cfg.get("warmup") or {}).get("enabled")),
+                instrument=args.instrument,
+            )
+            if bad:
+                raise SystemExit(f"Profile '{args.profile}' fans out to targets, which does not support: {', '.join(bad)}")
+            try:
+                for t in targets:
+                    resolve_target(t)
+            except ValueError as e:
+                raise SystemExit(f"Profile '{args.profile}': {e}")
+            with _stage("run"):
+                structured, by_target = _run_targets(suite, targets, telemetry=telemetry)
+            task_traces = [t for rows in by_target.values() for t in rows]
+        elif args.batch_mode:
+            batch_path = results_dir / f"batch-{args.profile}-{timestamp.replace(':','').replace('-','').replace('T','').replace('Z','')}.jsonl"
+            with _stage("run"):
+                structured, task_traces = _run_batched(args.profile, suite, args.batch_mode, args.batch_size, batch_path)
+        else:
+            tool_runner = None
+            if any(t.get("tools") for t in suite):
+                from .toolcall import ToolRunner, toolcall_settings
+                tool_runner = ToolRunner.from_settings(toolcall_settings(config, args.profile))
+            try:
+                with _stage("run"):
+                    structured, task_traces = _run_real(args.profile, suite, instrument=args.instrument, telemetry=telemetry, hedge=hedge_policy,
+                                                        adaptive=sampler, pipeline=pipeline, warmup=warmup, tools=tool_runner)
+            finally:
+                if tool_runner is not None:
+                    tool_runner.close()
+        # Write detailed task traces too
+        detail_json = results_dir / f"tasks-{args.profile}-{timestamp.replace(':','').replace('-','').replace('T','').replace('Z','')}.json"
+        with _stage("write"):
+            from .traces import trace_json
+            detail_json.write_text(json.dumps(task_traces, indent=2, default=trace_json), encoding="utf-8")
+            for name, rows in by_target.items():
+                target_json = results_dir / f"tasks-{args.profile}-{name}-{timestamp.replace(':','').replace('-','').replace('T','').replace('Z','')}.json"
+                target_json.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+                target_files[name] = str(target_json)
+    else:
+        # Seed reproducibility if provided
+        seed = os.getenv("RUN_SEED")
+        if seed:
+            try:
+                random.seed(int(seed))
+            except Exception:
+                random.seed(seed)
+        from .synth import synth_settings, generate as _synth_generate
+        synth_cfg = synth_settings(config, args.profile)
+        if args.synthetic_engine:
+            synth_cfg["engine"] = args.synthetic_engine
+        if synth_cfg.get("engine") == "numpy":
+            suite = _load_suite(config, args.profile)
+            n = processed_tasks if processed_tasks is not None else len(suite)
+            detail_json = results_dir / f"tasks-{args.profile}-{timestamp.replace(':','').replace('-','').replace('T','').replace('Z','')}.jsonl"
+            with _stage("run"):
+                agg = _synth_generate(n, suite, synth_cfg, _PHASE_BASES, detail_json, seed=_seed_int(seed) if seed else None)
+            streamed_tasks = True
+            synth_metrics = agg.pop("_all")
+            structured = [
+                _phase_entry_from_totals(args.profile, timestamp, phase, a["n"], a["score_sum"], a["n_pass"], a["latency_sum"], label="synthetic-numpy ")
+                for phase, a in sorted(agg.items(), key=lambda kv: PHASES.index(kv[0]) if kv[0] in PHASES else len(PHASES))
+                if a["n"]
+            ]
+        else:
+            with _stage("run"):
+                structured = _gen_phase_entries(args.profile, timestamp)
+        task_traces = []
+
+    soak_summary = None
+    soak_json = None
+    soak_traces = None
+    if soak_cfg is not None:
+        # outside results_dir: bench.report imports every results/*.json as dashboard rows
+        soak_dir = Path(config.get("soak_dir", "soak"))
+        soak_dir.mkdir(parents=True, exist_ok=True)
+        soak_json = soak_dir / f"soak-{args.profile}-{timestamp.replace(':','').replace('-','').replace('T','').replace('Z','')}.json"
+        soak_traces = soak_json.with_suffix(".jsonl")
+        suite_for_soak = _load_suite(config, args.profile)
+        with _stage("soak"):
+            entry, soak_summary = _run_soak(args.profile, suite_for_soak, soak_cfg, run_real, structured[0]["timestamp"] if structured else timestamp, soak_traces, telemetry=telemetry)
+        structured = [e for e in structured if e.get("phase") != "Endurance"]
+        structured.append(entry)
+        structured.sort(key=lambda e: PHASES.index(e["phase"]) if e.get("phase") in PHASES else len(PHASES))
+        soak_json.write_text(json.dumps({"summary": soak_summary, "traces": soak_traces.name}, indent=2), encoding="utf-8")
+
+    if telemetry is not None:
+        telemetry.stop()
+
+    # Always write a simple txt marker for summary
+    result_file = results_dir / f"{args.profile}.txt"
+    result_file.write_text(f"profile: {args.profile}\nrun: {timestamp}\n", encoding="utf-8")
+    # And the structured results the dashboard consumes via report step
+    result_json = results_dir / f"{args.profile}-{timestamp.replace(':','').replace('-','').replace('T','').replace('Z','')}.json"
+    with _stage("write"):
+        result_json.write_text(json.dumps(structured, indent=2), encoding="utf-8")
+
     # Gather reproducibility + env metadata
-    try:
-        git_commit = (
-            subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=".", text=True).strip()
-        )
-    except Exception:
-        git_commit = None
-    try:
-        cfg_text = Path(args.config).read_text(encoding="utf-8")
-        config_hash = _sha256_text(cfg_text)
-    except Exception:
-        config_hash = None
+    git_commit = _git_commit()
+    config_hash = _config_hash(args.config)
 
     # Compute aggregate metrics
     def _metrics_from_traces(traces: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -370,7 +972,83 @@ def main() -> None:
             "n_fail": fail,
         }
 
-    metrics = _metrics_from_traces(task_traces) if task_traces else None
+    # Fan-out runs: per-target metrics plus paired deltas against the first (baseline) target
+    targets_summary = None
+    comparison = None
+    if by_target:
+        from .fanout import compare
+        names = list(by_target)
+        targets_summary = {
+            name: {
+                "model": rows[0].get("model") if rows else None,
+                "metrics": _metrics_from_traces(rows) if rows else None,
+                "tasks": target_files.get(name),
+            }
+            for name, rows in by_target.items()
+        }
+        comparison = {
+            "baseline": names[0],
+            "vs": {name: compare(by_target[names[0]], by_target[name]) for name in names[1:]},
+        }
+        task_traces = by_target[names[0]]
+
+    # Batched tasks share request latency; keep them out of single-shot percentiles
+    single = [t for t in task_traces if "batch" not in t]
+    batched = [t for t in task_traces if "batch" in t]
+    with _stage("metrics"):
+        metrics = _metrics_from_traces(single) if single else synth_metrics
+    if batched:
+        metrics = metrics or {}
+        metrics["batched"] = {}
+        for mode in sorted({t["batch"]["mode"] for t in batched}):
+            rows = [t for t in batched if t["batch"]["mode"] == mode]
+            metrics["batched"][mode] = {
+                **_metrics_from_traces(rows),
+                "n_requests": len({t["batch"]["id"] for t in rows}),
+                "latency_unit": "per_request",
+            }
+    if metrics is not None and args.instrument:
+        metrics["timing"] = _timing_summary(task_traces)
+    if metrics is not None and hedge_policy is not None and not by_target and not batched:
+        from .hedge import hedge_summary
+        metrics["hedge"] = hedge_summary(task_traces, hedge_policy)
+        # top-level percentiles are the winning attempt's; metrics.hedge.unhedged has the primaries
+        metrics["latency_basis"] = "hedged"
+    if metrics is not None and not by_target and not batched:
+        sessions = _session_summary(task_traces)
+        if sessions is not None:
+            metrics["sessions"] = sessions
+        if any(t.get("tools") for t in task_traces):
+            from .toolcall import tool_summary
+            metrics["tools"] = tool_summary(task_traces)
+    cold_start = warmup.summary() if warmup is not None else None
+    if metrics is not None and cold_start is not None:
+        # warm-up requests stay out of the top-level percentiles (the suite's Warm-up phase tasks do not)
+        metrics["cold_start"] = cold_start
+    if metrics is not None and pipeline is not None and pipeline.ran:
+        metrics["pipeline"] = pipeline.summary()
+    adaptive_summary = None
+    if sampler is not None and not by_target and not batched:
+        adaptive_summary = sampler.summary()
+        processed_tasks = adaptive_summary["n_evaluated"]
+        if cost_per_task:
+            total_cost_usd = round(processed_tasks * cost_per_task, 6)
+        if adaptive_summary["stop_reason"] == "budget":
+            stop_reason = f"budget_cap_reached_{args.budget_usd}"
+        elif adaptive_summary["n_skipped"]:
+            stop_reason = "adaptive_precision_reached"
+    if hedge_policy is not None and cost_per_task and total_cost_usd is not None:
+        # wasted hedge requests are paid for too (the adaptive budget already counts them)
+        wasted = sum(int(t["hedge"].get("wasted_requests", 0)) for t in task_traces if t.get("hedge"))
+        total_cost_usd = round(total_cost_usd + wasted * cost_per_task, 6)
+
+    harness_profile = None
+    harness_prof = None
+    if _harness is not None:
+        if _harness.use_cprofile:
+            harness_prof = results_dir / f"harness-{args.profile}-{timestamp.replace(':','').replace('-','').replace('T','').replace('Z','')}.prof"
+        harness_profile = _harness.stop(harness_prof)
+        _harness = None
 
     # Client env
     api_base = os.getenv("OPENAI_BASE_URL") or os.getenv("SAVI_API_BASE")
@@ -394,24 +1072,64 @@ def main() -> None:
         "total_cost_usd": total_cost_usd,
         "stop_reason": stop_reason,
         "metrics": metrics,
+        "targets": targets_summary,
+        "comparison": comparison,
+        "soak": {k: v for k, v in soak_summary.items() if k != "series"} if soak_summary else None,
+        "adaptive": adaptive_summary,
+        "harness_profile": harness_profile,
         "artifacts": {
             "txt": str(result_file),
             "json": str(result_json),
-            "tasks": str(detail_json) if run_real else None,
+            "tasks": str(detail_json) if detail_json else None,
+            "soak": str(soak_json) if soak_json else None,
+            "soak_traces": str(soak_traces) if soak_traces else None,
+            "harness_prof": str(harness_prof) if harness_prof else None,
         },
     }
-    manifest_file = manifests_dir / f"{args.profile}.json"
-    manifest_file.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    # Content-addressed copies: unchanged config/suite content is stored once across runs
+    from .store import ArtifactStore, DEFAULT_STORE_DIR
+    store = ArtifactStore(config.get("store_dir", DEFAULT_STORE_DIR))
+    blob_paths = {
+        "config": Path(args.config),
+        "suite": _suite_path(config, args.profile),
+        "results": result_json,
+        # streamed synthetic traces are huge and regenerable from the seed: hash only
+        "tasks": None if streamed_tasks else detail_json,
+        "soak": soak_json,
+        "soak_traces": soak_traces,
+        "harness_prof": harness_prof,
+        **{f"tasks:{name}": Path(path) for name, path in target_files.items()},
+    }
+    # run outputs are write-once: hard-link them with their blobs instead of keeping two copies
+    edited_in_place = ("config", "suite")
+    manifest["blobs"] = {k: store.put_file(p, save=False, link=k not in edited_in_place)
+                         for k, p in blob_paths.items() if p is not None and Path(p).exists()}
+    if streamed_tasks and detail_json is not None and detail_json.exists():
+        manifest["unstored_sha256"] = {"tasks": store.sha256_of(detail_json, save=False)}
 
-    # Also write a run-scoped manifest as evidence for proof packs
+    # Run-scoped manifest (evidence for proof packs); committed under manifests/,
+    # so it is referenced by path and hash rather than copied into the store
     run_manifest = {
         "run_id": f"{args.profile}-{timestamp}",
         **manifest,
     }
     run_manifest_file = manifests_dir / f"run-{args.profile}-{timestamp.replace(':','').replace('-','').replace('T','').replace('Z','')}.json"
     run_manifest_file.write_text(json.dumps(run_manifest, indent=2), encoding="utf-8")
+    run_manifest_sha = store.sha256_of(run_manifest_file, save=False)
+    store.save_refs()
+
+    # Per-profile manifest points at the latest run instead of repeating it
+    manifest_file = manifests_dir / f"{args.profile}.json"
+    manifest_file.write_text(json.dumps({
+        "profile": args.profile,
+        "run_id": run_manifest["run_id"],
+        "timestamp": timestamp,
+        "manifest": str(run_manifest_file),
+        "manifest_sha256": run_manifest_sha,
+    }, indent=2), encoding="utf-8")
 
     print(f"Wrote {result_file}, {result_json} and {manifest_file}")
+    return {**run_manifest, "manifest_path": str(run_manifest_file)}
 
 
 if __name__ == "__main__":
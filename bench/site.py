@@ -0,0 +1,270 @@
+"""Incremental static report site: per-run pages, index and trends.
+
+Usage:
+  python -m bench.site [--config bench/config.json] [--out reports/site] [--force]
+
+Run manifests (manifests/run-*.json) are immutable, so each run's page is
+rendered once; a rollup (``<out>/rollup.json``) keeps one summary row per run
+and only new manifests are read. The index and trend pages are regenerated
+from the rollup. Every output is written only when its sha256 differs from the
+last write (``<out>/.state.json``), so unchanged files keep their mtime and
+the Pages deploy only picks up what changed. Templates live in
+bench/templates (``string.Template``); editing one re-renders its pages.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from html import escape
+from pathlib import Path
+from string import Template
+from typing import Any, Dict, List, Optional, Tuple
+
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+ROLLUP_VERSION = 1
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _load_json(path: Path, default: Any) -> Any:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return default
+
+
+def _fmt(v: Any, nd: int = 1) -> str:
+    if v is None or v == "":
+        return "—"
+    if isinstance(v, float):
+        return f"{v:.{nd}f}"
+    return escape(str(v))
+
+
+def _basis(row: Dict[str, Any]) -> str:
+    """Marker for latencies that are not direct requests (hedged runs report the winning attempt)."""
+    basis = row.get("latency_basis")
+    return f" <small>({escape(str(basis))})</small>" if basis and basis != "direct" else ""
+
+
+class Site:
+    def __init__(self, out_dir: Path, force: bool = False) -> None:
+        self.out = out_dir
+        self.force = force
+        self.templates: Dict[str, Template] = {}
+        self.template_hashes: Dict[str, str] = {}
+        for name in ("base", "run", "index", "trend"):
+            raw = (TEMPLATES_DIR / f"{name}.html").read_text(encoding="utf-8")
+            self.templates[name] = Template(raw)
+            self.template_hashes[name] = _sha(raw.encode("utf-8"))
+        self.state_path = out_dir / ".state.json"
+        self.state: Dict[str, Any] = _load_json(self.state_path, {})
+        self.state.setdefault("files", {})
+        self.written = 0
+        self.unchanged = 0
+
+    def template_changed(self, *names: str) -> bool:
+        prev = self.state.get("templates", {})
+        return any(prev.get(n) != self.template_hashes[n] for n in names)
+
+    def page(self, body_tpl: str, title: str, root: str, **fields: str) -> str:
+        body = self.templates[body_tpl].safe_substitute(**fields)
+        return self.templates["base"].safe_substitute(title=escape(title), root=root, body=body)
+
+    def write_if_changed(self, rel: str, text: str) -> bool:
+        data = text.encode("utf-8")
+        sha = _sha(data)
+        path = self.out / rel
+        if not self.force and self.state["files"].get(rel) == sha and path.exists():
+            self.unchanged += 1
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        self.state["files"][rel] = sha
+        self.written += 1
+        return True
+
+    def save_state(self) -> None:
+        self.state["templates"] = self.template_hashes
+        text = json.dumps(self.state, indent=1, sort_keys=True)
+        if self.state_path.exists() and self.state_path.read_text(encoding="utf-8") == text:
+            return
+        self.out.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(text, encoding="utf-8")
+
+
+def _slug(run_id: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_" else "-" for c in run_id)
+
+
+def _phase_entries(manifest: Dict[str, Any], store_dir: Path) -> List[Dict[str, Any]]:
+    """Structured phase results for a run, from results/ or the artifact store."""
+    path = (manifest.get("artifacts") or {}).get("json")
+    data = _load_json(Path(path), None) if path else None
+    sha = (manifest.get("blobs") or {}).get("results")
+    if data is None and sha:
+        data = _load_json(store_dir / "objects" / sha[:2] / sha, None)
+    return [e for e in data if isinstance(e, dict)] if isinstance(data, list) else []
+
+
+def rollup_row(manifest: Dict[str, Any], phases: List[Dict[str, Any]]) -> Dict[str, Any]:
+    m = manifest.get("metrics") or {}
+    run_id = manifest.get("run_id") or f"{manifest.get('profile')}-{manifest.get('timestamp')}"
+    return {
+        "run_id": run_id,
+        "profile": manifest.get("profile"),
+        "timestamp": manifest.get("timestamp"),
+        "mode": manifest.get("mode"),
+        "model": manifest.get("model"),
+        "git_commit": manifest.get("git_commit"),
+        "success_rate": m.get("success_rate"),
+        "p50_ms": m.get("p50_ms"),
+        "p95_ms": m.get("p95_ms"),
+        "p99_ms": m.get("p99_ms"),
+        "latency_basis": m.get("latency_basis") or "direct",
+        "n_tasks": m.get("n_tasks"),
+        "total_cost_usd": manifest.get("total_cost_usd"),
+        "avg_score": round(sum(float(p.get("score") or 0.0) for p in phases) / len(phases), 2) if phases else None,
+        "phase_pass": round(sum(1 for p in phases if p.get("status") == "pass") / len(phases), 4) if phases else None,
+        "page": f"runs/{_slug(run_id)}.html",
+    }
+
+
+def render_run(site: Site, manifest: Dict[str, Any], phases: List[Dict[str, Any]], row: Dict[str, Any]) -> None:
+    m = manifest.get("metrics") or {}
+    summary = [
+        ("Tasks", m.get("n_tasks")), ("Success rate", m.get("success_rate")),
+        ("p50 ms", m.get("p50_ms")), ("p95 ms", m.get("p95_ms")), ("p99 ms", m.get("p99_ms")),
+        ("Latency basis", m.get("latency_basis") or "direct"),
+        ("Cold-start first ms", (m.get("cold_start") or {}).get("first_ms")),
+        ("Cold-start p50 ms", (m.get("cold_start") or {}).get("p50_ms")),
+        ("Processed tasks", manifest.get("processed_tasks")), ("Budget USD", manifest.get("budget_usd")),
+        ("Total cost USD", manifest.get("total_cost_usd")), ("Stop reason", manifest.get("stop_reason")),
+    ]
+    summary_rows = "\n".join(f"<tr><th>{k}</th><td class=\"num\">{_fmt(v, 4 if k == 'Success rate' else 1)}</td></tr>" for k, v in summary)
+    phase_rows = "\n".join(
+        f"<tr><td>{_fmt(p.get('phase'))}</td><td>{_fmt(p.get('status'))}</td>"
+        f"<td class=\"num\">{_fmt(p.get('score'), 2)}</td><td>{_fmt(p.get('trace'))}</td></tr>"
+        for p in phases
+    ) or "<tr><td colspan=\"4\">No phase results.</td></tr>"
+    blob_rows = "\n".join(
+        f"<tr><td>{escape(k)}</td><td><code>{escape(v)}</code></td></tr>" for k, v in sorted((manifest.get("blobs") or {}).items())
+    ) or "<tr><td colspan=\"2\">No stored artifacts.</td></tr>"
+    html = site.page(
+        "run", f"Run {row['run_id']}", "../",
+        profile=_fmt(manifest.get("profile")), mode=_fmt(manifest.get("mode")), model=_fmt(manifest.get("model")),
+        commit=escape((manifest.get("git_commit") or "")[:7]), config_hash=escape((manifest.get("config_hash") or "")[:12]),
+        run_id=escape(row["run_id"]), timestamp=_fmt(manifest.get("timestamp")),
+        summary_rows=summary_rows, phase_rows=phase_rows, blob_rows=blob_rows,
+    )
+    site.write_if_changed(row["page"], html)
+
+
+def _sparkline(vals: List[Optional[float]], width: int = 160, height: int = 28) -> str:
+    pts = [(i, v) for i, v in enumerate(vals) if isinstance(v, (int, float))]
+    if len(pts) < 2:
+        return "—"
+    lo = min(v for _, v in pts)
+    hi = max(v for _, v in pts)
+    span = (hi - lo) or 1.0
+    n = max(1, len(vals) - 1)
+    coords = " ".join(f"{i * width / n:.1f},{height - 2 - (v - lo) * (height - 4) / span:.1f}" for i, v in pts)
+    return (f'<svg class="spark" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+            f'<polyline fill="none" stroke="#2563eb" stroke-width="1.5" points="{coords}"/></svg>')
+
+
+def render_index(site: Site, rows: List[Dict[str, Any]], recent: int = 50) -> None:
+    by_profile: Dict[str, Dict[str, Any]] = {}
+    for r in rows:
+        by_profile[str(r.get("profile"))] = r
+    link = lambda r: f"<a href=\"{escape(r['page'])}\">{escape(r['run_id'])}</a>"  # noqa: E731
+    latest_rows = "\n".join(
+        f"<tr><td>{escape(p)}</td><td>{link(r)}</td><td>{_fmt(r.get('mode'))}</td>"
+        f"<td class=\"num\">{_fmt(r.get('avg_score'), 2)}</td>"
+        f"<td class=\"num\">{_fmt(r.get('success_rate'), 4)}</td><td class=\"num\">{_fmt(r.get('p50_ms'))}</td>"
+        f"<td class=\"num\">{_fmt(r.get('p95_ms'))}{_basis(r)}</td><td class=\"num\">{_fmt(r.get('p99_ms'))}</td>"
+        f"<td class=\"num\">{_fmt(r.get('total_cost_usd'), 2)}</td></tr>"
+        for p, r in sorted(by_profile.items())
+    ) or "<tr><td colspan=\"9\">No runs yet.</td></tr>"
+    recent_rows = "\n".join(
+        f"<tr><td>{link(r)}</td><td>{_fmt(r.get('profile'))}</td><td>{_fmt(r.get('mode'))}</td>"
+        f"<td class=\"num\">{_fmt(r.get('avg_score'), 2)}</td>"
+        f"<td class=\"num\">{_fmt(r.get('success_rate'), 4)}</td><td class=\"num\">{_fmt(r.get('p95_ms'))}{_basis(r)}</td></tr>"
+        for r in reversed(rows[-recent:])
+    ) or "<tr><td colspan=\"6\">No runs yet.</td></tr>"
+    html = site.page("index", "SAVI Runs", "", n_runs=str(len(rows)),
+                     latest=_fmt(rows[-1].get("timestamp")) if rows else "—",
+                     latest_rows=latest_rows, recent_rows=recent_rows)
+    site.write_if_changed("index.html", html)
+
+
+def render_trend(site: Site, rows: List[Dict[str, Any]], window: int = 48) -> None:
+    by_profile: Dict[str, List[Dict[str, Any]]] = {}
+    for r in rows:
+        by_profile.setdefault(str(r.get("profile")), []).append(r)
+    trend_rows = []
+    for p, rs in sorted(by_profile.items()):
+        tail = rs[-window:]
+        trend_rows.append(
+            f"<tr><td>{escape(p)}</td><td class=\"num\">{len(rs)}</td>"
+            f"<td>{_sparkline([r.get('p95_ms') for r in tail])}</td><td class=\"num\">{_fmt(tail[-1].get('p95_ms'))}</td>"
+            f"<td>{_sparkline([r.get('success_rate') for r in tail])}</td><td class=\"num\">{_fmt(tail[-1].get('success_rate'), 4)}</td>"
+            f"<td>{_sparkline([r.get('avg_score') for r in tail])}</td><td class=\"num\">{_fmt(tail[-1].get('avg_score'), 2)}</td></tr>"
+        )
+    html = site.page("trend", "SAVI Trends", "", n_runs=str(len(rows)),
+                     trend_rows="\n".join(trend_rows) or "<tr><td colspan=\"8\">No runs yet.</td></tr>")
+    site.write_if_changed("trend.html", html)
+
+
+def build_site(manifests_dir: Path, out_dir: Path, store_dir: Path, force: bool = False) -> Tuple[int, int, int]:
+    """Update the site. Returns (new_runs, files_written, files_unchanged)."""
+    site = Site(out_dir, force=force)
+    rollup_path = out_dir / "rollup.json"
+    rollup = _load_json(rollup_path, {})
+    if rollup.get("version") != ROLLUP_VERSION:
+        rollup = {"version": ROLLUP_VERSION, "runs": {}}
+    runs: Dict[str, Dict[str, Any]] = rollup["runs"]
+    rerender = force or site.template_changed("base", "run")
+    new = 0
+    for mf in sorted(manifests_dir.glob("run-*.json")):
+        if mf.name in runs and not rerender and (out_dir / runs[mf.name]["page"]).exists():
+            continue
+        manifest = _load_json(mf, None)
+        if not isinstance(manifest, dict):
+            continue
+        phases = _phase_entries(manifest, store_dir)
+        row = rollup_row(manifest, phases)
+        if mf.name not in runs:
+            new += 1
+        runs[mf.name] = row
+        render_run(site, manifest, phases, row)
+    rows = sorted(runs.values(), key=lambda r: (str(r.get("timestamp")), str(r.get("run_id"))))
+    render_index(site, rows)
+    render_trend(site, rows)
+    site.write_if_changed("rollup.json", json.dumps(rollup, indent=1, sort_keys=True))
+    site.save_state()
+    return new, site.written, site.unchanged
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Render the incremental SAVI report site")
+    ap.add_argument("--config", default="bench/config.json", help="Path to configuration file")
+    ap.add_argument("--out", default="reports/site", help="Site output directory")
+    ap.add_argument("--force", action="store_true", help="Re-render and rewrite every page")
+    args = ap.parse_args()
+
+    config = _load_json(Path(args.config), {})
+    new, written, unchanged = build_site(
+        Path(config.get("manifests_dir", "manifests")),
+        Path(args.out),
+        Path(config.get("store_dir", "store")),
+        force=args.force,
+    )
+    print(f"Site {args.out}: {new} new runs, {written} files written, {unchanged} unchanged")
+
+
+if __name__ == "__main__":
+    main()
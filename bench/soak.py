@@ -0,0 +1,348 @@
+"""Time-boxed Endurance soak: replay tasks continuously at a fixed concurrency.
+
+Configured via a ``soak`` section (top-level or per profile), e.g.::
+
+    "soak": {"duration_s": 300, "concurrency": 4, "bucket_s": 10,
+             "error_bursts": [{"at_s": 120, "duration_s": 15, "kind": "timeout"}]}
+
+Each worker loops over the Endurance tasks until the deadline. Traces are
+written to a JSONL file as they complete and the summary is computed in one
+streaming pass over it, so only per-bucket aggregates and latencies are held
+in memory. Results are bucketed by start time into latency/error series; the
+summary reports latency drift, client-side memory growth and recovery after
+fault bursts.
+
+Burst faults hit the system under test: "timeout" sends requests with a short
+client timeout (``timeout_s``, default 0.05), "malformed" sends truncated
+request bodies, and "overload" adds ``overload_factor`` x concurrency extra
+workers (default 4x) for the burst window. Requests started inside a burst
+are tagged with ``fault``; errors and latencies are whatever the endpoint
+returns.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .report import _percentile
+
+# call(task, fault) -> (score, note, latency_ms, text); fault is None or a
+# burst dict with kind "timeout" or "malformed" (overload sends normal calls)
+SoakCall = Callable[[Dict[str, Any], Optional[Dict[str, Any]]], Tuple[float, str, float, str]]
+
+FAULT_KINDS = ("timeout", "malformed", "overload")
+
+
+def soak_settings(config: dict, profile: str) -> Dict[str, Any]:
+    """Merge top-level and per-profile ``soak`` sections (profile wins)."""
+    merged: Dict[str, Any] = {}
+    top = config.get("soak")
+    if isinstance(top, dict):
+        merged.update(top)
+    prof = config.get("profiles", {}).get(profile, {}).get("soak")
+    if isinstance(prof, dict):
+        merged.update(prof)
+    return merged
+
+
+def soak_enabled(settings: Dict[str, Any]) -> bool:
+    try:
+        return float(settings.get("duration_s", 0)) > 0
+    except Exception:
+        return False
+
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size of this process in MB (not the peak), or None if unavailable."""
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as fh:
+            pages = int(fh.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 2)
+    except Exception:
+        pass
+    try:  # pragma: no cover - non-Linux
+        import psutil  # type: ignore
+        return round(psutil.Process().memory_info().rss / (1024 * 1024), 2)
+    except Exception:
+        return None
+
+
+def _fault_kind(burst: Dict[str, Any]) -> str:
+    kind = str(burst.get("kind", "timeout"))
+    return kind if kind in FAULT_KINDS else "timeout"
+
+
+def _in_burst(t_s: float, bursts: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    for b in bursts:
+        start = float(b.get("at_s", 0))
+        if start <= t_s < start + float(b.get("duration_s", 0)):
+            return b
+    return None
+
+
+def _slope(xs: List[float], ys: List[float]) -> Optional[float]:
+    n = len(xs)
+    if n < 2:
+        return None
+    mx = sum(xs) / n
+    my = sum(ys) / n
+    den = sum((x - mx) ** 2 for x in xs)
+    if den == 0:
+        return None
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / den
+
+
+def _bucketize(traces: Iterable[Dict[str, Any]], rss: List[Tuple[float, Optional[float]]],
+               bucket_s: float, duration_s: float,
+               bursts: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """One pass over ``traces``: (per-bucket series, steady-state totals)."""
+    n_buckets = max(1, int(-(-duration_s // bucket_s)))
+    lats: List[List[float]] = [[] for _ in range(n_buckets)]
+    counts = [0] * n_buckets
+    errors = [0] * n_buckets
+    faulted = [0] * n_buckets
+    totals: Dict[str, Any] = {"n": 0, "n_faulted": 0, "n_fault_errors": 0, "n_errors": 0,
+                              "score_sum": 0.0, "n_pass": 0, "latency_sum_ms": 0.0, "latencies": []}
+    for t in traces:
+        i = min(n_buckets - 1, int(t["t_ms"] / 1000.0 // bucket_s))
+        counts[i] += 1
+        totals["n"] += 1
+        if t.get("fault"):
+            faulted[i] += 1
+            totals["n_faulted"] += 1
+            totals["n_fault_errors"] += int("error" in t)
+        else:
+            totals["score_sum"] += float(t["score"])
+            totals["n_pass"] += int(float(t["score"]) >= 60.0)
+            totals["latency_sum_ms"] += float(t["latency_ms"])
+        if "error" in t:
+            errors[i] += 1
+            totals["n_errors"] += int(not t.get("fault"))
+        else:
+            lats[i].append(float(t["latency_ms"]))
+            if not t.get("fault"):
+                totals["latencies"].append(float(t["latency_ms"]))
+    mem: List[Optional[float]] = [None] * n_buckets
+    for t_s, mb in rss:
+        i = min(n_buckets - 1, int(t_s // bucket_s))
+        mem[i] = mb
+    series: List[Dict[str, Any]] = []
+    for i in range(n_buckets):
+        vals = sorted(lats[i])
+        start = i * bucket_s
+        series.append({
+            "t_s": round(start, 3),
+            "n": counts[i],
+            "errors": errors[i],
+            "faulted": faulted[i],
+            "error_rate": round(errors[i] / counts[i], 4) if counts[i] else None,
+            "p50_ms": round(_percentile(vals, 50), 1) if vals else None,
+            "p95_ms": round(_percentile(vals, 95), 1) if vals else None,
+            "rss_mb": mem[i],
+            "burst": _in_burst(start, bursts) is not None,
+        })
+    totals["latencies"].sort()
+    return series, totals
+
+
+def _drift(series: List[Dict[str, Any]], threshold_pct: float) -> Dict[str, Any]:
+    pts = [(b["t_s"], b["p50_ms"]) for b in series if b["p50_ms"] is not None and not b["burst"]]
+    out: Dict[str, Any] = {"threshold_pct": threshold_pct, "detected": False,
+                           "slope_ms_per_min": None, "change_pct": None}
+    if len(pts) < 3:
+        return out
+    slope = _slope([p[0] for p in pts], [p[1] for p in pts])
+    third = max(1, len(pts) // 3)
+    head = sorted(p[1] for p in pts[:third])
+    tail = sorted(p[1] for p in pts[-third:])
+    h = _percentile(head, 50)
+    t = _percentile(tail, 50)
+    change = ((t - h) / h * 100.0) if h else None
+    out["slope_ms_per_min"] = round(slope * 60.0, 3) if slope is not None else None
+    out["change_pct"] = round(change, 2) if change is not None else None
+    out["detected"] = bool(change is not None and change > threshold_pct and (slope or 0) > 0)
+    return out
+
+
+def _memory(rss: List[Tuple[float, Optional[float]]], threshold_mb: float) -> Dict[str, Any]:
+    pts = [(t, mb) for t, mb in rss if mb is not None]
+    out: Dict[str, Any] = {"threshold_mb": threshold_mb, "detected": False,
+                           "start_mb": None, "end_mb": None, "growth_mb": None,
+                           "slope_mb_per_min": None}
+    if len(pts) < 2:
+        return out
+    slope = _slope([p[0] for p in pts], [p[1] for p in pts])
+    growth = pts[-1][1] - pts[0][1]
+    out.update({
+        "start_mb": pts[0][1],
+        "end_mb": pts[-1][1],
+        "growth_mb": round(growth, 2),
+        "slope_mb_per_min": round(slope * 60.0, 3) if slope is not None else None,
+        "detected": bool(growth > threshold_mb),
+    })
+    return out
+
+
+def _recovery(series: List[Dict[str, Any]], bursts: List[Dict[str, Any]],
+              bucket_s: float) -> List[Dict[str, Any]]:
+    """For each burst, time from burst end until error rate and p95 return to baseline."""
+    out: List[Dict[str, Any]] = []
+    for b in bursts:
+        start = float(b.get("at_s", 0))
+        end = start + float(b.get("duration_s", 0))
+        before = [x for x in series if x["t_s"] + bucket_s <= start and not x["burst"] and x["n"]]
+        base_err = (sum(x["errors"] for x in before) / sum(x["n"] for x in before)) if before else 0.0
+        base_p95s = sorted(x["p95_ms"] for x in before if x["p95_ms"] is not None)
+        base_p95 = _percentile(base_p95s, 50) if base_p95s else None
+        during = [x for x in series if x["burst"] and start <= x["t_s"] < end]
+        recovered_after = None
+        for x in series:
+            if x["t_s"] < end or not x["n"] or x["burst"]:
+                continue
+            err_ok = (x["error_rate"] or 0.0) <= base_err + 0.05
+            lat_ok = base_p95 is None or x["p95_ms"] is None or x["p95_ms"] <= base_p95 * 1.25
+            if err_ok and lat_ok:
+                recovered_after = round(x["t_s"] - end, 3)
+                break
+        out.append({
+            "at_s": start,
+            "duration_s": round(end - start, 3),
+            "kind": _fault_kind(b),
+            "errors_during": sum(x["errors"] for x in during),
+            "baseline_error_rate": round(base_err, 4),
+            "baseline_p95_ms": round(base_p95, 1) if base_p95 is not None else None,
+            "recovered_after_s": recovered_after,
+            "recovered": recovered_after is not None,
+        })
+    return out
+
+
+def _read_jsonl(fh: Any) -> Iterable[Dict[str, Any]]:
+    for line in fh:
+        yield json.loads(line)
+
+
+def run_soak(tasks: List[Dict[str, Any]], call: SoakCall, settings: Dict[str, Any],
+             traces_path: Path) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Replay ``tasks`` until ``duration_s`` elapses, writing traces to ``traces_path`` (JSONL).
+
+    Returns (steady, summary): ``steady`` has the non-fault totals (``n``,
+    ``score_sum``, ``n_pass``, ``latency_sum_ms``) for the phase entry.
+    """
+    duration_s = float(settings.get("duration_s", 60))
+    concurrency = max(1, int(settings.get("concurrency", 4)))
+    bucket_s = max(0.1, float(settings.get("bucket_s", 10)))
+    bursts = [b for b in settings.get("error_bursts", []) if isinstance(b, dict)]
+    empty = {"n": 0, "score_sum": 0.0, "n_pass": 0, "latency_sum_ms": 0.0}
+    if not tasks:
+        return empty, {"duration_s": duration_s, "concurrency": concurrency, "n": 0}
+
+    lock = threading.Lock()
+    cycle = itertools.cycle(tasks)
+    # traces go straight to disk (in completion order) so the harness's own
+    # buffer does not show up as memory growth of the process under observation
+    spill = Path(traces_path).open("w+", encoding="utf-8")
+    rss: List[Tuple[float, Optional[float]]] = [(0.0, _rss_mb())]
+    t0 = time.perf_counter()
+    deadline = t0 + duration_s
+    stop = threading.Event()
+
+    def one(task: Dict[str, Any], t_s: float, burst: Optional[Dict[str, Any]]) -> None:
+        rec: Dict[str, Any] = {
+            "id": task.get("id", "task"),
+            "phase": task.get("phase", "Endurance"),
+            "t_ms": round(t_s * 1000.0, 1),
+        }
+        fault = None
+        if burst is not None:
+            rec["fault"] = _fault_kind(burst)
+            fault = burst if rec["fault"] != "overload" else None
+        try:
+            score, note, latency_ms, _text = call(task, fault)
+            rec.update({"score": score, "latency_ms": round(latency_ms, 1),
+                        "note": note, "ok": bool(score >= 60.0)})
+        except Exception as e:
+            rec.update({"error": f"{type(e).__name__}: {e}", "score": 0.0, "latency_ms": 0.0, "ok": False})
+        line = json.dumps(rec)
+        with lock:
+            spill.write(line + "\n")
+
+    def worker() -> None:
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                return
+            with lock:
+                task = next(cycle)
+            t_s = now - t0
+            one(task, t_s, _in_burst(t_s, bursts))
+
+    def overload(burst: Dict[str, Any]) -> None:
+        start = t0 + float(burst.get("at_s", 0))
+        end = min(deadline, start + float(burst.get("duration_s", 0)))
+        delay = start - time.perf_counter()
+        if delay > 0 and stop.wait(delay):
+            return
+        while True:
+            now = time.perf_counter()
+            if now >= end:
+                return
+            with lock:
+                task = next(cycle)
+            one(task, now - t0, burst)
+
+    def sampler() -> None:
+        while not stop.wait(min(bucket_s, 1.0)):
+            rss.append((time.perf_counter() - t0, _rss_mb()))
+
+    extra: List[Dict[str, Any]] = []
+    for b in bursts:
+        if _fault_kind(b) == "overload":
+            factor = max(1.0, float(b.get("overload_factor", 4)))
+            extra.extend([b] * max(1, int(concurrency * (factor - 1))))
+    mon = threading.Thread(target=sampler, daemon=True)
+    mon.start()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency + len(extra)) as ex:
+            futures = [ex.submit(worker) for _ in range(concurrency)]
+            futures += [ex.submit(overload, b) for b in extra]
+            for f in futures:
+                f.result()
+        stop.set()
+        mon.join()
+        elapsed = time.perf_counter() - t0
+        rss.append((min(elapsed, duration_s), _rss_mb()))
+        spill.seek(0)
+        series, totals = _bucketize(_read_jsonl(spill), rss, bucket_s, duration_s, bursts)
+    finally:
+        stop.set()
+        spill.close()
+
+    lats = totals.pop("latencies")
+    n_steady = totals["n"] - totals["n_faulted"]
+    steady = {"n": n_steady, "score_sum": totals["score_sum"], "n_pass": totals["n_pass"],
+              "latency_sum_ms": totals["latency_sum_ms"]}
+    summary = {
+        "duration_s": duration_s,
+        "elapsed_s": round(elapsed, 3),
+        "concurrency": concurrency,
+        "bucket_s": bucket_s,
+        "n": totals["n"],
+        "n_faulted": totals["n_faulted"],
+        "n_fault_errors": totals["n_fault_errors"],
+        "n_errors": totals["n_errors"],
+        "throughput_rps": round(n_steady / elapsed, 3) if elapsed else None,
+        "p50_ms": round(_percentile(lats, 50), 1) if lats else None,
+        "p95_ms": round(_percentile(lats, 95), 1) if lats else None,
+        "drift": _drift(series, float(settings.get("drift_pct", 20.0))),
+        "memory": _memory(rss, float(settings.get("memory_growth_mb", 50.0))),
+        "recovery": _recovery(series, bursts, bucket_s),
+        "series": series,
+    }
+    return steady, summary
@@ -0,0 +1,175 @@
+"""Content-addressed artifact store.
+
+Blobs live at ``<store>/objects/<sha256[:2]>/<sha256>`` and are written once:
+identical config, suite or result content from any number of runs is stored a
+single time, and run manifests reference it by hash (``blobs``).
+
+Write-once run outputs (results, task traces) are stored with ``link=True``:
+the blob and the output path are hard links to one file, so a run's outputs
+exist once on disk. Files edited in place (config, suites) are copied.
+
+``<store>/refs.json`` caches path -> sha256 keyed on (size, mtime_ns), so
+packing and checksumming reuse hashes computed when artifacts were stored
+instead of re-reading every file. Concurrent runs (bench.orchestrate) each
+merge their entries into it under ``refs.lock``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+try:  # POSIX; elsewhere refs.json is still re-read and merged, just without the lock
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+DEFAULT_STORE_DIR = "store"
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _try_link(src: Path, dst: Path) -> bool:
+    try:
+        os.link(src, dst)
+        return True
+    except OSError:
+        return False
+
+
+class ArtifactStore:
+    def __init__(self, root: Path | str = DEFAULT_STORE_DIR) -> None:
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self._refs_path = self.root / "refs.json"
+        self._refs: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty: set = set()  # refs keys recorded by this process since the last save
+        self._lock = threading.Lock()
+
+    def path_for(self, sha: str) -> Path:
+        return self.objects / sha[:2] / sha
+
+    def has(self, sha: str) -> bool:
+        return self.path_for(sha).exists()
+
+    # ---- refs cache ----
+    def _load_refs(self) -> Dict[str, Dict[str, Any]]:
+        if self._refs is None:
+            try:
+                self._refs = json.loads(self._refs_path.read_text(encoding="utf-8"))
+            except Exception:
+                self._refs = {}
+        return self._refs
+
+    @contextmanager
+    def _refs_locked(self) -> Iterator[None]:
+        with (self.root / "refs.lock").open("a") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def save_refs(self) -> None:
+        """Merge this process's new entries into refs.json (other runs' entries are kept)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        refs = self._load_refs()
+        with self._refs_locked():
+            try:
+                merged = json.loads(self._refs_path.read_text(encoding="utf-8"))
+            except Exception:
+                merged = {}
+            merged.update({k: refs[k] for k in self._dirty if k in refs})
+            tmp = self._refs_path.with_name(f"refs.json.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(merged, indent=1, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self._refs_path)
+        self._refs = merged
+        self._dirty.clear()
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return path.resolve().as_posix()
+
+    def cached_sha256(self, path: Path) -> Optional[str]:
+        """Stored hash of ``path`` if the file is unchanged since it was recorded."""
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        ref = self._load_refs().get(self._key(path))
+        if ref and ref.get("size") == st.st_size and ref.get("mtime_ns") == st.st_mtime_ns:
+            return ref.get("sha256")
+        return None
+
+    def _record(self, path: Path, sha: str) -> None:
+        st = path.stat()
+        key = self._key(path)
+        self._load_refs()[key] = {"sha256": sha, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        self._dirty.add(key)
+
+    def sha256_of(self, path: Path, save: bool = True) -> str:
+        """sha256 of ``path``, from the refs cache when the file is unchanged."""
+        path = Path(path)
+        with self._lock:
+            sha = self.cached_sha256(path)
+            if sha is None:
+                sha = _sha256_file(path)
+                self._record(path, sha)
+                if save:
+                    self.save_refs()
+            return sha
+
+    # ---- blobs ----
+    def put_bytes(self, data: bytes) -> str:
+        sha = hashlib.sha256(data).hexdigest()
+        dest = self.path_for(sha)
+        if not dest.exists():
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_name(dest.name + f".{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, dest)
+        return sha
+
+    def put_file(self, path: Path, save: bool = True, link: bool = False) -> str:
+        """Store a file's content (once) and remember its hash for the path.
+
+        With ``link`` (write-once outputs only) the blob and ``path`` end up as
+        hard links to the same file instead of two copies; falls back to a
+        copy where hard links are unsupported. Pass ``save=False`` when
+        storing several files, then call ``save_refs``.
+        """
+        path = Path(path)
+        with self._lock:
+            sha = self.cached_sha256(path) or _sha256_file(path)
+            dest = self.path_for(sha)
+            if not dest.exists():
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                tmp = dest.with_name(dest.name + f".{os.getpid()}.tmp")
+                if not (link and _try_link(path, tmp)):
+                    shutil.copyfile(path, tmp)
+                os.replace(tmp, dest)
+            elif link and not os.path.samefile(path, dest):
+                # content already stored by an earlier run: point the output at that blob
+                tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                if _try_link(dest, tmp):
+                    os.replace(tmp, path)
+            self._record(path, sha)
+            if save:
+                self.save_refs()
+        return sha
+
+    def get_bytes(self, sha: str) -> bytes:
+        return self.path_for(sha).read_bytes()
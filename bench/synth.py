@@ -0,0 +1,136 @@
+"""NumPy-backed synthetic engine: bulk per-task traces for large simulated runs.
+
+Configured via a ``synthetic`` section (top-level or per profile), e.g.::
+
+    "synthetic": {"engine": "numpy", "failure_rate": 0.02, "chunk_size": 100000,
+                  "latency": {"dist": "lognormal", "median_ms": 450, "sigma": 0.35},
+                  "phases": {"Endurance": {"failure_rate": 0.05}}}
+
+Traces share the real-mode schema (``id``, ``phase``, ``score``, ``latency_ms``,
+``ok`` ...) plus ``"synthetic": true`` and are streamed to JSONL chunk by chunk,
+so millions of rows never sit in memory as dicts.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover
+    np = None
+
+LATENCY_DISTS = ("lognormal", "gamma", "normal", "exponential")
+
+
+def synth_settings(config: dict, profile: str) -> Dict[str, Any]:
+    """Merge top-level and per-profile ``synthetic`` sections (profile wins)."""
+    merged: Dict[str, Any] = {}
+    top = config.get("synthetic")
+    if isinstance(top, dict):
+        merged.update(top)
+    prof = config.get("profiles", {}).get(profile, {}).get("synthetic")
+    if isinstance(prof, dict):
+        merged.update(prof)
+    return merged
+
+
+def _latency(rng, n: int, spec: Dict[str, Any]):
+    dist = str(spec.get("dist", "lognormal")).lower()
+    if dist == "lognormal":
+        median = float(spec.get("median_ms", 450.0))
+        out = rng.lognormal(np.log(median), float(spec.get("sigma", 0.35)), n)
+    elif dist == "gamma":
+        mean = float(spec.get("mean_ms", 450.0))
+        shape = float(spec.get("shape", 4.0))
+        out = rng.gamma(shape, mean / shape, n)
+    elif dist == "normal":
+        mean = float(spec.get("mean_ms", 450.0))
+        out = rng.normal(mean, float(spec.get("std_ms", mean * 0.15)), n)
+    elif dist == "exponential":
+        out = rng.exponential(float(spec.get("mean_ms", 450.0)), n)
+    else:
+        raise ValueError(f"unknown latency dist '{dist}' (expected one of {LATENCY_DISTS})")
+    return np.maximum(out, float(spec.get("min_ms", 1.0)))
+
+
+def _pct(vals, p: float) -> Optional[float]:
+    if not len(vals):
+        return None
+    return float(np.percentile(vals, p))
+
+
+def generate(n: int, suite: List[Dict[str, Any]], settings: Dict[str, Any],
+             phase_bases: Dict[str, Tuple[float, float]], out_path: Path,
+             seed: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """Generate ``n`` task traces, cycling through ``suite`` ids/phases, into ``out_path``.
+
+    Returns per-phase aggregates ``{phase: {n, score_sum, n_pass, latency_sum}}``
+    plus an ``"_all"`` entry with run-level metrics.
+    """
+    if np is None:
+        raise SystemExit("numpy is required for the synthetic numpy engine (pip install numpy)")
+    rng = np.random.default_rng(seed)
+    tasks = suite or [{"id": p.replace(" ", "").lower(), "phase": p} for p in phase_bases]
+    phases = sorted({t.get("phase", "Competition") for t in tasks})
+    phase_idx = {p: i for i, p in enumerate(phases)}
+    task_phase = np.array([phase_idx[t.get("phase", "Competition")] for t in tasks], dtype=np.int32)
+    task_ids = [str(t.get("id", "task")) for t in tasks]
+    phase_json = [json.dumps(p) for p in phases]
+
+    lat_spec = settings.get("latency") if isinstance(settings.get("latency"), dict) else {}
+    per_phase = settings.get("phases") if isinstance(settings.get("phases"), dict) else {}
+    fail_default = float(settings.get("failure_rate", 0.0))
+    means = np.array([float(per_phase.get(p, {}).get("score_mean", phase_bases.get(p, (75, 10))[0])) for p in phases])
+    stds = np.array([float(per_phase.get(p, {}).get("score_std", phase_bases.get(p, (75, 10))[1])) for p in phases])
+    fails = np.array([float(per_phase.get(p, {}).get("failure_rate", fail_default)) for p in phases])
+    chunk = max(1, int(settings.get("chunk_size", 100_000)))
+
+    agg = {p: {"n": 0, "score_sum": 0.0, "n_pass": 0, "latency_sum": 0.0} for p in phases}
+    all_lats = []
+    n_ok = 0
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with out_path.open("w", encoding="utf-8") as fh:
+        for start in range(0, n, chunk):
+            m = min(chunk, n - start)
+            idx = np.arange(start, start + m) % len(tasks)
+            ph = task_phase[idx]
+            score = np.clip(np.round(rng.normal(means[ph], stds[ph]), 2), 0.0, 100.0)
+            lat = np.round(_latency(rng, m, lat_spec), 1)
+            failed = rng.random(m) < fails[ph]
+            score[failed] = 0.0
+            lat[failed] = 0.0
+            ok = score >= 60.0
+
+            for i, p in enumerate(phases):
+                sel = ph == i
+                a = agg[p]
+                a["n"] += int(sel.sum())
+                a["score_sum"] += float(score[sel].sum())
+                a["n_pass"] += int(ok[sel].sum())
+                a["latency_sum"] += float(lat[sel].sum())
+            all_lats.append(lat[~failed].astype(np.float32))
+            n_ok += int(ok.sum())
+
+            lines = []
+            for k, j, pi, s, l, o, f in zip(range(start, start + m), idx.tolist(), ph.tolist(), score.tolist(),
+                                             lat.tolist(), ok.tolist(), failed.tolist()):
+                base = f'{{"id": {json.dumps(task_ids[j] + "#" + str(k))}, "phase": {phase_json[pi]}, '
+                if f:
+                    lines.append(base + '"error": "synthetic-failure", "score": 0.0, "latency_ms": 0.0, "ok": false, "synthetic": true}\n')
+                else:
+                    lines.append(base + f'"score": {s}, "latency_ms": {l}, "ok": {"true" if o else "false"}, "synthetic": true}}\n')
+            fh.write("".join(lines))
+
+    lats = np.concatenate(all_lats) if all_lats else np.array([], dtype=np.float32)
+    agg["_all"] = {
+        "p50_ms": round(_pct(lats, 50), 1) if len(lats) else None,
+        "p95_ms": round(_pct(lats, 95), 1) if len(lats) else None,
+        "p99_ms": round(_pct(lats, 99), 1) if len(lats) else None,
+        "success_rate": round(n_ok / n, 4) if n else None,
+        "n_tasks": n or None,
+        "n_ok": n_ok,
+        "n_fail": n - n_ok,
+    }
+    return agg
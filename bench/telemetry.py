@@ -0,0 +1,173 @@
+"""Live run telemetry: console progress line, JSON status file, Prometheus /metrics.
+
+The runner calls ``task_started`` / ``task_finished`` on the hot path; both are
+O(1) counter updates under a lock. Percentiles, rates and all I/O happen on a
+background thread every ``interval`` seconds (and in the HTTP handler).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .report import _percentile
+
+
+class Telemetry:
+    def __init__(self, profile: str, total: Optional[int] = None, cost_per_task: Optional[float] = None,
+                 interval: float = 5.0, window: int = 1024, progress: bool = True,
+                 status_file: Optional[str] = None, port: Optional[int] = None, pipeline: Any = None) -> None:
+        self.profile = profile
+        self.total = total
+        self.cost_per_task = cost_per_task or 0.0
+        self.interval = max(0.5, interval)
+        self.progress = progress
+        self.status_file = Path(status_file) if status_file else None
+        self.port = port
+        self.pipeline = pipeline  # bench.pipeline.Pipeline: adds live queue depths/throughput
+        self._lock = threading.Lock()
+        self._lats: deque = deque(maxlen=window)
+        self._started = 0
+        self._done = 0
+        self._errors = 0
+        self._cost = 0.0
+        self._t0 = time.perf_counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # ---- hot path ----
+    def task_started(self) -> None:
+        with self._lock:
+            self._started += 1
+
+    def task_finished(self, latency_ms: Optional[float], ok: bool, error: bool = False,
+                      cost_usd: Optional[float] = None) -> None:
+        with self._lock:
+            self._done += 1
+            if error:
+                self._errors += 1
+            elif latency_ms is not None:
+                self._lats.append(latency_ms)
+            self._cost += self.cost_per_task if cost_usd is None else cost_usd
+
+    # ---- reporting ----
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            started, done, errors, cost = self._started, self._done, self._errors, self._cost
+            lats = sorted(self._lats)
+        elapsed = time.perf_counter() - self._t0
+        return {
+            "profile": self.profile,
+            "elapsed_s": round(elapsed, 1),
+            "tasks_total": self.total,
+            "tasks_done": done,
+            "tasks_in_flight": max(0, started - done),
+            "tasks_per_sec": round(done / elapsed, 3) if elapsed > 0 else 0.0,
+            "errors": errors,
+            "p50_ms": round(_percentile(lats, 50), 1) if lats else None,
+            "p95_ms": round(_percentile(lats, 95), 1) if lats else None,
+            "cost_usd": round(cost, 6),
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "pipeline": self.pipeline.stats() if self.pipeline is not None and self.pipeline.ran else None,
+        }
+
+    def prometheus(self) -> str:
+        s = self.snapshot()
+        lbl = f'profile="{self.profile}"'
+        lines = [
+            "# TYPE savi_tasks_done_total counter",
+            f"savi_tasks_done_total{{{lbl}}} {s['tasks_done']}",
+            "# TYPE savi_tasks_in_flight gauge",
+            f"savi_tasks_in_flight{{{lbl}}} {s['tasks_in_flight']}",
+            "# TYPE savi_task_errors_total counter",
+            f"savi_task_errors_total{{{lbl}}} {s['errors']}",
+            "# TYPE savi_tasks_per_second gauge",
+            f"savi_tasks_per_second{{{lbl}}} {s['tasks_per_sec']}",
+            "# TYPE savi_cost_usd_total counter",
+            f"savi_cost_usd_total{{{lbl}}} {s['cost_usd']}",
+            "# TYPE savi_latency_ms gauge",
+        ]
+        for q, k in (("0.5", "p50_ms"), ("0.95", "p95_ms")):
+            if s[k] is not None:
+                lines.append(f'savi_latency_ms{{{lbl},quantile="{q}"}} {s[k]}')
+        if self.total is not None:
+            lines += ["# TYPE savi_tasks_target gauge", f"savi_tasks_target{{{lbl}}} {self.total}"]
+        if s["pipeline"]:
+            stages = [(name, st) for name, st in s["pipeline"].items() if "queue_depth" in st]
+            lines.append("# TYPE savi_pipeline_queue_depth gauge")
+            lines += [f'savi_pipeline_queue_depth{{{lbl},stage="{name}"}} {st["queue_depth"]}' for name, st in stages]
+            lines.append("# TYPE savi_pipeline_items_per_second gauge")
+            lines += [f'savi_pipeline_items_per_second{{{lbl},stage="{name}"}} {st["items_per_s"]}' for name, st in stages]
+            lines.append("# TYPE savi_pipeline_utilization gauge")
+            lines += [f'savi_pipeline_utilization{{{lbl},stage="{name}"}} {st["utilization"]}' for name, st in stages]
+        return "\n".join(lines) + "\n"
+
+    def _emit(self) -> None:
+        s = self.snapshot()
+        if self.progress:
+            total = f"/{s['tasks_total']}" if s["tasks_total"] else ""
+            print(
+                f"[{self.profile}] {s['tasks_done']}{total} done, {s['tasks_in_flight']} in flight, "
+                f"{s['tasks_per_sec']}/s, p50={s['p50_ms']}ms p95={s['p95_ms']}ms, "
+                f"errors={s['errors']}, cost=${s['cost_usd']}"
+                + (", queues " + " ".join(f"{name}={st['queue_depth']}" for name, st in s["pipeline"].items() if "queue_depth" in st)
+                   if s["pipeline"] else ""),
+                file=sys.stderr, flush=True,
+            )
+        if self.status_file is not None:
+            self.status_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.status_file.with_suffix(self.status_file.suffix + ".tmp")
+            tmp.write_text(json.dumps(s, indent=2), encoding="utf-8")
+            os.replace(tmp, self.status_file)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._emit()
+
+    def _serve(self) -> None:
+        telemetry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.startswith("/metrics"):
+                    body, ctype = telemetry.prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+                elif self.path.startswith("/status"):
+                    body, ctype = json.dumps(telemetry.snapshot()).encode("utf-8"), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", int(self.port)), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def start(self) -> "Telemetry":
+        self._t0 = time.perf_counter()
+        if self.port:
+            self._serve()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._emit()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
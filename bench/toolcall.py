@@ -0,0 +1,287 @@
+"""Tool-calling tasks: the model calls local tools, the runner executes them.
+
+A suite task lists the tools it may use by name::
+
+    {"id": "t1", "prompt": "Compute 21 * 2 ...", "tools": ["calculator"], "answer": "42:0", "scorer": "approx"}
+
+The request carries OpenAI ``tools`` definitions; each ``tool_calls`` reply is
+executed in a process pool (``spawn`` workers with CPU/memory rlimits where
+the platform has them, a per-call timeout, and only the functions in
+``TOOLS`` callable with JSON arguments), and the results go back as ``tool``
+messages until the model answers or ``max_rounds`` is hit. Tool calls run
+outside the dispatching thread's interpreter, so they never hold up other
+in-flight tasks. Configured via a ``toolcall`` section (top-level or per profile)::
+
+    "toolcall": {"workers": 2, "timeout_s": 5, "cpu_s": 2, "memory_mb": 256, "max_rounds": 4}
+
+Traces carry ``tools``: model time, tool time, round trips and per-step latency.
+"""
+from __future__ import annotations
+
+import ast
+import json
+import operator
+import re
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .report import _percentile
+
+
+def toolcall_settings(config: dict, profile: str) -> Dict[str, Any]:
+    """Merge top-level and per-profile ``toolcall`` sections (profile wins)."""
+    merged: Dict[str, Any] = {}
+    top = config.get("toolcall")
+    if isinstance(top, dict):
+        merged.update(top)
+    prof = config.get("profiles", {}).get(profile, {}).get("toolcall")
+    if isinstance(prof, dict):
+        merged.update(prof)
+    return merged
+
+
+# ---- tools (run in worker processes; JSON in, JSON-able out) ----
+_BINOPS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv, ast.Mod: operator.mod, ast.Pow: operator.pow,
+}
+_UNARY: Dict[type, Callable[[Any], Any]] = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+def _eval_node(node: ast.AST) -> float:
+    if isinstance(node, ast.Expression):
+        return _eval_node(node.body)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+        left, right = _eval_node(node.left), _eval_node(node.right)
+        if isinstance(node.op, ast.Pow) and abs(right) > 64:
+            raise ValueError("exponent too large")
+        out = _BINOPS[type(node.op)](left, right)
+        if isinstance(out, int) and out.bit_length() > 256:
+            raise ValueError("result too large")
+        return out
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+        return _UNARY[type(node.op)](_eval_node(node.operand))
+    raise ValueError(f"unsupported expression: {type(node).__name__}")
+
+
+def calculator(expression: str) -> Dict[str, Any]:
+    """Evaluate an arithmetic expression (numbers, + - * / // % **, parentheses)."""
+    if len(expression) > 200:
+        raise ValueError("expression too long")
+    return {"result": _eval_node(ast.parse(expression, mode="eval"))}
+
+
+def format_email(user: str, domain: str) -> Dict[str, Any]:
+    """Build an email address from a user name and a domain."""
+    local = re.sub(r"[^A-Za-z0-9._%+-]", "", user.strip().replace(" ", ".")).lower()
+    host = re.sub(r"[^A-Za-z0-9.-]", "", domain.strip()).lower()
+    if not local or "." not in host:
+        raise ValueError("invalid user or domain")
+    return {"email": f"{local}@{host}"}
+
+
+def word_count(text: str) -> Dict[str, Any]:
+    """Count whitespace-separated words in a text."""
+    return {"words": len(text.split())}
+
+
+def _schema(desc: str, **props: str) -> Dict[str, Any]:
+    return {
+        "description": desc,
+        "parameters": {
+            "type": "object",
+            "properties": {k: {"type": "string", "description": v} for k, v in props.items()},
+            "required": list(props),
+        },
+    }
+
+
+TOOLS: Dict[str, Tuple[Callable[..., Any], Dict[str, Any]]] = {
+    "calculator": (calculator, _schema("Evaluate an arithmetic expression.", expression="e.g. 21 * 2")),
+    "format_email": (format_email, _schema("Build an email address.", user="user name", domain="e.g. example.com")),
+    "word_count": (word_count, _schema("Count the words in a text.", text="text to count")),
+}
+
+
+def tool_specs(names: List[str]) -> List[Dict[str, Any]]:
+    """OpenAI ``tools`` definitions for the named tools (unknown names are skipped)."""
+    return [{"type": "function", "function": {"name": n, **TOOLS[n][1]}} for n in names if n in TOOLS]
+
+
+def _limit_worker(cpu_s: Optional[float], memory_mb: Optional[int]) -> None:
+    try:
+        import resource
+    except Exception:  # pragma: no cover - not POSIX
+        return
+    if cpu_s:
+        resource.setrlimit(resource.RLIMIT_CPU, (int(cpu_s), int(cpu_s) + 1))
+    if memory_mb:
+        lim = int(memory_mb) * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (lim, lim))
+
+
+def _invoke(name: str, args: Dict[str, Any]) -> Tuple[str, float, bool]:
+    """Worker side: run one tool; returns (JSON result, tool_ms, ok)."""
+    fn, spec = TOOLS[name]
+    allowed = spec["parameters"]["properties"]
+    t0 = time.perf_counter()
+    try:
+        out, ok = json.dumps(fn(**{k: str(v) for k, v in args.items() if k in allowed})), True
+    except Exception as e:
+        out, ok = json.dumps({"error": f"{type(e).__name__}: {e}"}), False
+    return out, (time.perf_counter() - t0) * 1000.0, ok
+
+
+class ToolRunner:
+    """Process pool that executes tool calls with a per-call timeout."""
+
+    def __init__(self, workers: int = 2, timeout_s: float = 5.0, cpu_s: Optional[float] = 2.0,
+                 memory_mb: Optional[int] = 256, max_rounds: int = 4) -> None:
+        self.workers = max(1, int(workers))
+        self.timeout_s = float(timeout_s)
+        self.cpu_s = cpu_s
+        self.memory_mb = memory_mb
+        self.max_rounds = max(1, int(max_rounds))
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "ToolRunner":
+        return cls(
+            workers=settings.get("workers", 2),
+            timeout_s=settings.get("timeout_s", 5.0),
+            cpu_s=settings.get("cpu_s", 2.0),
+            memory_mb=settings.get("memory_mb", 256),
+            max_rounds=settings.get("max_rounds", 4),
+        )
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                import multiprocessing
+                # spawn: forking a process with live request/grader threads is unsafe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_limit_worker, initargs=(self.cpu_s, self.memory_mb),
+                )
+            return self._pool
+
+    def _reset(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def call(self, name: str, args: Dict[str, Any]) -> Tuple[str, float, bool]:
+        """Run one tool call; returns (result JSON for the model, tool_ms, ok)."""
+        if name not in TOOLS:
+            return json.dumps({"error": f"unknown tool {name}"}), 0.0, False
+        for _attempt in range(2):
+            pool = self._get_pool()
+            try:
+                return pool.submit(_invoke, name, args).result(timeout=self.timeout_s)
+            except FutureTimeout:
+                self._reset(pool)  # the stuck worker is abandoned with its pool
+                return json.dumps({"error": "timeout"}), self.timeout_s * 1000.0, False
+            except BrokenProcessPool:  # a worker was killed by its rlimit; retry once on a fresh pool
+                self._reset(pool)
+            except (CancelledError, RuntimeError):  # pool reset by another call's timeout
+                continue
+        return json.dumps({"error": "tool process died"}), 0.0, False
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def run_tool_task(client: Any, task: Dict[str, Any], runner: ToolRunner) -> Tuple[str, float, Dict[str, Any]]:
+    """Drive one tool-calling task; returns (final answer, total latency_ms, tools record).
+
+    ``client`` is a bench.model.SaviClient. Calls from one model turn run
+    concurrently in the pool.
+    """
+    specs = tool_specs(task.get("tools") or [])
+    messages: List[Dict[str, Any]] = []
+    if task.get("system"):
+        messages.append({"role": "system", "content": task["system"]})
+    messages.append({"role": "user", "content": task.get("prompt", "")})
+    steps: List[Dict[str, Any]] = []
+    model_ms = tool_ms = 0.0
+    answer = ""
+    t0 = time.perf_counter()
+    for rnd in range(1, runner.max_rounds + 1):
+        msg, dt, _raw = client.chat_tools(messages, specs)
+        model_ms += dt
+        calls = msg.get("tool_calls") or []
+        steps.append({"round": rnd, "kind": "model", "ms": round(dt, 1), "tool_calls": len(calls)})
+        if not calls:
+            answer = (msg.get("content") or "").strip()
+            break
+        messages.append({"role": "assistant", "content": msg.get("content"), "tool_calls": calls})
+        results: List[Any] = [None] * len(calls)
+
+        def _run(i: int, call: Dict[str, Any]) -> None:
+            fn = call.get("function") or {}
+            try:
+                args = json.loads(fn.get("arguments") or "{}")
+            except Exception:
+                args = {}
+            results[i] = runner.call(str(fn.get("name")), args if isinstance(args, dict) else {})
+
+        threads = [threading.Thread(target=_run, args=(i, c), daemon=True) for i, c in enumerate(calls)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for call, (out, ms, ok) in zip(calls, results):
+            name = (call.get("function") or {}).get("name")
+            steps.append({"round": rnd, "kind": "tool", "name": name, "ms": round(ms, 1), "ok": ok})
+            messages.append({"role": "tool", "tool_call_id": call.get("id"), "content": out})
+        tool_ms += max((r[1] for r in results), default=0.0)  # calls in a round overlap
+    record = {
+        "round_trips": sum(1 for s in steps if s["kind"] == "model"),
+        "calls": [s["name"] for s in steps if s["kind"] == "tool"],
+        "tool_errors": sum(1 for s in steps if s["kind"] == "tool" and not s["ok"]),
+        "model_ms": round(model_ms, 1),
+        "tool_ms": round(tool_ms, 1),
+        "steps": steps,
+        "completed": bool(steps) and steps[-1]["kind"] == "model" and steps[-1]["tool_calls"] == 0,
+    }
+    return answer, (time.perf_counter() - t0) * 1000.0, record
+
+
+def tool_summary(traces: List[Any]) -> Optional[Dict[str, Any]]:
+    """Manifest block: model vs tool time, round trips and calls per tool."""
+    recs = [t["tools"] for t in traces if t.get("tools")]
+    if not recs:
+        return None
+
+    def pcts(vals: List[float]) -> Dict[str, Optional[float]]:
+        vals = sorted(vals)
+        return {"p50": round(_percentile(vals, 50), 1) if vals else None, "p95": round(_percentile(vals, 95), 1) if vals else None}
+
+    by_name: Dict[str, int] = {}
+    for r in recs:
+        for name in r["calls"]:
+            by_name[str(name)] = by_name.get(str(name), 0) + 1
+    tool_steps = [s["ms"] for r in recs for s in r["steps"] if s["kind"] == "tool"]
+    return {
+        "n_tasks": len(recs),
+        "completed": sum(1 for r in recs if r["completed"]),
+        "round_trips": sum(r["round_trips"] for r in recs),
+        "round_trips_mean": round(sum(r["round_trips"] for r in recs) / len(recs), 2),
+        "tool_calls": by_name,
+        "tool_errors": sum(r["tool_errors"] for r in recs),
+        "model_ms": pcts([r["model_ms"] for r in recs]),
+        "tool_ms": pcts([r["tool_ms"] for r in recs]),
+        "tool_call_ms": pcts(tool_steps),
+        "model_share": round(sum(r["model_ms"] for r in recs) / max(1e-9, sum(r["model_ms"] + r["tool_ms"] for r in recs)), 4),
+    }
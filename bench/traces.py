@@ -0,0 +1,113 @@
+"""Compact task traces for large real runs.
+
+A trace dict repeats eleven keys per task. Here each call is a slotted record
+with interned id/phase/scorer strings; prompt/expected reference the suite
+task's own strings. Records read like the old dicts (``t["score"]``,
+``t.get("timing")``, ``"batch" in t``) and ``to_dict`` emits the task trace
+JSON schema, so writers pass ``default=trace_json`` to ``json.dumps``. The
+schema includes ``scorer`` (and ``system`` when set): bench.replay re-grades
+with it.
+"""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+_MISSING = object()
+
+
+@dataclass(slots=True)
+class Trace:
+    id: str
+    phase: str
+    scorer: str
+    prompt: str
+    expected: str
+    t_ms: float
+    score: float = 0.0
+    latency_ms: float = 0.0
+    ok: bool = False
+    got: Optional[str] = None
+    note: Optional[str] = None
+    error: Optional[str] = None
+    timing: Optional[Dict[str, Any]] = None
+    hedge: Optional[Dict[str, Any]] = None
+    system: Optional[str] = None  # the task's system prompt, if any (bench.replay re-sends it)
+    turns: Optional[List[Dict[str, Any]]] = None  # multi-turn session tasks: one record per turn
+    tools: Optional[Dict[str, Any]] = None  # tool-calling tasks: model/tool time, round trips, steps
+
+    def to_dict(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {
+            "id": self.id,
+            "phase": self.phase,
+            "prompt": self.prompt,
+            "expected": self.expected,
+            "scorer": self.scorer,
+            "t_ms": self.t_ms,
+        }
+        if self.system is not None:
+            d["system"] = self.system
+        if self.error is not None:
+            d.update({"error": self.error, "score": self.score, "latency_ms": self.latency_ms, "ok": self.ok})
+            return d
+        d.update({"got": self.got, "score": self.score, "latency_ms": self.latency_ms, "note": self.note, "ok": self.ok})
+        if self.timing is not None:
+            d["timing"] = self.timing
+        if self.hedge is not None:
+            d["hedge"] = self.hedge
+        if self.turns is not None:
+            d["turns"] = self.turns
+        if self.tools is not None:
+            d["tools"] = self.tools
+        return d
+
+    # read-only mapping view, so report/metrics code can treat records like trace dicts
+    def _lookup(self, key: str) -> Any:
+        if key in ("got", "note") and self.error is not None:
+            return _MISSING
+        if key not in self.__slots__:
+            return _MISSING
+        val = getattr(self, key)
+        return _MISSING if val is None and key in ("got", "note", "error", "timing", "hedge", "system", "turns", "tools") else val
+
+    def __getitem__(self, key: str) -> Any:
+        val = self._lookup(key)
+        if val is _MISSING:
+            raise KeyError(key)
+        return val
+
+    def get(self, key: str, default: Any = None) -> Any:
+        val = self._lookup(key)
+        return default if val is _MISSING else val
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._lookup(key) is not _MISSING
+
+
+class TraceStore:
+    """Appends Trace records built from suite tasks."""
+
+    def __init__(self) -> None:
+        self.records: List[Trace] = []
+
+    def add(self, task: Dict[str, Any], t_ms: float, **fields: Any) -> Trace:
+        rec = Trace(
+            id=sys.intern(str(task.get("id", "task"))),
+            phase=sys.intern(task.get("phase", "Competition")),
+            scorer=sys.intern(task.get("scorer", "contains")),
+            prompt=task.get("prompt", ""),
+            expected=task.get("answer", ""),
+            t_ms=t_ms,
+            system=task.get("system") or None,
+            **fields,
+        )
+        self.records.append(rec)
+        return rec
+
+
+def trace_json(obj: Any) -> Any:
+    """``json.dumps(default=...)`` hook for Trace records."""
+    if isinstance(obj, Trace):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
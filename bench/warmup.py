@@ -0,0 +1,111 @@
+"""Connection warm-up before the measured part of a real run.
+
+Configured via a ``warmup`` section (top-level or per profile), or ``--warmup [N]``::
+
+    "warmup": {"enabled": true, "requests": 4, "connections": 2, "prompt": "ping", "max_tokens": 1}
+
+Warm-up requests are sent before the first suite task, ``connections`` at a
+time (default: the run's dispatcher count) so the client pool holds that many
+open connections. They are not scored, traced or counted by telemetry; their
+latencies are reported as ``metrics.cold_start``, outside the run's top-level
+percentiles. Off unless configured; it is separate from the suite's Warm-up
+phase, whose tasks are scored and counted like any other.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .report import _percentile
+
+
+def warmup_settings(config: dict, profile: str) -> Dict[str, Any]:
+    """Merge top-level and per-profile ``warmup`` sections (profile wins)."""
+    merged: Dict[str, Any] = {}
+    top = config.get("warmup")
+    if isinstance(top, dict):
+        merged.update(top)
+    prof = config.get("profiles", {}).get(profile, {}).get("warmup")
+    if isinstance(prof, dict):
+        merged.update(prof)
+    return merged
+
+
+def warmup_enabled(settings: Dict[str, Any]) -> bool:
+    return bool(settings.get("enabled"))
+
+
+class Warmup:
+    def __init__(self, requests: Optional[int] = None, connections: Optional[int] = None,
+                 prompt: str = "ping", max_tokens: int = 1) -> None:
+        self.requests = requests
+        self.connections = connections
+        self.prompt = prompt
+        self.max_tokens = max(1, int(max_tokens))
+        self._results: List[Dict[str, Any]] = []
+        self._wall_ms: Optional[float] = None
+        self._width = 1
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> "Warmup":
+        return cls(
+            requests=settings.get("requests"),
+            connections=settings.get("connections"),
+            prompt=settings.get("prompt", "ping"),
+            max_tokens=settings.get("max_tokens", 1),
+        )
+
+    def run(self, client: Any, connections: int = 1, instrument: bool = False) -> None:
+        """Send the warm-up requests in waves of ``connections`` concurrent calls."""
+        width = self._width = max(1, int(self.connections or connections))
+        n = max(1, int(self.requests if self.requests is not None else width))
+        lock = threading.Lock()
+        t0 = time.perf_counter()
+
+        def one(i: int) -> None:
+            res: Dict[str, Any] = {"i": i}
+            try:
+                _text, latency_ms, _raw = client.chat(self.prompt, max_tokens=self.max_tokens)
+                res["latency_ms"] = round(latency_ms, 1)
+                if instrument:
+                    res["timing"] = client.last_timing()
+            except Exception as e:
+                res["error"] = str(e)
+            with lock:
+                self._results.append(res)
+
+        for start in range(0, n, width):
+            wave = [threading.Thread(target=one, args=(i,), daemon=True) for i in range(start, min(n, start + width))]
+            for t in wave:
+                t.start()
+            for t in wave:
+                t.join()
+        self._wall_ms = round((time.perf_counter() - t0) * 1000.0, 1)
+        self._results.sort(key=lambda r: r["i"])
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        """Manifest block (``metrics.cold_start``), or None if warm-up did not run."""
+        if self._wall_ms is None:
+            return None
+        lats = [r["latency_ms"] for r in self._results if "latency_ms" in r]
+        first_wave = [r["latency_ms"] for r in self._results[: self._width] if "latency_ms" in r]
+        srt = sorted(lats)
+        out: Dict[str, Any] = {
+            "n_requests": len(self._results),
+            "n_errors": sum(1 for r in self._results if "error" in r),
+            "wall_ms": self._wall_ms,
+            "first_ms": first_wave[0] if first_wave else None,
+            "first_wave_max_ms": max(first_wave) if first_wave else None,
+            "p50_ms": round(_percentile(srt, 50), 1) if srt else None,
+            "max_ms": srt[-1] if srt else None,
+            "latencies_ms": lats,
+        }
+        timings = [r["timing"] for r in self._results if r.get("timing")]
+        if timings:
+            out["new_connections"] = sum(1 for t in timings if not t.get("reused"))
+            for key in ("dns_ms", "connect_ms", "tls_ms"):
+                vals = [float(t[key]) for t in timings if isinstance(t.get(key), (int, float))]
+                if vals:
+                    out[key] = round(max(vals), 1)
+        return out
@@ -5,6 +5,7 @@ Fetch competitor metrics and update data/system_metrics.json with timestamp and
 Usage:
   python tools/fetch_competitors.py --source data/competitors.json
   python tools/fetch_competitors.py --url https://example.com/metrics.json
+  python tools/fetch_competitors.py --url https://a.example/m.json --url https://b.example/m.json --source extra.json
 
 Input JSON shape:
   {
@@ -15,14 +16,23 @@ Input JSON shape:
       ...
     ]
   }
+
+Sources are fetched concurrently. URLs are cached under --cache-dir and
+re-validated with If-None-Match / If-Modified-Since, so unchanged sources cost
+a 304. The first source providing "model"/"metrics" is SAVI; comparisons from
+all sources are merged by name (later sources win). SAVI-minus-competitor
+deltas are precomputed into "deltas", and every content change is appended as
+a versioned snapshot to data/system_metrics_history.jsonl.
 """
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     import requests  # type: ignore
@@ -30,38 +40,192 @@ except Exception:  # pragma: no cover
     requests = None
 
 
+OUT_PATH = Path("data/system_metrics.json")
+HISTORY_PATH = Path("data/system_metrics_history.jsonl")
+CACHE_DIR = Path("data/cache/competitors")
+
+# SAVI metric key -> competitor key; delta = SAVI - competitor
+DELTA_FIELDS = {
+    "accuracy_pct": "accuracy_pct",
+    "inference_latency_ms": "latency_ms",
+    "train_time_hours": "train_hours",
+    "compute_tflops": "tflops",
+    "energy_cost_per_million_usd": "energy_cost_usd",
+}
+
+
+def _sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _http_get(url: str, headers: Dict[str, str]) -> Tuple[int, bytes, Dict[str, str]]:
+    """GET returning (status, body, headers); 304 is returned, not raised."""
+    if requests is not None:
+        r = requests.get(url, headers=headers, timeout=20)
+        if r.status_code != 304:
+            r.raise_for_status()
+        return r.status_code, r.content, {k.lower(): v for k, v in r.headers.items()}
+    import urllib.error
+    import urllib.request
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=20) as resp:
+            return resp.status, resp.read(), {k.lower(): v for k, v in resp.headers.items()}
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, b"", {k.lower(): v for k, v in e.headers.items()}
+        raise
+
+
+def fetch_url(url: str, cache_dir: Path) -> Dict[str, Any]:
+    """Conditional fetch through the local cache. Returns a source record."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key = _sha256_bytes(url.encode("utf-8"))[:16]
+    body_path = cache_dir / f"{key}.json"
+    meta_path = cache_dir / f"{key}.meta.json"
+    meta: Dict[str, Any] = {}
+    if meta_path.exists() and body_path.exists():
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except Exception:
+            meta = {}
+    headers: Dict[str, str] = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    status, body, resp_headers = _http_get(url, headers)
+    now = datetime.now(timezone.utc).isoformat()
+    if status == 304:
+        body = body_path.read_bytes()
+        meta["validated_at"] = now
+        cached = True
+    else:
+        body_path.write_bytes(body)
+        meta = {
+            "url": url,
+            "etag": resp_headers.get("etag"),
+            "last_modified": resp_headers.get("last-modified"),
+            "fetched_at": now,
+            "validated_at": now,
+        }
+        cached = False
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return {
+        "source": url,
+        "method": "http",
+        "cached": cached,
+        "sha256": _sha256_bytes(body),
+        "data": json.loads(body.decode("utf-8-sig")),
+    }
+
+
+def read_file(path: str) -> Dict[str, Any]:
+    raw = Path(path).read_bytes()
+    return {
+        "source": f"file:{path}",
+        "method": "file",
+        "cached": False,
+        "sha256": _sha256_bytes(raw),
+        "data": json.loads(raw.decode("utf-8-sig")),
+    }
+
+
+def merge_sources(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    merged: Dict[str, Any] = {}
+    comparisons: Dict[str, Dict[str, Any]] = {}
+    for rec in records:
+        data = rec["data"] if isinstance(rec["data"], dict) else {}
+        if "metrics" in data and "metrics" not in merged:
+            merged["model"] = data.get("model")
+            merged["metrics"] = data.get("metrics")
+        for c in data.get("comparisons") or []:
+            if isinstance(c, dict) and c.get("name"):
+                comparisons[str(c["name"])] = c
+    merged["comparisons"] = list(comparisons.values())
+    return merged
+
+
+def compute_deltas(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    savi = data.get("metrics") or {}
+    out: List[Dict[str, Any]] = []
+    for c in data.get("comparisons") or []:
+        row: Dict[str, Any] = {"name": c.get("name")}
+        for ours, theirs in DELTA_FIELDS.items():
+            a, b = savi.get(ours), c.get(theirs)
+            row[theirs] = round(float(a) - float(b), 4) if isinstance(a, (int, float)) and isinstance(b, (int, float)) else None
+        out.append(row)
+    return out
+
+
+def _last_history(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    last = None
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                last = line
+    try:
+        return json.loads(last) if last else None
+    except Exception:
+        return None
+
+
+def append_history(path: Path, data: Dict[str, Any], sources: List[Dict[str, Any]]) -> Tuple[int, bool]:
+    """Append a snapshot if the content changed. Returns (version, appended)."""
+    content = {k: data.get(k) for k in ("model", "metrics", "comparisons")}
+    digest = _sha256_bytes(json.dumps(content, sort_keys=True).encode("utf-8"))
+    prev = _last_history(path)
+    if prev and prev.get("snapshot_sha256") == digest:
+        return int(prev.get("version", 0)), False
+    version = int(prev.get("version", 0)) + 1 if prev else 1
+    snap = {
+        "version": version,
+        "snapshot_sha256": digest,
+        "updated_at": data.get("updated_at"),
+        "sources": [{k: s[k] for k in ("source", "sha256")} for s in sources],
+        **content,
+        "deltas": data.get("deltas"),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(snap) + "\n")
+    return version, True
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
-    ap.add_argument("--source", type=str, help="Local JSON file with metrics")
-    ap.add_argument("--url", type=str, help="Remote URL to fetch metrics JSON")
+    ap.add_argument("--source", type=str, action="append", default=[], help="Local JSON file with metrics (repeatable)")
+    ap.add_argument("--url", type=str, action="append", default=[], help="Remote URL to fetch metrics JSON (repeatable)")
+    ap.add_argument("--cache-dir", type=str, default=str(CACHE_DIR), help="HTTP cache directory")
+    ap.add_argument("--out", type=str, default=str(OUT_PATH), help="Latest metrics output")
+    ap.add_argument("--history", type=str, default=str(HISTORY_PATH), help="Versioned snapshot history (JSONL)")
     args = ap.parse_args()
 
-    data: Dict[str, Any]
-    if args.source:
-        data = json.loads(Path(args.source).read_text(encoding="utf-8"))
-        source = f"file:{args.source}"
-        method = "file"
-    elif args.url:
-        if requests is None:
-            raise SystemExit("requests not available to fetch URL")
-        r = requests.get(args.url, timeout=20)
-        r.raise_for_status()
-        data = r.json()
-        source = args.url
-        method = "http"
-    else:
+    if not args.source and not args.url:
         raise SystemExit("Provide --source or --url")
 
+    cache_dir = Path(args.cache_dir)
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(args.source) + len(args.url)))) as ex:
+        futures = [ex.submit(read_file, s) for s in args.source] + [ex.submit(fetch_url, u, cache_dir) for u in args.url]
+        records = [f.result() for f in futures]
+
+    data = merge_sources(records)
     data["updated_at"] = datetime.now(timezone.utc).isoformat()
-    data.setdefault("source", source)
-    data.setdefault("method", method)
+    data["source"] = ", ".join(r["source"] for r in records)
+    data["method"] = "+".join(sorted({r["method"] for r in records}))
+    data["sources"] = [{k: r[k] for k in ("source", "method", "cached", "sha256")} for r in records]
+    data["deltas"] = compute_deltas(data)
+    version, appended = append_history(Path(args.history), data, records)
+    data["version"] = version
 
-    out = Path("data/system_metrics.json")
+    out = Path(args.out)
     out.parent.mkdir(parents=True, exist_ok=True)
     out.write_text(json.dumps(data, indent=2), encoding="utf-8")
-    print(f"Wrote {out}")
+    cached = sum(1 for r in records if r["cached"])
+    print(f"Wrote {out} (version {version}{', new snapshot' if appended else ', unchanged'}; {cached}/{len(args.url)} URLs from cache)")
 
 
 if __name__ == "__main__":
     main()
-
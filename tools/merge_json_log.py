@@ -1,48 +1,173 @@
 #!/usr/bin/env python3
+"""
+Streaming merge for the dashboard log (data/agi_benchmark_log.json) and shard outputs.
+
+Usage:
+  python tools/merge_json_log.py BASE OURS THEIRS          # git merge driver: result -> OURS
+  python tools/merge_json_log.py --out merged.json A B ... # merge shard outputs of parallel runs
+
+Inputs are JSON arrays or JSONL files and are read incrementally, never
+loaded whole. Each input is an append-only log in timestamp order, so a
+k-way merge (heapq.merge, ties broken by input order) keeps the output in
+timestamp order. Rows are de-duplicated on bench.report's key (`run_id`, else
+profile/timestamp/phase); only the keys seen so far are held in memory and
+the first occurrence wins. The output is written next to its target and
+renamed into place, as a JSON array laid out like `json.dumps(rows, indent=2)`
+(or JSONL when the output ends in `.jsonl`); rows already in the output's
+format are copied through as their source text instead of being re-encoded.
+
+Exits non-zero on unreadable input, so git reports a conflict instead of
+dropping rows.
+"""
 from __future__ import annotations
 
+import argparse
+import heapq
 import json
+import os
 import sys
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+from bench.report import _entry_key  # noqa: E402
 
-def load(path: Path) -> List[Dict[str, Any]]:
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-        return data if isinstance(data, list) else []
-    except Exception:
-        return []
+_CHUNK = 1 << 20
+_decoder = json.JSONDecoder()
 
+# (row, source text, "array" | "jsonl")
+Row = Tuple[Dict[str, Any], str, str]
 
-def main() -> int:
-    if len(sys.argv) < 4:
-        print("usage: merge_json_log.py BASE OURS THEIRS")
-        return 2
-    base = Path(sys.argv[1])
-    ours = Path(sys.argv[2])
-    theirs = Path(sys.argv[3])
 
-    all_rows: List[Dict[str, Any]] = []
-    all_rows.extend(load(base))
-    all_rows.extend(load(ours))
-    all_rows.extend(load(theirs))
+def _skip_ws(buf: str, pos: int) -> int:
+    while pos < len(buf) and buf[pos] in " \t\r\n":
+        pos += 1
+    return pos
 
-    seen = set()
-    merged: List[Dict[str, Any]] = []
-    for row in all_rows:
-        if not isinstance(row, dict):
+
+def _iter_array(fh: TextIO, buf: str) -> Iterator[Tuple[Any, str]]:
+    """Yield (element, source text) of a JSON array read from ``fh`` in chunks (``buf`` starts after '[')."""
+    pos = 0
+    eof = False
+    while True:
+        pos = _skip_ws(buf, pos)
+        if pos < len(buf) and buf[pos] == ",":
+            pos = _skip_ws(buf, pos + 1)
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        try:
+            obj, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            chunk = fh.read(_CHUNK)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
             continue
-        key = row.get("run_id")
-        if key in seen:
+        if end == len(buf) and not eof and not isinstance(obj, (dict, list, str)):
+            # a bare number at the end of the buffer may continue in the next chunk
+            chunk = fh.read(_CHUNK)
+            eof = not chunk
+            if chunk:
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+        yield obj, buf[pos:end]
+        pos = end
+        if pos > _CHUNK:
+            buf, pos = buf[pos:], 0
+
+
+def iter_rows(path: Path) -> Iterator[Row]:
+    """Stream dict rows from a JSON array or JSONL file (missing or empty: no rows)."""
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as fh:
+        head = fh.read(_CHUNK)
+        start = _skip_ws(head, 0)
+        if start == len(head):
+            return
+        try:
+            if head[start] == "[":
+                for obj, text in _iter_array(fh, head[start + 1:]):
+                    if isinstance(obj, dict):
+                        yield obj, text, "array"
+            else:
+                for line in _lines(head, fh):
+                    line = line.strip()
+                    if line:
+                        obj = json.loads(line)
+                        if isinstance(obj, dict):
+                            yield obj, line, "jsonl"
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: {e.msg}") from None
+
+
+def _lines(head: str, fh: TextIO) -> Iterator[str]:
+    pending = head
+    for chunk in iter(lambda: fh.read(_CHUNK), ""):
+        pending += chunk
+        *done, pending = pending.split("\n")
+        yield from done
+    yield from pending.split("\n")
+
+
+def _timestamp(item: Row) -> str:
+    return str(item[0].get("timestamp") or "")
+
+
+def merge(paths: List[Path]) -> Iterator[Row]:
+    """k-way merge of ``paths`` in timestamp order, de-duplicated on bench.report's key."""
+    seen = set()
+    for item in heapq.merge(*(iter_rows(p) for p in paths), key=_timestamp):
+        k = _entry_key(item[0])
+        if k in seen:
             continue
-        seen.add(key)
-        merged.append(row)
+        seen.add(k)
+        yield item
+
 
-    ours.write_text(json.dumps(merged, indent=2), encoding="utf-8")
+def write_rows(rows: Iterator[Row], out: Path) -> int:
+    """Write ``rows`` to ``out`` atomically; returns the row count."""
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    jsonl = out.suffix == ".jsonl"
+    n = 0
+    try:
+        with tmp.open("w", encoding="utf-8", newline="\n") as fh:
+            for row, text, kind in rows:
+                if jsonl:
+                    fh.write((text if kind == "jsonl" else json.dumps(row, ensure_ascii=False)) + "\n")
+                else:
+                    fh.write("[\n  " if n == 0 else ",\n  ")
+                    fh.write(text if kind == "array" else json.dumps(row, indent=2).replace("\n", "\n  "))
+                n += 1
+            if not jsonl:
+                fh.write("\n]" if n else "[]")
+        os.replace(tmp, out)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return n
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Streaming merge of JSON/JSONL run logs")
+    ap.add_argument("inputs", nargs="+", help="BASE OURS THEIRS (merge driver), or shard files with --out")
+    ap.add_argument("--out", default=None, help="Output path (default: OURS, the second of three inputs)")
+    args = ap.parse_args(argv)
+    if args.out is None and len(args.inputs) != 3:
+        ap.error("expected BASE OURS THEIRS, or --out with any number of inputs")
+    paths = [Path(p) for p in args.inputs]
+    out = Path(args.out) if args.out else paths[1]
+    try:
+        n = write_rows(merge(paths), out)
+    except (OSError, ValueError) as e:
+        print(f"merge_json_log: {e}", file=sys.stderr)
+        return 1
+    if args.out:
+        print(f"Wrote {out} ({n} rows from {len(paths)} inputs)")
     return 0
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Harness performance suite (not model latency).
+
+Usage:
+  python tools/perf.py startup [--runs 7] [--budget-ms 40]
+  python tools/perf.py grade [--responses 2000] [--words 400] [--min-per-s 2000]
+
+Benchmarks:
+  - startup: `python -X importtime -c "import bench.run"` repeated N times; the
+    median cumulative import time of bench.run must stay under the budget, and
+    modules that bench.run loads lazily must not be imported eagerly.
+  - grade: bench.grade.score throughput (gradings/s) for the bleu, rouge and
+    fuzzy scorers on long free-form responses against a small set of expected
+    answers, with the expected-answer cache warm and cleared before each call;
+    the warm bleu and rouge rates must stay above --min-per-s.
+
+Exits non-zero when a benchmark regresses past its threshold.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Default budgets; override per run with --budget-ms or PERF_STARTUP_BUDGET_MS.
+STARTUP_BUDGET_MS = 40.0
+# Warm-cache bleu/rouge gradings per second on 400-word responses; override with --min-per-s or PERF_GRADE_MIN_PER_S.
+GRADE_MIN_PER_S = 2000.0
+# Imported on demand by bench.run; pulling any of these in at import time is a regression.
+LAZY_MODULES = [
+    "argparse", "subprocess", "requests", "numpy",
+    "bench.grade", "bench.model", "bench.soak", "bench.synth", "bench.report",
+]
+
+
+def _importtime(module: str) -> Dict[str, int]:
+    """Run one fresh interpreter importing `module`; return {module: cumulative_us}."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    out: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(.+)$", line)
+        if m:
+            out[m.group(3).strip()] = int(m.group(2))
+    return out
+
+
+def bench_startup(runs: int, budget_ms: float) -> bool:
+    samples: List[float] = []
+    loaded: Dict[str, int] = {}
+    for _ in range(runs):
+        loaded = _importtime("bench.run")
+        if "bench.run" in loaded:
+            samples.append(loaded["bench.run"] / 1000.0)
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "bench.run", "--help"], cwd=REPO_ROOT, capture_output=True)
+    cli_ms = (time.perf_counter() - t0) * 1000.0
+
+    eager = [m for m in LAZY_MODULES if m in loaded]
+    median = statistics.median(samples) if samples else None
+    ok = median is not None and median <= budget_ms and not eager
+    if samples:
+        print(f"startup: import bench.run median={median:.1f}ms min={min(samples):.1f}ms "
+              f"budget={budget_ms:.1f}ms runs={len(samples)}")
+    else:
+        print("startup: no samples (bench.run failed to import?)")
+    print(f"startup: python -m bench.run --help wall={cli_ms:.1f}ms")
+    if eager:
+        print(f"startup: eagerly imported (should be lazy): {', '.join(eager)}")
+    print(f"startup: {'OK' if ok else 'REGRESSION'}")
+    return ok
+
+
+def _grade_corpus(responses: int, words: int, seed: int = 7) -> List[Tuple[str, str]]:
+    """(expected, got) pairs: 20 reference answers, long responses that reuse some of their wording."""
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(2000)]
+    refs = [" ".join(rng.choice(vocab[:300]) for _ in range(rng.randint(40, 80))) for _ in range(20)]
+    pairs = []
+    for _ in range(responses):
+        ref = rng.choice(refs).split()
+        got = [ref[rng.randrange(len(ref))] if rng.random() < 0.4 else rng.choice(vocab) for _ in range(words)]
+        pairs.append((" ".join(ref), " ".join(got)))
+    return pairs
+
+
+def bench_grade(responses: int, words: int, min_per_s: float) -> bool:
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from bench import grade
+
+    pairs = _grade_corpus(responses, words)
+    ok = True
+    for kind in ("bleu", "rouge", "fuzzy"):
+        rates = {}
+        for cache in ("warm", "cold"):
+            grade._ref.cache_clear()
+            t0 = time.perf_counter()
+            for expected, got in pairs:
+                if cache == "cold":
+                    grade._ref.cache_clear()
+                grade.score("", expected, got, kind)
+            rates[cache] = len(pairs) / (time.perf_counter() - t0)
+        print(f"grade: {kind:<5} {rates['warm']:>8.0f}/s warm  {rates['cold']:>8.0f}/s cold  "
+              f"({responses} x {words} words, {rates['warm'] * words / 1e6:.2f}M words/s)")
+        if kind != "fuzzy" and rates["warm"] < min_per_s:
+            ok = False
+    print(f"grade: min={min_per_s:.0f}/s {'OK' if ok else 'REGRESSION'}")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="SAVI Bench harness performance suite")
+    sub = ap.add_subparsers(dest="bench", required=True)
+    sp = sub.add_parser("startup", help="Import-time budget for bench.run")
+    sp.add_argument("--runs", type=int, default=7)
+    sp.add_argument("--budget-ms", type=float,
+                    default=float(os.getenv("PERF_STARTUP_BUDGET_MS", STARTUP_BUDGET_MS)))
+    gp = sub.add_parser("grade", help="Scorer throughput on long responses")
+    gp.add_argument("--responses", type=int, default=2000)
+    gp.add_argument("--words", type=int, default=400)
+    gp.add_argument("--min-per-s", type=float,
+                    default=float(os.getenv("PERF_GRADE_MIN_PER_S", GRADE_MIN_PER_S)))
+    args = ap.parse_args(argv)
+
+    if args.bench == "startup":
+        return 0 if bench_startup(args.runs, args.budget_ms) else 1
+    if args.bench == "grade":
+        return 0 if bench_grade(args.responses, args.words, args.min_per_s) else 1
+    return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
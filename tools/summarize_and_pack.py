@@ -6,8 +6,15 @@ Outputs:
   - results/latency_summary.csv (p50/p90/p95/p99 + success_rate)
   - results/latest.jsonl (task-by-task rows if available, else per-record JSON lines)
   - dist/proof_pack_FULL.tgz (logs/, manifests/, reports/, results artifacts)
+  - dist/pack_manifest.json (sha256 and size of every pack member; checked by `python -m tools.verify`)
+    Synthetic traces (rows with "synthetic": true) are not packed; they are
+    regenerable from the seed and are listed by sha256/size under "unpacked".
   - dist/sha256sums.txt (sha256 for top-level artifacts)
 
+File hashes come from the bench.store refs cache when a file is unchanged since
+it was stored/hashed; identical files go into the pack once, later copies as
+tar hard links.
+
 This script is repo-aware and uses bench/config.json defaults.
 """
 from __future__ import annotations
@@ -18,8 +25,9 @@ import math
 import os
 import sys
 import hashlib
+import shutil
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 import tarfile
@@ -28,6 +36,14 @@ import tarfile
 REPO_ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_CONFIG = REPO_ROOT / "bench" / "config.json"
 
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+try:
+    from bench.store import ArtifactStore, DEFAULT_STORE_DIR
+except Exception:  # pragma: no cover
+    ArtifactStore = None
+    DEFAULT_STORE_DIR = "store"
+
 
 def _load_json(path: Path) -> Any:
     try:
@@ -90,6 +106,12 @@ def build_latest_jsonl(results_dir: Path) -> Path:
     # Prefer detailed task traces if present
     # 1) DS005 task traces for savi_openai_1000
     task_file = _pick_latest("tasks-savi_openai_1000-*.json", results_dir) or _pick_latest("tasks-*.json", results_dir)
+    # 1b) Streamed JSONL traces (synthetic numpy engine); copied through without loading
+    stream_file = _pick_latest("tasks-savi_openai_1000-*.jsonl", results_dir) or _pick_latest("tasks-*.jsonl", results_dir)
+    if stream_file and (task_file is None or stream_file.stat().st_mtime >= task_file.stat().st_mtime):
+        shutil.copyfile(stream_file, out)
+        print(f"Wrote {out} from {stream_file.name}")
+        return out
     source_label = None
     records: List[Dict[str, Any]] = []
     if task_file and task_file.exists():
@@ -138,7 +160,8 @@ def summarize_latency_and_success(jsonl_path: Path, out_csv: Path) -> Dict[str,
                 except Exception:
                     lat = None
         try:
-            if lat is not None:
+            # batched rows carry shared request latency; not comparable to single-shot
+            if lat is not None and not obj.get("batch"):
                 lats.append(float(lat))
         except Exception:
             pass
@@ -188,40 +211,97 @@ def sha256_of(path: Path) -> str:
     return h.hexdigest()
 
 
-def build_pack(dist_dir: Path, results_dir: Path, manifests_dir: Path, logs_dir: Path, reports_dir: Path) -> Path:
+def _hash(path: Path, store: Any) -> str:
+    return store.sha256_of(path, save=False) if store is not None else sha256_of(path)
+
+
+def _is_synthetic(path: Path) -> bool:
+    """True if the first JSONL row is a synthetic-engine trace."""
+    with path.open("r", encoding="utf-8") as fh:
+        line = fh.readline()
+    try:
+        return bool(line.strip()) and json.loads(line).get("synthetic") is True
+    except (ValueError, AttributeError):
+        return False
+
+
+def build_pack(dist_dir: Path, results_dir: Path, manifests_dir: Path, logs_dir: Path, reports_dir: Path,
+               store: Any = None) -> Path:
+    """Write dist/proof_pack_FULL.tgz and dist/pack_manifest.json (per-member sha256/size)."""
     _ensure_dir(dist_dir)
     out = dist_dir / "proof_pack_FULL.tgz"
+    seen: Dict[str, str] = {}  # sha256 -> first arcname
+    members: Dict[str, Dict[str, Any]] = {}  # arcname -> {sha256, size[, link]}
+    unpacked: Dict[str, Dict[str, Any]] = {}  # arcname -> {sha256, size}, hash only
+
+    def add(tar: tarfile.TarFile, p: Path) -> None:
+        arcname = p.relative_to(REPO_ROOT).as_posix()
+        sha = _hash(p, store)
+        members[arcname] = {"sha256": sha, "size": p.stat().st_size}
+        if store is None:
+            tar.add(p, arcname=arcname)
+            return
+        if sha in seen:
+            # duplicate content: hard link to the first copy
+            info = tar.gettarinfo(str(p), arcname=arcname)
+            info.type = tarfile.LNKTYPE
+            info.linkname = seen[sha]
+            info.size = 0
+            tar.addfile(info)
+            members[arcname]["link"] = seen[sha]
+            return
+        seen[sha] = arcname
+        tar.add(p, arcname=arcname)
+
     with tarfile.open(out, "w:gz") as tar:
         # Add directories (if missing, create empty markers)
         for d in [logs_dir, manifests_dir, reports_dir]:
             if d.exists():
                 for p in sorted(d.rglob("*")):
                     if p.is_file():
-                        tar.add(p, arcname=str(p.relative_to(REPO_ROOT)))
+                        add(tar, p)
             else:
                 # add an empty placeholder text to preserve tree in pack
                 placeholder = dist_dir / f".empty_{d.name}"
                 placeholder.write_text("", encoding="utf-8")
-                tar.add(placeholder, arcname=str(Path(d.name) / ".empty"))
+                arcname = f"{d.name}/.empty"
+                tar.add(placeholder, arcname=arcname)
+                members[arcname] = {"sha256": hashlib.sha256(b"").hexdigest(), "size": 0}
                 placeholder.unlink(missing_ok=True)
         # Add results artifacts explicitly
         for name in ["latest.jsonl", "latency_summary.csv"]:
             p = results_dir / name
-            if p.exists():
-                tar.add(p, arcname=str(p.relative_to(REPO_ROOT)))
-    print(f"Wrote {out}")
+            if not p.exists():
+                continue
+            if name == "latest.jsonl" and _is_synthetic(p):
+                unpacked[p.relative_to(REPO_ROOT).as_posix()] = {"sha256": _hash(p, store), "size": p.stat().st_size}
+                continue
+            add(tar, p)
+    if store is not None:
+        store.save_refs()
+    pack_manifest = dist_dir / "pack_manifest.json"
+    pack_manifest.write_text(json.dumps({
+        "pack": out.relative_to(REPO_ROOT).as_posix(),
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "n_members": len(members),
+        "members": members,
+        "unpacked": unpacked,
+    }, indent=2), encoding="utf-8")
+    print(f"Wrote {out} and {pack_manifest}")
     return out
 
 
-def write_checksums(out_dir: Path, files: List[Path]) -> Path:
+def write_checksums(out_dir: Path, files: List[Path], store: Any = None) -> Path:
     lines: List[str] = []
     for f in files:
         try:
-            h = sha256_of(f)
+            h = _hash(f, store)
             rel = f.relative_to(REPO_ROOT).as_posix()
             lines.append(f"{h}  {rel}")
         except Exception:
             continue
+    if store is not None:
+        store.save_refs()
     sums = out_dir / "sha256sums.txt"
     sums.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
     print(f"Wrote {sums}")
@@ -247,16 +327,18 @@ def main() -> None:
     summary_csv = results_dir / "latency_summary.csv"
     summarize_latency_and_success(jsonl, summary_csv)
 
-    pack = build_pack(dist_dir, results_dir, manifests_dir, logs_dir, reports_dir)
+    store = ArtifactStore(REPO_ROOT / config.get("store_dir", DEFAULT_STORE_DIR)) if ArtifactStore is not None else None
+    pack = build_pack(dist_dir, results_dir, manifests_dir, logs_dir, reports_dir, store=store)
     # Include key top-level artifacts in checksums for easy verification
     html = reports_dir / "latest.html"
-    sums = write_checksums(dist_dir, [pack, summary_csv, jsonl, html])
+    sums = write_checksums(dist_dir, [pack, dist_dir / "pack_manifest.json", summary_csv, jsonl, html], store=store)
 
     # Friendly print for CI logs
     print("Artifacts:")
     print(f" - {jsonl}")
     print(f" - {summary_csv}")
     print(f" - {pack}")
+    print(f" - {dist_dir / 'pack_manifest.json'}")
     print(f" - {sums}")
 
 
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Verify a DS005 proof pack without extracting it.
+
+Usage:
+  python -m tools.verify [--dist dist] [--workers N] [--expect-commit SHA]
+                         [--expect-config-hash SHA] [--json out.json]
+
+Checks:
+  - sums: every entry of dist/sha256sums.txt, hashed in parallel on a thread
+    pool (hashlib releases the GIL, so large files hash on all cores). Entries
+    absent locally (results/ is not in a clone) are skipped with a warning; a
+    stale hash is a failure.
+  - pack: dist/proof_pack_FULL.tgz is read once as a stream; each member is
+    hashed in memory and cross-checked against dist/pack_manifest.json
+    (missing, unexpected, size and sha256 mismatches; hard links must point at
+    the recorded target). Packs built before pack_manifest.json existed are
+    only warned about.
+  - manifests: run manifests in the pack carry a well-formed `config_hash` and
+    `git_commit` (optionally pinned with --expect-*; older runs recorded
+    neither, which is a warning), pointer manifests
+    (`manifests/<profile>.json`) match the run manifest they name, and runs
+    from the same commit and config file agree on `config_hash`.
+
+Exits non-zero when any check fails; warnings alone do not fail the run.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import tarfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+_CHUNK = 1 << 20
+_INLINE_MAX = 8 << 20  # larger members are hashed chunk by chunk on the reading thread
+_MAX_INFLIGHT = 256 << 20  # bytes of member data queued for hashing before the reader waits
+_SHA256 = re.compile(r"^[0-9a-f]{64}$")
+_COMMIT = re.compile(r"^[0-9a-f]{7,40}$")
+
+
+def sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def read_sums(path: Path) -> List[Tuple[str, str]]:
+    """(sha256, relative path) pairs from a sha256sum-style file."""
+    out: List[Tuple[str, str]] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        parts = line.strip().split(None, 1)
+        if len(parts) == 2:
+            out.append((parts[0].lower(), parts[1].lstrip("*")))
+    return out
+
+
+def _resolve(rel: str, root: Path, dist: Path) -> Path:
+    """Repo-relative path, falling back to the file's name under ``dist`` (release downloads)."""
+    p = root / rel
+    return p if p.exists() else dist / Path(rel).name
+
+
+def stream_pack(pack: Path, pool: ThreadPoolExecutor) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, bytes]]:
+    """Hash every member of ``pack`` in one streaming pass.
+
+    Returns ({arcname: {"sha256", "size"} or {"link"}}, {arcname: bytes} for
+    manifests/*.json members, kept for the consistency checks).
+    """
+    members: Dict[str, Dict[str, Any]] = {}
+    manifests: Dict[str, bytes] = {}
+    inflight: List[Tuple[Future, int]] = []
+    queued = 0
+    with tarfile.open(pack, mode="r|*") as tar:
+        for m in tar:
+            if m.islnk():
+                members[m.name] = {"link": m.linkname}
+                continue
+            if not m.isfile():
+                continue
+            fh = tar.extractfile(m)
+            if fh is None:
+                continue
+            if m.size > _INLINE_MAX:
+                h = hashlib.sha256()
+                for chunk in iter(lambda: fh.read(_CHUNK), b""):
+                    h.update(chunk)
+                members[m.name] = {"sha256": h.hexdigest(), "size": m.size}
+                continue
+            data = fh.read()
+            if m.name.startswith("manifests/") and m.name.endswith(".json"):
+                manifests[m.name] = data
+            fut = pool.submit(_sha256_bytes, data)
+            members[m.name] = {"sha256": fut, "size": m.size}
+            inflight.append((fut, len(data)))
+            queued += len(data)
+            while queued > _MAX_INFLIGHT and inflight:
+                done, n = inflight.pop(0)
+                done.result()
+                queued -= n
+    for rec in members.values():
+        if isinstance(rec.get("sha256"), Future):
+            rec["sha256"] = rec["sha256"].result()
+    return members, manifests
+
+
+def check_pack(found: Dict[str, Dict[str, Any]], expected: Dict[str, Any]) -> List[str]:
+    """Cross-check streamed members against a pack_manifest.json ``members`` table."""
+    errors: List[str] = []
+
+    def effective(name: str) -> Optional[Dict[str, Any]]:
+        rec = found.get(name)
+        if rec is not None and "link" in rec:
+            return found.get(rec["link"])
+        return rec
+
+    for name, exp in sorted(expected.items()):
+        rec = found.get(name)
+        if rec is None:
+            errors.append(f"missing from pack: {name}")
+            continue
+        if exp.get("link") and rec.get("link") != exp["link"]:
+            errors.append(f"{name}: link to {rec.get('link')!r}, expected {exp['link']!r}")
+            continue
+        got = effective(name)
+        if got is None or "sha256" not in got:
+            errors.append(f"{name}: dangling link to {rec.get('link')!r}")
+        elif got["sha256"] != exp.get("sha256"):
+            errors.append(f"{name}: sha256 {got['sha256']} != {exp.get('sha256')}")
+        elif exp.get("size") is not None and got["size"] != exp["size"]:
+            errors.append(f"{name}: size {got['size']} != {exp['size']}")
+    for name in sorted(set(found) - set(expected)):
+        errors.append(f"not in pack manifest: {name}")
+    return errors
+
+
+def check_manifests(manifests: Dict[str, bytes], members: Dict[str, Dict[str, Any]],
+                    expect_commit: Optional[str] = None,
+                    expect_config_hash: Optional[str] = None) -> Tuple[List[str], List[str], Dict[str, Any]]:
+    """Consistency of run and pointer manifests; returns (errors, warnings, info)."""
+    errors: List[str] = []
+    warnings: List[str] = []
+    runs: Dict[str, Dict[str, Any]] = {}
+    pointers: Dict[str, Dict[str, Any]] = {}
+    for name, data in manifests.items():
+        try:
+            doc = json.loads(data.decode("utf-8"))
+        except Exception as e:
+            errors.append(f"{name}: unreadable JSON ({e})")
+            continue
+        if not isinstance(doc, dict) or "run_id" not in doc:
+            continue
+        if "manifest_sha256" in doc:
+            pointers[name] = doc
+        else:
+            runs[name] = doc
+
+    by_key: Dict[Tuple[Any, Any], set] = {}
+    for name, doc in sorted(runs.items()):
+        ch, commit = doc.get("config_hash"), doc.get("git_commit")
+        if ch is None:
+            if expect_config_hash:
+                errors.append(f"{name}: no config_hash recorded, expected {expect_config_hash[:12]}")
+            else:
+                warnings.append(f"{name}: no config_hash recorded")
+        elif not isinstance(ch, str) or not _SHA256.match(ch):
+            errors.append(f"{name}: bad config_hash {ch!r}")
+        elif expect_config_hash and ch != expect_config_hash.lower():
+            errors.append(f"{name}: config_hash {ch[:12]} != expected {expect_config_hash[:12]}")
+        if commit is None:
+            warnings.append(f"{name}: no git_commit recorded")
+        elif not isinstance(commit, str) or not _COMMIT.match(commit):
+            errors.append(f"{name}: bad git_commit {commit!r}")
+        elif expect_commit and not commit.startswith(expect_commit.lower()):
+            errors.append(f"{name}: git_commit {commit[:12]} != expected {expect_commit[:12]}")
+        if commit and ch:
+            by_key.setdefault((commit, doc.get("config")), set()).add(ch)
+    for (commit, config), hashes in sorted(by_key.items(), key=lambda kv: str(kv[0])):
+        if len(hashes) > 1:
+            # same commit and config path, different bytes: the config was edited without committing
+            warnings.append(f"{len(hashes)} config_hash values for {config} at commit {str(commit)[:12]}")
+
+    for name, doc in sorted(pointers.items()):
+        target = Path(str(doc.get("manifest", ""))).as_posix()
+        if target not in runs:
+            errors.append(f"{name}: points at {target}, not in pack")
+            continue
+        if doc.get("run_id") != runs[target].get("run_id"):
+            errors.append(f"{name}: run_id {doc.get('run_id')!r} != {runs[target].get('run_id')!r} in {target}")
+        sha = (members.get(target) or {}).get("sha256")
+        if sha != doc.get("manifest_sha256"):
+            errors.append(f"{name}: manifest_sha256 does not match {target}")
+
+    info = {
+        "n_runs": len(runs),
+        "n_pointers": len(pointers),
+        "git_commits": sorted({str(d.get("git_commit")) for d in runs.values() if d.get("git_commit")}),
+        "config_hashes": sorted({str(d.get("config_hash")) for d in runs.values() if d.get("config_hash")}),
+    }
+    return errors, warnings, info
+
+
+def verify(dist: Path, root: Path, workers: int, expect_commit: Optional[str] = None,
+           expect_config_hash: Optional[str] = None) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    report: Dict[str, Any] = {"dist": str(dist), "errors": [], "warnings": []}
+    sums_file = dist / "sha256sums.txt"
+    pack = dist / "proof_pack_FULL.tgz"
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # whole-file hashes run on the pool while this thread streams the pack
+        sums: List[Tuple[str, Path, Future]] = []
+        if sums_file.exists():
+            for sha, rel in read_sums(sums_file):
+                p = _resolve(rel, root, dist)
+                sums.append((sha, p, pool.submit(sha256_file, p) if p.exists() else None))
+        else:
+            report["errors"].append(f"{sums_file} not found")
+
+        members: Dict[str, Dict[str, Any]] = {}
+        manifests: Dict[str, bytes] = {}
+        if pack.exists():
+            t_pack = time.perf_counter()
+            members, manifests = stream_pack(pack, pool)
+            report["pack"] = {
+                "members": len(members),
+                "links": sum(1 for r in members.values() if "link" in r),
+                "bytes": sum(r.get("size", 0) for r in members.values()),
+                "seconds": round(time.perf_counter() - t_pack, 3),
+            }
+        else:
+            report["errors"].append(f"{pack} not found")
+
+        sums_ok = 0
+        for sha, p, fut in sums:
+            if fut is None:
+                report["warnings"].append(f"sums: {p} not present, skipped")
+            elif fut.result() != sha:
+                report["errors"].append(f"sums: {p} sha256 {fut.result()} != {sha}")
+            else:
+                sums_ok += 1
+        report["sums"] = {"checked": sum(1 for s in sums if s[2] is not None), "ok": sums_ok}
+
+    pack_manifest = dist / "pack_manifest.json"
+    if pack.exists():
+        try:
+            expected = json.loads(pack_manifest.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            report["warnings"].append(f"{pack_manifest} not found (pack predates it); member cross-check skipped")
+        except Exception as e:
+            report["errors"].append(f"{pack_manifest}: unreadable ({e})")
+        else:
+            report["errors"].extend(check_pack(members, expected.get("members") or {}))
+    errors, warnings, info = check_manifests(manifests, members, expect_commit, expect_config_hash)
+    report["errors"].extend(errors)
+    report["warnings"].extend(warnings)
+    report["manifests"] = info
+    report["seconds"] = round(time.perf_counter() - t0, 3)
+    report["ok"] = not report["errors"]
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Verify a SAVI Bench proof pack (checksums, members, manifests)")
+    ap.add_argument("--dist", default=str(REPO_ROOT / "dist"), help="Directory with sha256sums.txt and the pack")
+    ap.add_argument("--root", default=str(REPO_ROOT), help="Base for the repo-relative paths in sha256sums.txt")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    ap.add_argument("--expect-commit", default=None, help="Require every run manifest to carry this git commit (prefix ok)")
+    ap.add_argument("--expect-config-hash", default=None, help="Require every run manifest to carry this config_hash")
+    ap.add_argument("--json", default=None, help="Also write the report to this path")
+    args = ap.parse_args(argv)
+
+    report = verify(Path(args.dist), Path(args.root), max(1, args.workers), args.expect_commit, args.expect_config_hash)
+    sums, pack, man = report["sums"], report.get("pack"), report["manifests"]
+    print(f"sums: {sums['ok']}/{sums['checked']} OK")
+    if pack:
+        print(f"pack: {pack['members']} members ({pack['links']} links, {pack['bytes']} bytes) streamed in {pack['seconds']}s")
+    print(f"manifests: {man['n_runs']} runs, {man['n_pointers']} pointers, "
+          f"{len(man['git_commits'])} commits, {len(man['config_hashes'])} config hashes")
+    for w in report["warnings"]:
+        print(f"warn: {w}")
+    for e in report["errors"]:
+        print(f"FAIL: {e}")
+    print(f"verify: {'OK' if report['ok'] else 'FAILED'} in {report['seconds']}s")
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())